@@ -11,22 +11,35 @@ Desire-Hunter V2.0
     # 複数の欲求を処理
     python main.py --batch desires.txt
 
+    # 中断したバッチを続きから再開
+    python main.py --batch desires.txt --resume
+
     # クイック検索（保存なし）
     python main.py --quick "高品質なワイヤレスイヤホンが欲しい"
+
+    # 製品ストアを Parquet に書き出し / 読み込み（pyarrow が必要）
+    python main.py --export products.parquet
+    python main.py --import products.parquet
 """
 
 import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 
 # .env ファイルを読み込み（インポート前に実行する必要がある）
 load_dotenv()
 
-from src.agents.director import create_director, DirectorAgent  # noqa: E402
+from src.agents.director import (  # noqa: E402
+    create_director,
+    create_repository,
+    DirectorAgent,
+)
 from src.core.config import settings  # noqa: E402
+from src.infrastructure.repositories.batch_journal import BatchJournal  # noqa: E402
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -104,8 +117,13 @@ def hunt_single(director: DirectorAgent, desire: str, quick: bool = False) -> No
         print("\n❌ 製品が見つかりませんでした")
 
 
-def hunt_batch(director: DirectorAgent, file_path: str) -> None:
-    """バッチ処理"""
+def hunt_batch(
+    director: DirectorAgent,
+    file_path: str,
+    concurrency: Optional[int] = None,
+    resume: bool = False,
+) -> None:
+    """バッチ処理（ジャーナルが有効なら進捗を記録し、resume で続きから再開）"""
     path = Path(file_path)
 
     if not path.exists():
@@ -122,26 +140,64 @@ def hunt_batch(director: DirectorAgent, file_path: str) -> None:
         print("エラー: 処理する欲求がありません")
         return
 
+    # --resume 指定時は BATCH_JOURNAL_ENABLED=false でもジャーナルを使う
+    journal = BatchJournal() if settings.batch_journal_enabled or resume else None
+
     print(f"\n📋 バッチ処理: {len(desires)}件の欲求")
+    if journal:
+        print(f"📝 ジャーナル: {journal.path}" + (" (再開)" if resume else ""))
     print("=" * 50)
 
-    results = director.hunt_batch(desires)
+    # 完了した欲求から順に表示
+    total_products = 0
+    try:
+        for index, result in director.iter_hunt_batch(
+            desires, concurrency=concurrency, journal=journal, resume=resume
+        ):
+            product_count = len(result.products)
+            total_products += product_count
+            status = "✅" if product_count > 0 else "❌"
+            print(f"{status} {index + 1}. {result.desire[:30]}... -> {product_count}件")
+    except KeyboardInterrupt:
+        if journal:
+            print(f"\n⏸️ 再開するには: python main.py --batch {file_path} --resume")
+        raise
+    finally:
+        if journal:
+            journal.close()
 
-    # サマリー表示
     print("\n" + "=" * 50)
     print("📊 バッチ処理結果")
     print("=" * 50)
 
-    total_products = 0
-    for i, result in enumerate(results, 1):
-        product_count = len(result.products)
-        total_products += product_count
-        status = "✅" if product_count > 0 else "❌"
-        print(f"{status} {i}. {result.desire[:30]}... -> {product_count}件")
-
     print(f"\n合計: {total_products}件の製品を発見")
 
 
+def transfer_products(
+    export_path: Optional[str], import_path: Optional[str], enable_sheets: bool
+) -> None:
+    """製品ストアと Parquet / Arrow IPC ファイルの間で製品を書き出し・読み込み"""
+    from src.infrastructure.repositories.columnar_store import (
+        export_products,
+        import_products,
+    )
+
+    # SQLite保存時は大量の行をSheetsへ書き出さないよう、ストアだけを使う
+    repository = create_repository(
+        enable_sheets=enable_sheets and settings.product_store != "sqlite"
+    )
+    if repository is None:
+        print("エラー: 製品ストアが設定されていません")
+        sys.exit(1)
+
+    if import_path:
+        count = import_products(import_path, repository)
+        print(f"📥 インポート: {count}件 <- {import_path}")
+    if export_path:
+        count = export_products(repository, export_path)
+        print(f"📤 エクスポート: {count}件 -> {export_path}")
+
+
 def main():
     """メインエントリーポイント"""
     parser = argparse.ArgumentParser(
@@ -152,7 +208,10 @@ def main():
   %(prog)s "快適な在宅勤務環境を作りたい"
   %(prog)s --quick "高品質なワイヤレスイヤホン"
   %(prog)s --batch desires.txt
+  %(prog)s --batch desires.txt --parallel 4
+  %(prog)s --batch desires.txt --resume
   %(prog)s --no-sheets "テスト検索"
+  %(prog)s --export products.parquet
         """,
     )
 
@@ -168,6 +227,32 @@ def main():
         help="欲求リストファイルでバッチ処理",
     )
 
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        metavar="N",
+        help="バッチ処理で同時に処理する欲求の数（デフォルト: BATCH_CONCURRENCY）",
+    )
+
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="製品ストアを Parquet (.parquet) / Arrow IPC (.arrow) に書き出す",
+    )
+
+    parser.add_argument(
+        "--import",
+        dest="import_file",
+        metavar="FILE",
+        help="Parquet / Arrow IPC ファイルの製品を製品ストアに取り込む",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="中断したバッチ処理をジャーナルから再開（完了済みの欲求は再実行しない）",
+    )
+
     parser.add_argument(
         "--quick",
         action="store_true",
@@ -180,6 +265,18 @@ def main():
         help="Google Sheetsへの保存を無効化",
     )
 
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="検索・スクレイピング・抽出を並行実行するパイプラインモード",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="適合度を満たす製品がそろった時点で探索を打ち切る逐次モード",
+    )
+
     parser.add_argument(
         "--max-products",
         type=int,
@@ -205,6 +302,15 @@ def main():
     # ロギング設定
     setup_logging(args.verbose)
 
+    # 製品データの書き出し・読み込み（APIキー不要）
+    if args.export or args.import_file:
+        try:
+            transfer_products(args.export, args.import_file, not args.no_sheets)
+        except (ImportError, ValueError) as e:
+            print(f"エラー: {e}")
+            sys.exit(1)
+        return
+
     # 引数チェック
     if not args.desire and not args.batch:
         parser.print_help()
@@ -221,11 +327,15 @@ def main():
 
     # Director作成
     enable_sheets = not args.no_sheets and not args.quick
-    director = create_director(enable_sheets=enable_sheets)
+    director = create_director(
+        enable_sheets=enable_sheets,
+        pipeline=True if args.pipeline else None,
+        incremental=True if args.incremental else None,
+    )
 
     try:
         if args.batch:
-            hunt_batch(director, args.batch)
+            hunt_batch(director, args.batch, args.parallel, args.resume)
         else:
             hunt_single(director, args.desire, args.quick)
 
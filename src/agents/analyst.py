@@ -5,11 +5,17 @@ Analyst エージェント
 Gemini を使用して構造化抽出を実現。
 """
 
+import asyncio
+import contextvars
 import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+from src.core.config import settings
 from src.domain.models import Product
+from src.domain.structured_data import is_complete, product_from_structured
 from src.infrastructure.api_clients.gemini_client import GeminiClient
 from src.agents.researcher import ResearchResult
 
@@ -36,10 +42,20 @@ class AnalystAgent:
     - 欲求との適合度評価
     """
 
-    def __init__(self, llm_client: Optional[GeminiClient] = None):
+    def __init__(
+        self,
+        llm_client: Optional[GeminiClient] = None,
+        two_phase: Optional[bool] = None,
+    ):
         self.llm_client = llm_client or GeminiClient()
+        self.two_phase = (
+            settings.two_phase_extraction if two_phase is None else two_phase
+        )
+        self.use_structured_data = settings.structured_data_enabled
         self.extraction_count = 0
         self.success_count = 0
+        self.structured_count = 0  # LLM抽出を省略できた件数
+        self._stats_lock = threading.Lock()
 
     def analyze(
         self, research: ResearchResult, desire: str
@@ -54,45 +70,170 @@ class AnalystAgent:
         Returns:
             AnalysisResult
         """
-        self.extraction_count += 1
+        with self._stats_lock:
+            self.extraction_count += 1
 
         try:
             # LLMで製品情報を抽出
-            product = self.llm_client.extract_product(research.content, desire)
+            product = self._extract(research, desire)
+            return self._build_result(research, product)
 
-            if product:
-                # メタデータを追加
-                product.source_url = research.url
-                product.source_language = research.language
+        except Exception as e:
+            return self._error_result(research, e)
 
-                self.success_count += 1
-                logger.info(
-                    f"製品抽出成功: {product.name} (適合度: {product.relevance_score})"
-                )
+    def _structured_product(self, research: ResearchResult) -> Optional[Product]:
+        """
+        構造化データ（JSON-LD等）から製品を生成
 
-                return AnalysisResult(
-                    research=research,
-                    product=product,
-                    success=True,
-                )
-            else:
-                logger.debug(f"製品情報なし: {research.url}")
-                return AnalysisResult(
-                    research=research,
-                    product=None,
-                    success=False,
-                    error_message="製品情報が見つかりませんでした",
-                )
+        製品名と価格が揃っている場合のみ返し、LLMによる抽出を省略する。
+
+        Args:
+            research: リサーチ結果
+
+        Returns:
+            製品（適合度は未評価）、または None
+        """
+        if not self.use_structured_data or not is_complete(research.structured):
+            return None
+
+        product = product_from_structured(research.structured, research.url)
+        if product:
+            with self._stats_lock:
+                self.structured_count += 1
+            logger.debug(f"構造化データから製品を取得: {product.name}")
+        return product
+
+    def _extract(self, research: ResearchResult, desire: str) -> Optional[Product]:
+        """
+        リサーチ結果から製品を抽出し、適合度を付与
+
+        構造化データで製品情報が揃うページは適合度評価だけをLLMで行う。
+        二段階モードでは欲求非依存の製品情報抽出（ページ単位でキャッシュ）の後、
+        軽量な適合度評価を行う。
+
+        Args:
+            research: リサーチ結果
+            desire: ユーザーの欲求
+
+        Returns:
+            製品、または None
+        """
+        structured = self._structured_product(research)
+        if structured:
+            score = self.llm_client.score_relevance(structured, desire)
+            self._apply_score(structured, desire, score)
+            return structured
+
+        content = research.content
+        if not self.two_phase:
+            return self.llm_client.extract_product(content, desire)
+
+        product = self.llm_client.extract_product_info(content)
+        if product:
+            score = self.llm_client.score_relevance(product, desire)
+            self._apply_score(product, desire, score)
+        return product
+
+    async def _extract_async(
+        self, research: ResearchResult, desire: str
+    ) -> Optional[Product]:
+        """リサーチ結果から製品を抽出し、適合度を付与（非同期版）"""
+        structured = self._structured_product(research)
+        if structured:
+            scores = await self.llm_client.score_products_async([structured], desire)
+            self._apply_score(structured, desire, scores[0])
+            return structured
+
+        content = research.content
+        if not self.two_phase:
+            return await self.llm_client.extract_product_async(content, desire)
+
+        product = await self.llm_client.extract_product_info_async(content)
+        if product:
+            scores = await self.llm_client.score_products_async([product], desire)
+            self._apply_score(product, desire, scores[0])
+        return product
+
+    def _apply_score(
+        self, product: Product, desire: str, score: tuple[int, str]
+    ) -> None:
+        """二段階モードの評価結果を製品に反映"""
+        product.relevance_score, product.reasoning = score
+        product.desire = desire
+
+    def _error_result(
+        self, research: ResearchResult, error: Exception
+    ) -> AnalysisResult:
+        """分析失敗時の AnalysisResult を生成"""
+        logger.error(f"分析エラー: {research.url} - {error}")
+        return AnalysisResult(
+            research=research,
+            product=None,
+            success=False,
+            error_message=str(error),
+        )
+
+    def _build_result(
+        self, research: ResearchResult, product: Optional[Product]
+    ) -> AnalysisResult:
+        """
+        抽出結果から AnalysisResult を生成
+
+        Args:
+            research: リサーチ結果
+            product: 抽出された製品（見つからなければ None）
+
+        Returns:
+            AnalysisResult
+        """
+        if product:
+            # メタデータを追加
+            product.source_url = research.url
+            product.source_language = research.language
+
+            with self._stats_lock:
+                self.success_count += 1
+            logger.info(
+                f"製品抽出成功: {product.name} (適合度: {product.relevance_score})"
+            )
 
-        except Exception as e:
-            logger.error(f"分析エラー: {research.url} - {e}")
             return AnalysisResult(
                 research=research,
-                product=None,
-                success=False,
-                error_message=str(e),
+                product=product,
+                success=True,
             )
 
+        logger.debug(f"製品情報なし: {research.url}")
+        return AnalysisResult(
+            research=research,
+            product=None,
+            success=False,
+            error_message="製品情報が見つかりませんでした",
+        )
+
+    async def analyze_async(
+        self, research: ResearchResult, desire: str
+    ) -> AnalysisResult:
+        """
+        リサーチ結果を分析し、製品情報を抽出（非同期版）
+
+        Args:
+            research: リサーチ結果
+            desire: ユーザーの欲求
+
+        Returns:
+            AnalysisResult
+        """
+        with self._stats_lock:
+            self.extraction_count += 1
+
+        try:
+            product = await self._extract_async(research, desire)
+            return self._build_result(research, product)
+
+        except Exception as e:
+            return self._error_result(research, e)
+
     def analyze_batch(
         self,
         research_results: list[ResearchResult],
@@ -102,6 +243,11 @@ class AnalystAgent:
         """
         複数のリサーチ結果を一括分析
 
+        二段階モードでは全ページの製品情報を抽出した後、
+        適合度評価をまとめて1回（batch_size件ごと）で行う。
+        settings.extraction_batch_size が1より大きい場合は、
+        複数ページを1回のリクエストにまとめて抽出する。
+
         Args:
             research_results: リサーチ結果のリスト
             desire: ユーザーの欲求
@@ -110,11 +256,321 @@ class AnalystAgent:
         Returns:
             抽出された製品のリスト
         """
-        products = []
+        structured, remaining = self._partition_structured(research_results)
+        results = self._score_structured(structured, desire)
+
+        if self.two_phase:
+            results += self._analyze_batch_two_phase(remaining, desire)
+        elif settings.extraction_batch_size > 1:
+            results += self._analyze_batch_packed(remaining, desire)
+        else:
+            results += [self.analyze(research, desire) for research in remaining]
+        products = self.select_products(results, min_relevance_score)
+
+        logger.info(
+            f"バッチ分析完了: {len(products)}/{len(research_results)}件 "
+            f"(適合度{min_relevance_score}以上)"
+        )
+        return products
+
+    async def analyze_batch_async(
+        self,
+        research_results: list[ResearchResult],
+        desire: str,
+        min_relevance_score: int = 5,
+        concurrency: Optional[int] = None,
+    ) -> list[Product]:
+        """
+        複数のリサーチ結果を並行分析（非同期版）
+
+        Args:
+            research_results: リサーチ結果のリスト
+            desire: ユーザーの欲求
+            min_relevance_score: 最小適合度（これ以下は除外）
+            concurrency: 同時抽出数
+
+        Returns:
+            抽出された製品のリスト
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.async_concurrency))
+
+        structured, remaining = self._partition_structured(research_results)
+        results = await self._score_structured_async(structured, desire)
+
+        if self.two_phase:
+            results += await self._analyze_batch_two_phase_async(
+                remaining, desire, semaphore
+            )
+        elif settings.extraction_batch_size > 1:
+            with self._stats_lock:
+                self.extraction_count += len(remaining)
+            extracted = await self.llm_client.extract_products_batch_async(
+                [r.content for r in remaining], desire
+            )
+            results += self._merge_extracted(remaining, extracted)
+        else:
+
+            async def _analyze(research: ResearchResult) -> AnalysisResult:
+                async with semaphore:
+                    return await self.analyze_async(research, desire)
+
+            results += await asyncio.gather(*(_analyze(r) for r in remaining))
+
+        products = self.select_products(results, min_relevance_score)
+
+        logger.info(
+            f"バッチ分析完了: {len(products)}/{len(research_results)}件 "
+            f"(適合度{min_relevance_score}以上)"
+        )
+        return products
+
+    def _partition_structured(
+        self, research_results: list[ResearchResult]
+    ) -> tuple[list[tuple[ResearchResult, Product]], list[ResearchResult]]:
+        """
+        構造化データで製品情報が揃うページとLLM抽出が必要なページに分ける
+
+        Args:
+            research_results: リサーチ結果のリスト
+
+        Returns:
+            ((リサーチ結果, 製品) のリスト, 残りのリサーチ結果のリスト)
+        """
+        structured = []
+        remaining = []
+
+        for research in research_results:
+            product = self._structured_product(research)
+            if product:
+                structured.append((research, product))
+            else:
+                remaining.append(research)
+
+        return structured, remaining
+
+    def _score_structured(
+        self, structured: list[tuple[ResearchResult, Product]], desire: str
+    ) -> list[AnalysisResult]:
+        """構造化データから得た製品の適合度だけをまとめて評価"""
+        if not structured:
+            return []
+
+        with self._stats_lock:
+            self.extraction_count += len(structured)
+
+        products = [product for _, product in structured]
+        scores = self.llm_client.score_products(products, desire)
+        return self._merge_structured(structured, scores, desire)
+
+    async def _score_structured_async(
+        self, structured: list[tuple[ResearchResult, Product]], desire: str
+    ) -> list[AnalysisResult]:
+        """構造化データから得た製品の適合度だけをまとめて評価（非同期版）"""
+        if not structured:
+            return []
+
+        with self._stats_lock:
+            self.extraction_count += len(structured)
+
+        products = [product for _, product in structured]
+        scores = await self.llm_client.score_products_async(products, desire)
+        return self._merge_structured(structured, scores, desire)
+
+    def _merge_structured(
+        self,
+        structured: list[tuple[ResearchResult, Product]],
+        scores: list[tuple[int, str]],
+        desire: str,
+    ) -> list[AnalysisResult]:
+        """構造化データの製品に適合度を反映して AnalysisResult を生成"""
+        results = []
+
+        for (research, product), score in zip(structured, scores):
+            self._apply_score(product, desire, score)
+            results.append(self._build_result(research, product))
+
+        return results
+
+    def _analyze_batch_packed(
+        self, research_results: list[ResearchResult], desire: str
+    ) -> list[AnalysisResult]:
+        """
+        複数ページを1リクエストにまとめて一括分析
+
+        Args:
+            research_results: リサーチ結果のリスト
+            desire: ユーザーの欲求
+
+        Returns:
+            research_results と同じ順序の AnalysisResult のリスト
+        """
+        with self._stats_lock:
+            self.extraction_count += len(research_results)
+
+        extracted = self.llm_client.extract_products_batch(
+            [r.content for r in research_results], desire
+        )
+        return self._merge_extracted(research_results, extracted)
+
+    def _merge_extracted(
+        self,
+        research_results: list[ResearchResult],
+        extracted: list[Optional[Product] | Exception],
+    ) -> list[AnalysisResult]:
+        """一括抽出の結果を各リサーチ結果の AnalysisResult に対応付ける"""
+        results = []
+
+        for research, item in zip(research_results, extracted):
+            if isinstance(item, Exception):
+                results.append(self._error_result(research, item))
+            else:
+                results.append(self._build_result(research, item))
+
+        return results
+
+    def _analyze_batch_two_phase(
+        self, research_results: list[ResearchResult], desire: str
+    ) -> list[AnalysisResult]:
+        """
+        二段階モードで一括分析
+
+        Args:
+            research_results: リサーチ結果のリスト
+            desire: ユーザーの欲求
+
+        Returns:
+            research_results と同じ順序の AnalysisResult のリスト
+        """
+        extracted: list[Optional[Product] | Exception] = []
 
         for research in research_results:
-            result = self.analyze(research, desire)
+            with self._stats_lock:
+                self.extraction_count += 1
+            try:
+                extracted.append(self.llm_client.extract_product_info(research.content))
+            except Exception as e:
+                extracted.append(e)
 
+        found = [p for p in extracted if isinstance(p, Product)]
+        scores = self.llm_client.score_products(found, desire) if found else []
+
+        return self._merge_two_phase(research_results, extracted, scores, desire)
+
+    async def _analyze_batch_two_phase_async(
+        self,
+        research_results: list[ResearchResult],
+        desire: str,
+        semaphore: asyncio.Semaphore,
+    ) -> list[AnalysisResult]:
+        """二段階モードで一括分析（非同期版）"""
+
+        async def _extract_info(research: ResearchResult) -> Optional[Product]:
+            with self._stats_lock:
+                self.extraction_count += 1
+            async with semaphore:
+                return await self.llm_client.extract_product_info_async(
+                    research.content
+                )
+
+        extracted = await asyncio.gather(
+            *(_extract_info(r) for r in research_results), return_exceptions=True
+        )
+
+        found = [p for p in extracted if isinstance(p, Product)]
+        scores = (
+            await self.llm_client.score_products_async(found, desire) if found else []
+        )
+
+        return self._merge_two_phase(research_results, extracted, scores, desire)
+
+    def _merge_two_phase(
+        self,
+        research_results: list[ResearchResult],
+        extracted: list,
+        scores: list[tuple[int, str]],
+        desire: str,
+    ) -> list[AnalysisResult]:
+        """抽出結果と適合度評価を突き合わせて AnalysisResult を生成"""
+        score_iter = iter(scores)
+        results = []
+
+        for research, item in zip(research_results, extracted):
+            if isinstance(item, Exception):
+                results.append(self._error_result(research, item))
+                continue
+
+            if item is not None:
+                self._apply_score(item, desire, next(score_iter))
+            results.append(self._build_result(research, item))
+
+        return results
+
+    def iter_analyze(
+        self,
+        research_results: Iterable[ResearchResult],
+        desire: str,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[AnalysisResult]:
+        """
+        リサーチ結果を受け取り次第、並行して分析する
+
+        research_results はジェネレータでもよい。1件受け取るごとに
+        抽出をスレッドプールへ投入するため、後続ページのスクレイピング中に
+        先行ページの抽出が進む。
+
+        Args:
+            research_results: リサーチ結果のイテラブル（逐次生成可）
+            desire: ユーザーの欲求
+            max_workers: 抽出ステージの並列数
+
+        Yields:
+            AnalysisResult（完了順）
+        """
+        max_workers = max(1, max_workers or settings.extract_workers)
+        pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="analyst-extract"
+        )
+        pending: set[Future] = set()
+
+        try:
+            for research in research_results:
+                # ハントの予算をワーカースレッドに引き継ぐ
+                context = contextvars.copy_context()
+                pending.add(pool.submit(context.run, self.analyze, research, desire))
+
+                # 入力待ちの合間に完了済みの結果を返す
+                done, pending = wait(pending, timeout=0)
+                for future in done:
+                    yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def select_products(
+        self,
+        results: Iterable[AnalysisResult],
+        min_relevance_score: int = 5,
+    ) -> list[Product]:
+        """
+        分析結果から適合度を満たす製品を取り出す
+
+        Args:
+            results: 分析結果のイテラブル
+            min_relevance_score: 最小適合度（これ以下は除外）
+
+        Returns:
+            製品のリスト
+        """
+        products = []
+
+        for result in results:
             if result.success and result.product:
                 # 適合度でフィルタリング
                 if result.product.relevance_score >= min_relevance_score:
@@ -125,10 +581,6 @@ class AnalystAgent:
                         f"(スコア: {result.product.relevance_score})"
                     )
 
-        logger.info(
-            f"バッチ分析完了: {len(products)}/{len(research_results)}件 "
-            f"(適合度{min_relevance_score}以上)"
-        )
         return products
 
     def rank_products(
@@ -240,11 +692,14 @@ class AnalystAgent:
         return {
             "total_extractions": self.extraction_count,
             "successful_extractions": self.success_count,
+            "structured_extractions": self.structured_count,
             "success_rate": f"{success_rate:.1f}%",
         }
 
     def reset_statistics(self) -> None:
         """統計をリセット"""
-        self.extraction_count = 0
-        self.success_count = 0
+        with self._stats_lock:
+            self.extraction_count = 0
+            self.success_count = 0
+            self.structured_count = 0
         logger.debug("分析統計をリセットしました")
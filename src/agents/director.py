@@ -6,15 +6,33 @@ Director エージェント
 全プロセスをオーケストレーション。
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from typing import Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Iterator, Optional
 
 from src.core.config import settings
+from src.core.interfaces import ProductRepository
+from src.domain.hunt_budget import HuntBudget, current_budget, use_budget
 from src.domain.models import Product, DesireAnalysis
+from src.domain.top_k import TopKProducts
 from src.infrastructure.api_clients.gemini_client import GeminiClient
+from src.infrastructure.repositories.batch_journal import (
+    STAGE_ANALYSIS,
+    STAGE_PRODUCTS,
+    STAGE_RESEARCH,
+    BatchJournal,
+    DesireCheckpoint,
+)
+from src.infrastructure.repositories.exporting_repo import (
+    ExportingProductRepository,
+)
 from src.infrastructure.repositories.gsheets_repo import GSheetsProductRepository
-from src.agents.researcher import ResearcherAgent
+from src.infrastructure.repositories.sqlite_repo import SQLiteProductRepository
+from src.infrastructure.repositories.write_behind import WriteBehindRepository
+from src.agents.researcher import ResearcherAgent, ResearchResult
 from src.agents.analyst import AnalystAgent
 
 logger = logging.getLogger(__name__)
@@ -31,10 +49,14 @@ class HuntResult:
     total_extracted: int = 0
     total_saved: int = 0
     errors: list[str] = field(default_factory=list)
+    stopped_early: bool = False  # 上位K件の確定または予算到達で打ち切ったか
+    stop_reason: str = ""
+    budget_exceeded: bool = False  # 予算超過で途中結果を返したか
+    budget_usage: dict = field(default_factory=dict)
 
     def summary(self) -> str:
         """結果のサマリーを返す"""
-        return (
+        summary = (
             f"欲求: {self.desire}\n"
             f"検索: {self.total_searched}件\n"
             f"リサーチ: {self.total_researched}件\n"
@@ -42,6 +64,21 @@ class HuntResult:
             f"保存: {self.total_saved}件\n"
             f"エラー: {len(self.errors)}件"
         )
+        if self.stopped_early:
+            summary += f"\n早期終了: {self.stop_reason}"
+        return summary
+
+    def to_dict(self) -> dict:
+        """バッチジャーナルに記録するためJSONに変換できる辞書にする"""
+        data = asdict(self)
+        data["products"] = [p.model_dump(mode="json") for p in self.products]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HuntResult":
+        """to_dict() の結果から復元"""
+        products = [Product.model_validate(p) for p in data.get("products", [])]
+        return cls(**{**data, "products": products})
 
 
 class DirectorAgent:
@@ -60,12 +97,43 @@ class DirectorAgent:
         llm_client: Optional[GeminiClient] = None,
         researcher: Optional[ResearcherAgent] = None,
         analyst: Optional[AnalystAgent] = None,
-        repository: Optional[GSheetsProductRepository] = None,
+        repository: Optional[ProductRepository] = None,
+        pipeline: Optional[bool] = None,
+        incremental: Optional[bool] = None,
     ):
         self.llm_client = llm_client or GeminiClient()
         self.researcher = researcher or ResearcherAgent()
         self.analyst = analyst or AnalystAgent()
         self.repository = repository
+        self.pipeline = settings.pipeline_enabled if pipeline is None else pipeline
+        self.incremental = (
+            settings.incremental_hunt if incremental is None else incremental
+        )
+        self._save_lock = threading.Lock()  # 並列バッチで保存を直列化
+
+    def create_budget(self) -> HuntBudget:
+        """
+        設定値から1回のハントの予算を生成
+
+        Returns:
+            HuntBudget（0の項目は無制限）
+        """
+        return HuntBudget(
+            max_seconds=settings.hunt_time_budget,
+            max_pages=settings.hunt_page_budget,
+            max_llm_tokens=settings.hunt_max_llm_tokens,
+            max_serper_calls=settings.hunt_max_serper_calls,
+            max_firecrawl_credits=settings.hunt_max_firecrawl_credits,
+        )
+
+    def _record_budget(self, result: HuntResult, budget: HuntBudget) -> None:
+        """予算の消費状況と超過の有無をHuntResultに記録"""
+        result.budget_usage = budget.get_usage()
+        if budget.exceeded:
+            result.budget_exceeded = True
+            result.stopped_early = True
+            result.stop_reason = result.stop_reason or budget.exceeded_reason
+            logger.warning(f"予算超過のため途中結果を返します: {result.stop_reason}")
 
     def hunt(
         self,
@@ -73,6 +141,8 @@ class DirectorAgent:
         max_products: int = None,
         min_relevance_score: int = 5,
         save_to_sheets: bool = True,
+        budget: Optional[HuntBudget] = None,
+        checkpoint: Optional[DesireCheckpoint] = None,
     ) -> HuntResult:
         """
         欲求に基づいて製品を探索
@@ -81,15 +151,39 @@ class DirectorAgent:
         欲求を受け取り、検索→リサーチ→分析→保存の
         全プロセスを実行。
 
+        予算（締め切り・LLMトークン・Serper呼び出し・Firecrawlクレジット）は
+        各エージェント・クライアントに引き継がれ、超過した時点で
+        新たなAPI呼び出しを止める。その場合は budget_exceeded=True の
+        途中結果を返す。
+
         Args:
             desire: ユーザーの欲求
             max_products: 取得する最大製品数
             min_relevance_score: 最小適合度
             save_to_sheets: Google Sheetsに保存するか
+            budget: ハントの予算（Noneなら設定値から生成）
+            checkpoint: バッチジャーナルの記録先（記録済みのステップは再実行しない）
 
         Returns:
             HuntResult
         """
+        budget = budget or self.create_budget()
+        with use_budget(budget):
+            result = self._hunt(
+                desire, max_products, min_relevance_score, save_to_sheets, checkpoint
+            )
+        self._record_budget(result, budget)
+        return result
+
+    def _hunt(
+        self,
+        desire: str,
+        max_products: Optional[int],
+        min_relevance_score: int,
+        save_to_sheets: bool,
+        checkpoint: Optional[DesireCheckpoint] = None,
+    ) -> HuntResult:
+        """hunt() の本体（予算は呼び出し側で紐づける）"""
         max_products = max_products or settings.max_products_per_desire
         result = HuntResult(desire=desire)
 
@@ -98,56 +192,197 @@ class DirectorAgent:
         try:
             # Step 1: 欲求の分析・翻訳
             logger.info("Step 1: 欲求を分析中...")
-            analysis = self._analyze_desire(desire)
+            analysis = self._restore_analysis(checkpoint)
+            if analysis is None:
+                analysis = self._analyze_desire(desire)
 
-            if not analysis.translated_queries:
-                # 翻訳クエリがない場合、デフォルト生成
-                queries = self.llm_client.generate_search_queries(
-                    desire, settings.search_languages
-                )
-                analysis.translated_queries = queries
+                if not analysis.translated_queries:
+                    # 翻訳クエリがない場合、デフォルト生成
+                    queries = self.llm_client.generate_search_queries(
+                        desire, settings.search_languages
+                    )
+                    analysis.translated_queries = queries
+
+                if checkpoint:
+                    checkpoint.store(STAGE_ANALYSIS, analysis.model_dump(mode="json"))
 
             logger.info(f"翻訳クエリ: {len(analysis.translated_queries)}件")
 
-            # Step 2: 検索・リサーチ
-            logger.info("Step 2: 検索・リサーチ中...")
-            research_results = self.researcher.execute_research(
-                translated_queries=analysis.translated_queries,
-                results_per_query=5,
-                max_total_results=max_products * 2,  # 余裕を持って取得
+            result.total_searched = len(analysis.translated_queries) * 5
+
+            products = self._restore_products(checkpoint, result)
+            if products is None:
+                if self.incremental:
+                    # Step 2-3: 上位K件がそろうまで検索・リサーチ・抽出を逐次実行
+                    logger.info("Step 2-3: 検索・リサーチ・抽出を逐次実行中...")
+                    products = self._research_and_analyze_incremental(
+                        desire=desire,
+                        analysis=analysis,
+                        max_products=max_products,
+                        min_relevance_score=min_relevance_score,
+                        result=result,
+                    )
+                elif self.pipeline:
+                    # Step 2-3: 検索・リサーチ・抽出を並行実行
+                    logger.info("Step 2-3: 検索・リサーチ・抽出をパイプライン実行中...")
+                    products = self._research_and_analyze_pipeline(
+                        desire=desire,
+                        analysis=analysis,
+                        max_products=max_products,
+                        min_relevance_score=min_relevance_score,
+                        result=result,
+                    )
+                else:
+                    # Step 2: 検索・リサーチ
+                    logger.info("Step 2: 検索・リサーチ中...")
+                    research_results = self._research(
+                        analysis, max_products, checkpoint
+                    )
+
+                    result.total_researched = len(research_results)
+                    logger.info(f"リサーチ完了: {result.total_researched}件")
+
+                    # Step 3: 分析・抽出
+                    logger.info("Step 3: 製品情報を抽出中...")
+                    products = self.analyst.analyze_batch(
+                        research_results=research_results,
+                        desire=desire,
+                        min_relevance_score=min_relevance_score,
+                    )
+
+                # 重複除去とランキング
+                products = self.analyst.deduplicate_products(products)
+                products = self.analyst.rank_products(products, max_products)
+                self._checkpoint_products(checkpoint, products, result)
+
+            result.products = products
+            result.total_extracted = len(products)
+            logger.info(f"抽出完了: {result.total_extracted}件")
+
+            # Step 4: 保存
+            if save_to_sheets and self.repository and products:
+                logger.info("Step 4: 製品を保存中...")
+                self._save_step(products, result, checkpoint)
+
+            logger.info(f"=== ハント完了 ===\n{result.summary()}")
+
+        except Exception as e:
+            error_msg = f"ハントエラー: {e}"
+            logger.error(error_msg)
+            result.errors.append(error_msg)
+
+        return result
+
+    async def hunt_async(
+        self,
+        desire: str,
+        max_products: int = None,
+        min_relevance_score: int = 5,
+        save_to_sheets: bool = True,
+        budget: Optional[HuntBudget] = None,
+        checkpoint: Optional[DesireCheckpoint] = None,
+    ) -> HuntResult:
+        """
+        欲求に基づいて製品を探索（非同期版）
+
+        hunt() と同じ処理をasyncioで実行する。検索・スクレイピング・抽出は
+        それぞれ settings.async_concurrency 件まで同時に発行される。
+        締め切りに達した時点で実行中のリクエストを取り消す。
+
+        Args:
+            desire: ユーザーの欲求
+            max_products: 取得する最大製品数
+            min_relevance_score: 最小適合度
+            save_to_sheets: Google Sheetsに保存するか
+            budget: ハントの予算（Noneなら設定値から生成）
+            checkpoint: バッチジャーナルの記録先（記録済みのステップは再実行しない）
+
+        Returns:
+            HuntResult
+        """
+        budget = budget or self.create_budget()
+        with use_budget(budget):
+            result = await self._hunt_async(
+                desire, max_products, min_relevance_score, save_to_sheets, checkpoint
             )
+        self._record_budget(result, budget)
+        return result
+
+    async def _hunt_async(
+        self,
+        desire: str,
+        max_products: Optional[int],
+        min_relevance_score: int,
+        save_to_sheets: bool,
+        checkpoint: Optional[DesireCheckpoint] = None,
+    ) -> HuntResult:
+        """hunt_async() の本体（予算は呼び出し側で紐づける）"""
+        max_products = max_products or settings.max_products_per_desire
+        result = HuntResult(desire=desire)
+
+        logger.info(f"=== ハント開始: {desire} ===")
+
+        try:
+            # Step 1: 欲求の分析・翻訳
+            logger.info("Step 1: 欲求を分析中...")
+            analysis = self._restore_analysis(checkpoint)
+            if analysis is None:
+                analysis = await self._analyze_desire_async(desire)
+
+                if not analysis.translated_queries:
+                    # 翻訳クエリがない場合、デフォルト生成
+                    queries = await self.llm_client.generate_search_queries_async(
+                        desire, settings.search_languages
+                    )
+                    analysis.translated_queries = queries
+
+                if checkpoint:
+                    checkpoint.store(STAGE_ANALYSIS, analysis.model_dump(mode="json"))
+
+            logger.info(f"翻訳クエリ: {len(analysis.translated_queries)}件")
 
             result.total_searched = len(analysis.translated_queries) * 5
-            result.total_researched = len(research_results)
-            logger.info(f"リサーチ完了: {result.total_researched}件")
 
-            # Step 3: 分析・抽出
-            logger.info("Step 3: 製品情報を抽出中...")
-            products = self.analyst.analyze_batch(
-                research_results=research_results,
-                desire=desire,
-                min_relevance_score=min_relevance_score,
-            )
+            products = self._restore_products(checkpoint, result)
+            if products is None:
+                # Step 2: 検索・リサーチ
+                logger.info("Step 2: 検索・リサーチ中...")
+                research_results = self._restore_research(checkpoint)
+                if research_results is None:
+                    research_results = await self.researcher.execute_research_async(
+                        translated_queries=analysis.translated_queries,
+                        results_per_query=5,
+                        max_total_results=max_products * 2,  # 余裕を持って取得
+                    )
+                    self._checkpoint_research(checkpoint, research_results)
+
+                result.total_researched = len(research_results)
+                logger.info(f"リサーチ完了: {result.total_researched}件")
 
-            # 重複除去とランキング
-            products = self.analyst.deduplicate_products(products)
-            products = self.analyst.rank_products(products, max_products)
+                # Step 3: 分析・抽出
+                logger.info("Step 3: 製品情報を抽出中...")
+                products = await self._within_deadline(
+                    self.analyst.analyze_batch_async(
+                        research_results=research_results,
+                        desire=desire,
+                        min_relevance_score=min_relevance_score,
+                    ),
+                    default=[],
+                )
+
+                # 重複除去とランキング
+                products = self.analyst.deduplicate_products(products)
+                products = self.analyst.rank_products(products, max_products)
+                self._checkpoint_products(checkpoint, products, result)
 
             result.products = products
             result.total_extracted = len(products)
             logger.info(f"抽出完了: {result.total_extracted}件")
 
-            # Step 4: 保存
+            # Step 4: 保存（gspreadは同期APIのためスレッドで実行）
             if save_to_sheets and self.repository and products:
-                logger.info("Step 4: Google Sheetsに保存中...")
-                try:
-                    self.repository.save_batch(products)
-                    result.total_saved = len(products)
-                    logger.info(f"保存完了: {result.total_saved}件")
-                except Exception as e:
-                    error_msg = f"保存エラー: {e}"
-                    logger.error(error_msg)
-                    result.errors.append(error_msg)
+                logger.info("Step 4: 製品を保存中...")
+                await asyncio.to_thread(self._save_step, products, result, checkpoint)
 
             logger.info(f"=== ハント完了 ===\n{result.summary()}")
 
@@ -158,6 +393,234 @@ class DirectorAgent:
 
         return result
 
+    def _research(
+        self,
+        analysis: DesireAnalysis,
+        max_products: int,
+        checkpoint: Optional[DesireCheckpoint],
+    ) -> list[ResearchResult]:
+        """検索・リサーチを実行（記録済みならスクレイピングし直さない）"""
+        research_results = self._restore_research(checkpoint)
+        if research_results is None:
+            research_results = self.researcher.execute_research(
+                translated_queries=analysis.translated_queries,
+                results_per_query=5,
+                max_total_results=max_products * 2,  # 余裕を持って取得
+            )
+            self._checkpoint_research(checkpoint, research_results)
+        return research_results
+
+    def _restore_analysis(
+        self, checkpoint: Optional[DesireCheckpoint]
+    ) -> Optional[DesireAnalysis]:
+        """記録済みの欲求分析を復元"""
+        data = checkpoint.load(STAGE_ANALYSIS) if checkpoint else None
+        if data is None:
+            return None
+        logger.info("記録済みの欲求分析を使用します")
+        return DesireAnalysis.model_validate(data)
+
+    def _restore_research(
+        self, checkpoint: Optional[DesireCheckpoint]
+    ) -> Optional[list[ResearchResult]]:
+        """記録済みのリサーチ結果を復元"""
+        data = checkpoint.load(STAGE_RESEARCH) if checkpoint else None
+        if data is None:
+            return None
+        logger.info(f"記録済みのリサーチ結果を使用します: {len(data)}件")
+        return [ResearchResult(**item) for item in data]
+
+    def _checkpoint_research(
+        self,
+        checkpoint: Optional[DesireCheckpoint],
+        research_results: list[ResearchResult],
+    ) -> None:
+        """リサーチ結果を記録"""
+        if checkpoint:
+            checkpoint.store(STAGE_RESEARCH, [asdict(r) for r in research_results])
+
+    def _restore_products(
+        self, checkpoint: Optional[DesireCheckpoint], result: HuntResult
+    ) -> Optional[list[Product]]:
+        """記録済みの抽出結果を復元し、リサーチ件数等をHuntResultに戻す"""
+        data = checkpoint.load(STAGE_PRODUCTS) if checkpoint else None
+        if data is None:
+            return None
+        logger.info(f"記録済みの抽出結果を使用します: {len(data['products'])}件")
+        result.total_researched = data["total_researched"]
+        result.stopped_early = data["stopped_early"]
+        result.stop_reason = data["stop_reason"]
+        return [Product.model_validate(p) for p in data["products"]]
+
+    def _checkpoint_products(
+        self,
+        checkpoint: Optional[DesireCheckpoint],
+        products: list[Product],
+        result: HuntResult,
+    ) -> None:
+        """重複除去・ランキング後の製品を記録"""
+        if checkpoint:
+            checkpoint.store(
+                STAGE_PRODUCTS,
+                {
+                    "products": [p.model_dump(mode="json") for p in products],
+                    "total_researched": result.total_researched,
+                    "stopped_early": result.stopped_early,
+                    "stop_reason": result.stop_reason,
+                },
+            )
+
+    def _save_step(
+        self,
+        products: list[Product],
+        result: HuntResult,
+        checkpoint: Optional[DesireCheckpoint],
+    ) -> None:
+        """
+        製品を保存し、保存済みマーカーを記録（記録済みなら保存しない）
+
+        書き込みバッファを経由する場合は、行が実際に書き込まれた時点で
+        保存済みにする。書き込みの完了は checkpoint.saving で受け取れる。
+        """
+        if checkpoint and checkpoint.saved:
+            result.total_saved = len(products)
+            logger.info("保存済みのため保存をスキップします")
+            return
+
+        try:
+            saving = self._save_products(products)
+            result.total_saved = len(products)
+            logger.info(f"保存完了: {result.total_saved}件")
+        except Exception as e:
+            error_msg = f"保存エラー: {e}"
+            logger.error(error_msg)
+            result.errors.append(error_msg)
+            return
+
+        if checkpoint:
+            count = len(products)
+
+            def _mark_saved(future: Future) -> None:
+                if future.exception() is None:
+                    checkpoint.mark_saved(count)
+
+            saving.add_done_callback(_mark_saved)
+            checkpoint.saving = saving
+
+    async def _within_deadline(self, awaitable, default):
+        """
+        ハントの締め切りまでに完了しなければ取り消して default を返す
+
+        Args:
+            awaitable: 実行する処理
+            default: 締め切りに達した場合の戻り値
+
+        Returns:
+            処理結果、または default
+        """
+        budget = current_budget()
+        timeout = budget.remaining_seconds if budget else None
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError:
+            budget.mark_exceeded(budget.deadline_reason() or "締め切りに到達")
+            logger.warning("締め切りに達したため抽出を打ち切りました")
+            return default
+
+    def _research_and_analyze_pipeline(
+        self,
+        desire: str,
+        analysis: DesireAnalysis,
+        max_products: int,
+        min_relevance_score: int,
+        result: HuntResult,
+    ) -> list[Product]:
+        """
+        検索・リサーチ・抽出をパイプラインで実行
+
+        スクレイピングが完了したページから順に抽出を開始する。
+
+        Args:
+            desire: ユーザーの欲求
+            analysis: 欲求分析結果
+            max_products: 取得する最大製品数
+            min_relevance_score: 最小適合度
+            result: 統計を書き込むHuntResult
+
+        Returns:
+            適合度を満たす製品のリスト
+        """
+        research_stream = self.researcher.iter_research_pipeline(
+            translated_queries=analysis.translated_queries,
+            results_per_query=5,
+            max_total_results=max_products * 2,  # 余裕を持って取得
+        )
+
+        analyses = list(self.analyst.iter_analyze(research_stream, desire))
+        result.total_researched = len(analyses)
+        logger.info(f"リサーチ完了: {result.total_researched}件")
+
+        return self.analyst.select_products(analyses, min_relevance_score)
+
+    def _research_and_analyze_incremental(
+        self,
+        desire: str,
+        analysis: DesireAnalysis,
+        max_products: int,
+        min_relevance_score: int,
+        result: HuntResult,
+    ) -> list[Product]:
+        """
+        上位K件がそろった時点で打ち切るパイプライン実行
+
+        抽出が完了した製品を上位K件のヒープに追加し、min_relevance_score 以上の
+        製品が max_products 件そろうか、時間・ページ予算を使い切った時点で
+        新たなスクレイピング・抽出の投入を止める。
+
+        Args:
+            desire: ユーザーの欲求
+            analysis: 欲求分析結果
+            max_products: 取得する最大製品数（K）
+            min_relevance_score: 最小適合度
+            result: 統計を書き込むHuntResult
+
+        Returns:
+            適合度上位の製品のリスト
+        """
+        top_k = TopKProducts(k=max_products, min_score=min_relevance_score)
+        budget = current_budget() or self.create_budget()
+
+        research_stream = self.researcher.iter_research_pipeline(
+            translated_queries=analysis.translated_queries,
+            results_per_query=5,
+            max_total_results=max_products * 2,  # 余裕を持って取得
+        )
+        analyses = self.analyst.iter_analyze(research_stream, desire)
+
+        try:
+            for analysis_result in analyses:
+                result.total_researched += 1
+                budget.record_page()
+                top_k.add(analysis_result.product)
+
+                if top_k.is_full:
+                    result.stop_reason = f"適合度{min_relevance_score}以上が{top_k.k}件確定"
+                else:
+                    result.stop_reason = budget.exhausted() or ""
+                    if result.stop_reason:
+                        budget.mark_exceeded(result.stop_reason)
+                if result.stop_reason:
+                    result.stopped_early = True
+                    logger.info(f"早期終了: {result.stop_reason}")
+                    break
+        finally:
+            # 実行中の抽出・スクレイピングを取り消し、新規投入を止める
+            analyses.close()
+            research_stream.close()
+
+        logger.info(f"リサーチ完了: {result.total_researched}件")
+        return top_k.products()
+
     def _analyze_desire(self, desire: str) -> DesireAnalysis:
         """
         欲求を分析
@@ -181,50 +644,390 @@ class DirectorAgent:
                 translated_queries=[],
             )
 
+    async def _analyze_desire_async(self, desire: str) -> DesireAnalysis:
+        """
+        欲求を分析（非同期版）
+
+        Args:
+            desire: ユーザーの欲求
+
+        Returns:
+            DesireAnalysis
+        """
+        try:
+            return await self.llm_client.analyze_desire_async(desire)
+        except Exception as e:
+            logger.warning(f"欲求分析エラー: {e}")
+            return DesireAnalysis(
+                original_desire=desire,
+                refined_desire=desire,
+                keywords=[desire],
+                category="",
+                translated_queries=[],
+            )
+
+    def _save_products(self, products: list[Product]) -> Future:
+        """
+        製品を保存（並列バッチの各欲求から同時に呼ばれても直列に書き込む）
+
+        Args:
+            products: 保存する製品のリスト
+
+        Returns:
+            書き込みの完了を通知する Future
+        """
+        with self._save_lock:
+            return self.repository.save_batch_deferred(products)
+
+    def _fork(self) -> "DirectorAgent":
+        """
+        1件の欲求を処理するための DirectorAgent を生成
+
+        訪問済みURLや抽出統計などの欲求ごとの状態は新しいエージェントに持たせ、
+        APIクライアント（接続プール・キャッシュ）とレートリミッタ、
+        保存先は共有する。
+
+        Returns:
+            状態を分離した DirectorAgent
+        """
+        researcher = ResearcherAgent(
+            search_client=self.researcher.search_client,
+            scraper_client=self.researcher.scraper_client,
+            distiller=self.researcher.distiller,
+            classifier=self.researcher.classifier,
+        )
+        analyst = AnalystAgent(
+            llm_client=self.analyst.llm_client, two_phase=self.analyst.two_phase
+        )
+
+        director = DirectorAgent(
+            llm_client=self.llm_client,
+            researcher=researcher,
+            analyst=analyst,
+            repository=self.repository,
+            pipeline=self.pipeline,
+            incremental=self.incremental,
+        )
+        director._save_lock = self._save_lock
+        return director
+
+    def iter_hunt_batch(
+        self,
+        desires: list[str],
+        max_products_per_desire: int = None,
+        min_relevance_score: int = 5,
+        concurrency: Optional[int] = None,
+        journal: Optional[BatchJournal] = None,
+        resume: bool = False,
+    ) -> Iterator[tuple[int, HuntResult]]:
+        """
+        複数の欲求を並列に処理し、完了した欲求から順に返す
+
+        各欲求は状態を分離したエージェントで処理するため、
+        同時に実行しても訪問済みURLや統計が混ざらない。
+
+        journal を指定すると欲求ごとの進捗と途中成果物を記録する。
+        resume=True なら完了済みの欲求は記録から復元して先に返し、
+        残りの欲求は記録済みのステップの続きから実行する。
+
+        Args:
+            desires: 欲求のリスト
+            max_products_per_desire: 各欲求での最大製品数
+            min_relevance_score: 最小適合度
+            concurrency: 同時に処理する欲求の数
+            journal: 進捗を記録するバッチジャーナル
+            resume: 中断したバッチを再開するか
+
+        Yields:
+            (desires 内のインデックス, HuntResult)（完了順）
+        """
+        run_id, restored = self._start_journal(desires, journal, resume)
+        completed = 0
+        for index, result in restored.items():
+            completed += 1
+            yield index, result
+
+        concurrency = max(1, concurrency or settings.batch_concurrency)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="hunt")
+
+        def _hunt(index: int, desire: str) -> HuntResult:
+            checkpoint = journal.checkpoint(run_id, index) if journal else None
+            result = self._fork().hunt(
+                desire=desire,
+                max_products=max_products_per_desire,
+                min_relevance_score=min_relevance_score,
+                checkpoint=checkpoint,
+            )
+            if journal:
+                recorded = self._complete_in_journal(
+                    journal, run_id, index, checkpoint, result
+                )
+                if recorded is not None:
+                    saves.append(recorded)
+            return result
+
+        saves: list[Future] = []
+        pending = {
+            pool.submit(_hunt, i, desire): i
+            for i, desire in enumerate(desires)
+            if i not in restored
+        }
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    completed += 1
+                    result = future.result()
+                    logger.info(
+                        f"--- バッチ処理: {completed}/{len(desires)} 完了 "
+                        f"({result.desire}: {len(result.products)}件) ---"
+                    )
+                    yield index, result
+            self._wait_for_saves(saves)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def hunt_batch(
         self,
         desires: list[str],
         max_products_per_desire: int = None,
         min_relevance_score: int = 5,
+        concurrency: Optional[int] = None,
+        journal: Optional[BatchJournal] = None,
+        resume: bool = False,
     ) -> list[HuntResult]:
         """
         複数の欲求を一括処理
 
+        concurrency（デフォルトは settings.batch_concurrency）件ずつ並列に処理する。
+        完了した順に受け取りたい場合は iter_hunt_batch() を使う。
+
         Args:
             desires: 欲求のリスト
             max_products_per_desire: 各欲求での最大製品数
             min_relevance_score: 最小適合度
+            concurrency: 同時に処理する欲求の数
+            journal: 進捗を記録するバッチジャーナル
+            resume: 中断したバッチを再開するか
 
         Returns:
-            HuntResult のリスト
+            HuntResult のリスト（desires と同じ順序）
         """
-        results = []
+        results: list[Optional[HuntResult]] = [None] * len(desires)
 
-        for i, desire in enumerate(desires, 1):
-            logger.info(f"--- バッチ処理: {i}/{len(desires)} ---")
+        for index, result in self.iter_hunt_batch(
+            desires,
+            max_products_per_desire=max_products_per_desire,
+            min_relevance_score=min_relevance_score,
+            concurrency=concurrency,
+            journal=journal,
+            resume=resume,
+        ):
+            results[index] = result
 
-            # リサーチャーの訪問済みURLをリセット
-            self.researcher.reset_visited()
-            self.analyst.reset_statistics()
+        self._log_batch_summary(results)
+        return results
 
-            result = self.hunt(
-                desire=desire,
-                max_products=max_products_per_desire,
-                min_relevance_score=min_relevance_score,
-            )
-            results.append(result)
+    async def iter_hunt_batch_async(
+        self,
+        desires: list[str],
+        max_products_per_desire: int = None,
+        min_relevance_score: int = 5,
+        concurrency: Optional[int] = None,
+        journal: Optional[BatchJournal] = None,
+        resume: bool = False,
+    ) -> AsyncIterator[tuple[int, HuntResult]]:
+        """
+        複数の欲求を並行に処理し、完了した欲求から順に返す（非同期版）
+
+        Args:
+            desires: 欲求のリスト
+            max_products_per_desire: 各欲求での最大製品数
+            min_relevance_score: 最小適合度
+            concurrency: 同時に処理する欲求の数
+            journal: 進捗を記録するバッチジャーナル
+            resume: 中断したバッチを再開するか
+
+        Yields:
+            (desires 内のインデックス, HuntResult)（完了順）
+        """
+        run_id, restored = self._start_journal(desires, journal, resume)
+        completed = 0
+        for index, result in restored.items():
+            completed += 1
+            yield index, result
+
+        concurrency = max(1, concurrency or settings.batch_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _hunt(index: int, desire: str) -> tuple[int, HuntResult]:
+            async with semaphore:
+                checkpoint = journal.checkpoint(run_id, index) if journal else None
+                result = await self._fork().hunt_async(
+                    desire=desire,
+                    max_products=max_products_per_desire,
+                    min_relevance_score=min_relevance_score,
+                    checkpoint=checkpoint,
+                )
+                if journal:
+                    recorded = self._complete_in_journal(
+                        journal, run_id, index, checkpoint, result
+                    )
+                    if recorded is not None:
+                        saves.append(recorded)
+                return index, result
+
+        saves: list[Future] = []
+
+        tasks = [
+            asyncio.create_task(_hunt(i, desire))
+            for i, desire in enumerate(desires)
+            if i not in restored
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                completed += 1
+                logger.info(
+                    f"--- バッチ処理: {completed}/{len(desires)} 完了 "
+                    f"({result.desire}: {len(result.products)}件) ---"
+                )
+                yield index, result
+            await asyncio.to_thread(self._wait_for_saves, saves)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def hunt_batch_async(
+        self,
+        desires: list[str],
+        max_products_per_desire: int = None,
+        min_relevance_score: int = 5,
+        concurrency: Optional[int] = None,
+        journal: Optional[BatchJournal] = None,
+        resume: bool = False,
+    ) -> list[HuntResult]:
+        """
+        複数の欲求を一括処理（非同期版）
+
+        concurrency 件の欲求を同時に処理し、各欲求の内部でも
+        検索・スクレイピング・抽出を並行実行する。
+
+        Args:
+            desires: 欲求のリスト
+            max_products_per_desire: 各欲求での最大製品数
+            min_relevance_score: 最小適合度
+            concurrency: 同時に処理する欲求の数
+            journal: 進捗を記録するバッチジャーナル
+            resume: 中断したバッチを再開するか
+
+        Returns:
+            HuntResult のリスト（desires と同じ順序）
+        """
+        results: list[Optional[HuntResult]] = [None] * len(desires)
+
+        async for index, result in self.iter_hunt_batch_async(
+            desires,
+            max_products_per_desire=max_products_per_desire,
+            min_relevance_score=min_relevance_score,
+            concurrency=concurrency,
+            journal=journal,
+            resume=resume,
+        ):
+            results[index] = result
+
+        self._log_batch_summary(results)
+        return results
+
+    def _start_journal(
+        self, desires: list[str], journal: Optional[BatchJournal], resume: bool
+    ) -> tuple[Optional[str], dict[int, HuntResult]]:
+        """
+        バッチジャーナルの記録を開始し、完了済みの欲求の結果を復元
+
+        Returns:
+            (バッチID, インデックス → 復元したHuntResult)
+        """
+        if journal is None:
+            return None, {}
+
+        run_id = journal.start(desires, resume=resume)
+        restored = {
+            index: HuntResult.from_dict(data)
+            for index, data in sorted(journal.completed(run_id).items())
+        }
+        if restored:
+            logger.info(f"記録済みの結果を復元しました: {len(restored)}件")
+        return run_id, restored
+
+    def _complete_in_journal(
+        self,
+        journal: BatchJournal,
+        run_id: str,
+        index: int,
+        checkpoint: DesireCheckpoint,
+        result: HuntResult,
+    ) -> Optional[Future]:
+        """
+        欲求の完了をジャーナルに記録
+
+        製品が書き込みバッファにある間は完了を記録せず、書き込まれた時点で
+        記録する（それまでに強制終了した欲求は、再開時に保存からやり直す）。
+        書き込みに失敗した場合はエラーを result に追加し、failed として記録する。
+
+        Returns:
+            書き込みを待っている場合は、完了を記録した時点で完了する Future
+        """
+
+        def _complete() -> None:
+            journal.complete(run_id, index, result.to_dict(), "; ".join(result.errors))
+
+        saving = checkpoint.saving
+        if saving is None:
+            _complete()
+            return None
+
+        recorded: Future = Future()
+
+        def _on_saved(future: Future) -> None:
+            try:
+                if future.exception() is not None:
+                    error_msg = f"保存エラー: {future.exception()}"
+                    logger.error(error_msg)
+                    result.errors.append(error_msg)
+                    result.total_saved = 0
+                _complete()
+            finally:
+                recorded.set_result(None)
+
+        saving.add_done_callback(_on_saved)
+        return recorded
 
-        # 全体の統計
+    def _wait_for_saves(self, saves: list[Future]) -> None:
+        """書き込み待ちの製品を書き込み、ジャーナルに完了が記録されるまで待つ"""
+        if not saves:
+            return
+        self.repository.flush()
+        wait(saves)
+
+    def _log_batch_summary(self, results: list[HuntResult]) -> None:
+        """バッチ全体の統計をログに出力"""
         total_products = sum(len(r.products) for r in results)
         total_errors = sum(len(r.errors) for r in results)
         logger.info(
             f"=== バッチ処理完了 ===\n"
-            f"欲求: {len(desires)}件\n"
+            f"欲求: {len(results)}件\n"
             f"製品: {total_products}件\n"
             f"エラー: {total_errors}件"
         )
 
-        return results
+    async def aclose(self) -> None:
+        """非同期クライアントが保持する接続を閉じる"""
+        await self.researcher.search_client.aclose()
+        await self.researcher.scraper_client.aclose()
 
     def quick_search(
         self,
@@ -275,24 +1078,93 @@ class DirectorAgent:
 
 def create_director(
     enable_sheets: bool = True,
+    pipeline: Optional[bool] = None,
+    incremental: Optional[bool] = None,
 ) -> DirectorAgent:
     """
     DirectorAgentのファクトリ関数
 
     Args:
         enable_sheets: Google Sheets連携を有効にするか
+        pipeline: パイプラインモードを使うか（Noneなら設定値に従う）
+        incremental: 逐次モードを使うか（Noneなら設定値に従う）
 
     Returns:
         設定済みのDirectorAgent
     """
-    repository = None
+    return DirectorAgent(
+        repository=create_repository(enable_sheets),
+        pipeline=pipeline,
+        incremental=incremental,
+    )
+
+
+def create_repository(enable_sheets: bool = True) -> Optional[ProductRepository]:
+    """
+    設定に応じた製品リポジトリを生成
+
+    PRODUCT_STORE=sqlite ならSQLiteを主保存先とし、Google Sheets は
+    エクスポート先として追加する。SQLiteが空の場合（初回）はシートの製品を
+    取り込んでから使う。PRODUCT_STORE=sheets なら Google Sheets のみ。
+    SHEETS_WRITE_BEHIND=true なら Google Sheets への書き込みはバッファで
+    まとめて行う。
 
-    if enable_sheets:
+    Args:
+        enable_sheets: Google Sheets連携を有効にするか
+
+    Returns:
+        製品リポジトリ（保存先がなければ None）
+    """
+    sqlite_store = settings.product_store == "sqlite"
+
+    sheets = None
+    # SQLite保存時は、スプレッドシートが設定されている場合だけエクスポートする
+    if enable_sheets and (settings.spreadsheet_id or not sqlite_store):
         try:
-            repository = GSheetsProductRepository()
+            sheets = GSheetsProductRepository()
             logger.info("Google Sheets リポジトリを初期化しました")
         except Exception as e:
             logger.warning(f"Google Sheets初期化エラー: {e}")
             logger.info("Google Sheets連携は無効です")
 
-    return DirectorAgent(repository=repository)
+    repository = None
+    if sqlite_store:
+        repository = SQLiteProductRepository()
+        logger.info(f"SQLite リポジトリを初期化しました: {repository.path}")
+        if sheets is not None:
+            seed_from_sheets(repository, sheets)
+
+    if sheets is not None and settings.sheets_write_behind:
+        sheets = WriteBehindRepository(sheets)
+
+    if not sqlite_store:
+        return sheets
+    if sheets is None:
+        return repository
+    return ExportingProductRepository(repository, sinks=[sheets])
+
+
+def seed_from_sheets(
+    repository: SQLiteProductRepository, sheets: GSheetsProductRepository
+) -> int:
+    """
+    SQLiteが空なら Google Sheets の製品を取り込む
+
+    PRODUCT_STORE=sheets から移行した直後も、検索・重複チェックが
+    これまでシートに保存した製品を対象にできるようにする。
+
+    Args:
+        repository: 取り込み先のSQLiteリポジトリ
+        sheets: 取り込み元のGoogle Sheetsリポジトリ
+
+    Returns:
+        取り込んだ製品数
+    """
+    if repository.count():
+        return 0
+
+    products = sheets.get_all()
+    if products:
+        repository.save_batch(products)
+        logger.info(f"Google Sheets の製品をSQLiteに取り込みました: {len(products)}件")
+    return len(products)
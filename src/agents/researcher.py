@@ -6,12 +6,20 @@ Serper（検索）とFirecrawl（閲覧）を組み合わせて
 欲求に関連する製品情報を収集。
 """
 
+import asyncio
+import contextvars
 import logging
-from dataclasses import dataclass
-from typing import Optional
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
 from src.core.config import settings
+from src.domain.content_distiller import ContentDistiller
+from src.domain.hunt_budget import BudgetExceeded, check_budget, current_budget
 from src.domain.models import SearchResult, TranslatedQuery
+from src.domain.page_classifier import ProductPageClassifier, is_product_url
 from src.infrastructure.api_clients.serper_client import SerperClient
 from src.infrastructure.api_clients.firecrawl_client import FirecrawlClient
 
@@ -27,6 +35,7 @@ class ResearchResult:
     language: str
     query: str
     search_position: int
+    structured: dict = field(default_factory=dict)  # JSON-LD等から得た製品情報
 
 
 class ResearcherAgent:
@@ -43,10 +52,19 @@ class ResearcherAgent:
         self,
         search_client: Optional[SerperClient] = None,
         scraper_client: Optional[FirecrawlClient] = None,
+        distiller: Optional[ContentDistiller] = None,
+        classifier: Optional[ProductPageClassifier] = None,
     ):
         self.search_client = search_client or SerperClient()
         self.scraper_client = scraper_client or FirecrawlClient()
+        if distiller is None and settings.content_distillation_enabled:
+            distiller = ContentDistiller(max_chars=settings.distill_max_chars)
+        self.distiller = distiller
+        if classifier is None and settings.prefilter_enabled:
+            classifier = ProductPageClassifier(threshold=settings.prefilter_threshold)
+        self.classifier = classifier
         self.visited_urls: set[str] = set()  # 重複訪問防止
+        self._visited_lock = threading.Lock()
 
     def search_for_desire(
         self,
@@ -138,14 +156,83 @@ class ResearcherAgent:
             ResearchResult または None
         """
         # 重複訪問チェック
-        if url in self.visited_urls:
+        if not self._claim_url(url):
             logger.debug(f"既に訪問済み: {url}")
             return None
 
-        self.visited_urls.add(url)
+        return self._fetch_research(url, language, query)
+
+    def _claim_url(self, url: str) -> bool:
+        """
+        URLを訪問済みとして登録
+
+        複数スレッドから呼ばれても同じURLを二重に取得しないよう、
+        チェックと登録をロック内で行う。
+
+        Args:
+            url: 登録するURL
+
+        Returns:
+            新規に登録できた場合True（訪問済みならFalse）
+        """
+        with self._visited_lock:
+            if url in self.visited_urls:
+                return False
+            self.visited_urls.add(url)
+            return True
+
+    def _prefilter(self, search_results: list[SearchResult]) -> list[SearchResult]:
+        """
+        製品ページではなさそうな検索結果をスクレイピング前に除外
+
+        Args:
+            search_results: 検索結果のリスト
+
+        Returns:
+            スクレイピング対象の検索結果（事前判定が無効なら元のまま）
+        """
+        if self.classifier is None:
+            return search_results
+
+        filtered = self.classifier.filter(search_results)
+        skipped = len(search_results) - len(filtered)
+        if skipped:
+            logger.info(f"事前判定で除外: {skipped}/{len(search_results)}件")
+        return filtered
+
+    def _distill(self, content: str) -> str:
+        """
+        製品情報が密集した部分を抜き出す（蒸留が無効なら元のまま）
+
+        Args:
+            content: スクレイピングしたコンテンツ
+
+        Returns:
+            LLMに渡すコンテンツ
+        """
+        if self.distiller is None:
+            return content
+        return self.distiller.distill(content)
+
+    def _fetch_research(
+        self, url: str, language: str, query: str
+    ) -> Optional[ResearchResult]:
+        """
+        URLをスクレイピングしてResearchResultを生成（訪問済みチェックなし）
+
+        Args:
+            url: リサーチ対象URL
+            language: 言語コード
+            query: 使用した検索クエリ
+
+        Returns:
+            ResearchResult または None
+        """
+        check_budget()  # 締め切り後は新たに取得しない
 
         try:
-            content = self.scraper_client.scrape_with_fallback(url)
+            page = self.scraper_client.scrape_page_with_fallback(url)
+            content = page.content
 
             if not content or len(content) < 100:
                 logger.warning(f"コンテンツが不十分: {url}")
@@ -153,12 +240,74 @@ class ResearcherAgent:
 
             return ResearchResult(
                 url=url,
-                content=content,
+                content=self._distill(content),
                 language=language,
                 query=query,
                 search_position=0,
+                structured=page.structured,
             )
 
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"リサーチエラー: {url} - {e}")
+            return None
+
+    async def research_url_async(
+        self, url: str, language: str = "en", query: str = ""
+    ) -> Optional[ResearchResult]:
+        """
+        単一URLをリサーチ（非同期版）
+
+        Args:
+            url: リサーチ対象URL
+            language: 言語コード
+            query: 使用した検索クエリ
+
+        Returns:
+            ResearchResult または None
+        """
+        if not self._claim_url(url):
+            logger.debug(f"既に訪問済み: {url}")
+            return None
+
+        return await self._fetch_research_async(url, language, query)
+
+    async def _fetch_research_async(
+        self, url: str, language: str, query: str
+    ) -> Optional[ResearchResult]:
+        """
+        URLをスクレイピングしてResearchResultを生成（非同期版、訪問済みチェックなし）
+
+        Args:
+            url: リサーチ対象URL
+            language: 言語コード
+            query: 使用した検索クエリ
+
+        Returns:
+            ResearchResult または None
+        """
+        check_budget()  # 締め切り後は新たに取得しない
+
+        try:
+            page = await self.scraper_client.scrape_page_with_fallback_async(url)
+            content = page.content
+
+            if not content or len(content) < 100:
+                logger.warning(f"コンテンツが不十分: {url}")
+                return None
+
+            return ResearchResult(
+                url=url,
+                content=self._distill(content),
+                language=language,
+                query=query,
+                search_position=0,
+                structured=page.structured,
+            )
+
+        except BudgetExceeded:
+            raise
         except Exception as e:
             logger.error(f"リサーチエラー: {url} - {e}")
             return None
@@ -181,15 +330,19 @@ class ResearcherAgent:
         research_results = []
         count = 0
 
-        for result in search_results:
+        for result in self._prefilter(search_results):
             if count >= max_results:
                 break
 
-            research = self.research_url(
-                url=result.url,
-                language=getattr(result, "language", "en"),
-                query=result.snippet,
-            )
+            try:
+                research = self.research_url(
+                    url=result.url,
+                    language=getattr(result, "language", "en"),
+                    query=result.snippet,
+                )
+            except BudgetExceeded as e:
+                logger.warning(f"予算超過のためリサーチを打ち切り: {e}")
+                break
 
             if research:
                 research.search_position = result.position
@@ -257,25 +410,7 @@ class ResearcherAgent:
         Returns:
             製品ページのURL
         """
-        product_keywords = [
-            "product",
-            "item",
-            "goods",
-            "shop",
-            "buy",
-            "detail",
-            "p/",
-            "pd/",
-            "/dp/",
-        ]
-
-        product_urls = []
-        for url in urls:
-            url_lower = url.lower()
-            if any(kw in url_lower for kw in product_keywords):
-                product_urls.append(url)
-
-        return product_urls
+        return [url for url in urls if is_product_url(url)]
 
     def execute_research(
         self,
@@ -302,6 +437,7 @@ class ResearcherAgent:
                 search_results = self.search_client.search_in_language(
                     query.query, query.language, results_per_query
                 )
+                search_results = self._prefilter(search_results)
 
                 # 検索結果をリサーチ
                 for result in search_results:
@@ -321,6 +457,9 @@ class ResearcherAgent:
                 if len(all_research) >= max_total_results:
                     break
 
+            except BudgetExceeded as e:
+                logger.warning(f"予算超過のためリサーチを打ち切り: {e}")
+                break
             except Exception as e:
                 logger.error(f"クエリ実行エラー ({query.language}): {e}")
                 continue
@@ -328,7 +467,253 @@ class ResearcherAgent:
         logger.info(f"リサーチ実行完了: {len(all_research)}件")
         return all_research
 
+    def iter_research_pipeline(
+        self,
+        translated_queries: list[TranslatedQuery],
+        results_per_query: int = 5,
+        max_total_results: int = 20,
+        search_workers: Optional[int] = None,
+        scrape_workers: Optional[int] = None,
+    ) -> Iterator[ResearchResult]:
+        """
+        検索と閲覧を並行実行し、完了したリサーチ結果から順に返す
+
+        検索ステージとスクレイピングステージをそれぞれのスレッドプールで
+        実行する。検索が1件完了するとすぐにそのURLのスクレイピングを開始し、
+        スクレイピングが完了した結果から順次yieldする。
+        呼び出し側は最初の結果を受け取った時点で後段（抽出）を開始できる。
+
+        実行中のスクレイピング数は「残り必要件数」を超えないよう制限するため、
+        max_total_results を超えて余分なスクレイピングを行うことはない。
+        ハントの予算を超過するか締め切りに達した時点で、未完了の処理を
+        取り消して終了する。
+
+        Args:
+            translated_queries: 翻訳されたクエリのリスト
+            results_per_query: 各クエリでの検索結果数
+            max_total_results: 最大リサーチ件数
+            search_workers: 検索ステージの並列数
+            scrape_workers: スクレイピングステージの並列数
+
+        Yields:
+            ResearchResult（完了順）
+        """
+        search_workers = max(1, search_workers or settings.search_workers)
+        scrape_workers = max(1, scrape_workers or settings.scrape_workers)
+
+        search_pool = ThreadPoolExecutor(
+            max_workers=search_workers, thread_name_prefix="research-search"
+        )
+        scrape_pool = ThreadPoolExecutor(
+            max_workers=scrape_workers, thread_name_prefix="research-scrape"
+        )
+
+        budget = current_budget()
+
+        # ハントの予算をワーカースレッドに引き継ぐ
+        search_futures: dict[Future, TranslatedQuery] = {
+            search_pool.submit(
+                contextvars.copy_context().run,
+                self.search_client.search_in_language,
+                query.query,
+                query.language,
+                results_per_query,
+            ): query
+            for query in translated_queries
+        }
+        scrape_futures: dict[Future, SearchResult] = {}
+        candidates: deque[tuple[SearchResult, TranslatedQuery]] = deque()
+        produced = 0
+        exhausted = False
+
+        try:
+            while produced < max_total_results and not exhausted:
+                # 空きスロット分だけスクレイピングを投入
+                while (
+                    candidates
+                    and len(scrape_futures) < scrape_workers
+                    and produced + len(scrape_futures) < max_total_results
+                ):
+                    search_result, query = candidates.popleft()
+                    if not self._claim_url(search_result.url):
+                        logger.debug(f"既に訪問済み: {search_result.url}")
+                        continue
+
+                    future = scrape_pool.submit(
+                        contextvars.copy_context().run,
+                        self._fetch_research,
+                        search_result.url,
+                        query.language,
+                        query.query,
+                    )
+                    scrape_futures[future] = search_result
+
+                if not search_futures and not scrape_futures:
+                    break
+
+                done, _ = wait(
+                    [*search_futures, *scrape_futures],
+                    timeout=budget.remaining_seconds if budget else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    budget.mark_exceeded(budget.deadline_reason() or "締め切りに到達")
+                    logger.warning("締め切りに達したためリサーチを打ち切り")
+                    break
+
+                for future in done:
+                    if future in search_futures:
+                        query = search_futures.pop(future)
+                        try:
+                            search_results = future.result()
+                        except BudgetExceeded as e:
+                            logger.warning(f"予算超過のため検索を中止 ({query.language}): {e}")
+                            continue
+                        except Exception as e:
+                            logger.error(f"クエリ実行エラー ({query.language}): {e}")
+                            continue
+                        candidates.extend(
+                            (r, query) for r in self._prefilter(search_results)
+                        )
+                        continue
+
+                    search_result = scrape_futures.pop(future)
+                    try:
+                        research = future.result()
+                    except BudgetExceeded as e:
+                        logger.warning(f"予算超過のためリサーチを打ち切り: {e}")
+                        exhausted = True
+                        continue
+                    if research and produced < max_total_results:
+                        research.search_position = search_result.position
+                        produced += 1
+                        yield research
+
+        finally:
+            for future in [*search_futures, *scrape_futures]:
+                future.cancel()
+            search_pool.shutdown(wait=False, cancel_futures=True)
+            scrape_pool.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(f"パイプラインリサーチ完了: {produced}件")
+
+    async def execute_research_async(
+        self,
+        translated_queries: list[TranslatedQuery],
+        results_per_query: int = 5,
+        max_total_results: int = 20,
+        concurrency: Optional[int] = None,
+    ) -> list[ResearchResult]:
+        """
+        翻訳されたクエリでリサーチを実行（非同期版）
+
+        全クエリの検索を並行して発行し、検索が完了したものから
+        スクレイピングを開始する。同時スクレイピング数は concurrency と
+        残り必要件数の小さい方に制限される。ハントの締め切りに達したら
+        実行中の検索・スクレイピングを取り消し、それまでの結果を返す。
+
+        Args:
+            translated_queries: 翻訳されたクエリのリスト
+            results_per_query: 各クエリでの検索結果数
+            max_total_results: 最大リサーチ件数
+            concurrency: 同時スクレイピング数
+
+        Returns:
+            ResearchResult のリスト（完了順）
+        """
+        concurrency = max(1, concurrency or settings.async_concurrency)
+
+        search_tasks: dict[asyncio.Task, TranslatedQuery] = {
+            asyncio.create_task(
+                self.search_client.search_in_language_async(
+                    query.query, query.language, results_per_query
+                )
+            ): query
+            for query in translated_queries
+        }
+        scrape_tasks: dict[asyncio.Task, SearchResult] = {}
+        candidates: deque[tuple[SearchResult, TranslatedQuery]] = deque()
+        all_research: list[ResearchResult] = []
+        budget = current_budget()
+        exhausted = False
+
+        try:
+            while len(all_research) < max_total_results and not exhausted:
+                while (
+                    candidates
+                    and len(scrape_tasks) < concurrency
+                    and len(all_research) + len(scrape_tasks) < max_total_results
+                ):
+                    search_result, query = candidates.popleft()
+                    if not self._claim_url(search_result.url):
+                        logger.debug(f"既に訪問済み: {search_result.url}")
+                        continue
+
+                    task = asyncio.create_task(
+                        self._fetch_research_async(
+                            search_result.url, query.language, query.query
+                        )
+                    )
+                    scrape_tasks[task] = search_result
+
+                if not search_tasks and not scrape_tasks:
+                    break
+
+                done, _ = await asyncio.wait(
+                    [*search_tasks, *scrape_tasks],
+                    timeout=budget.remaining_seconds if budget else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    budget.mark_exceeded(budget.deadline_reason() or "締め切りに到達")
+                    logger.warning("締め切りに達したためリサーチを打ち切り")
+                    break
+
+                for task in done:
+                    if task in search_tasks:
+                        query = search_tasks.pop(task)
+                        try:
+                            search_results = task.result()
+                        except BudgetExceeded as e:
+                            logger.warning(f"予算超過のため検索を中止 ({query.language}): {e}")
+                            continue
+                        except Exception as e:
+                            logger.error(f"クエリ実行エラー ({query.language}): {e}")
+                            continue
+                        candidates.extend(
+                            (r, query) for r in self._prefilter(search_results)
+                        )
+                        continue
+
+                    search_result = scrape_tasks.pop(task)
+                    try:
+                        research = task.result()
+                    except BudgetExceeded as e:
+                        logger.warning(f"予算超過のためリサーチを打ち切り: {e}")
+                        exhausted = True
+                        continue
+                    if research and len(all_research) < max_total_results:
+                        research.search_position = search_result.position
+                        all_research.append(research)
+
+        finally:
+            for task in [*search_tasks, *scrape_tasks]:
+                task.cancel()
+
+        logger.info(f"リサーチ実行完了: {len(all_research)}件")
+        return all_research
+
+    def get_prefilter_statistics(self) -> dict:
+        """
+        事前判定の統計を取得
+
+        Returns:
+            統計情報の辞書（事前判定無効時は空）
+        """
+        return self.classifier.get_statistics() if self.classifier else {}
+
     def reset_visited(self) -> None:
         """訪問済みURLをリセット"""
-        self.visited_urls.clear()
+        with self._visited_lock:
+            self.visited_urls.clear()
         logger.debug("訪問済みURLをリセットしました")
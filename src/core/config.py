@@ -28,10 +28,91 @@ class Settings(BaseSettings):
     )
     spreadsheet_id: str = Field(default="", alias="SPREADSHEET_ID")
     worksheet_name: str = Field(default="Products", alias="WORKSHEET_NAME")
+    # 検索用スナップショットの変更確認間隔（秒）。0なら検索のたびに確認
+    sheets_snapshot_ttl: int = Field(default=300, alias="SHEETS_SNAPSHOT_TTL")
+    # 更新日時（Drive API）が変わっていなければシートを読み込み直さない
+    sheets_change_detection: bool = Field(
+        default=True, alias="SHEETS_CHANGE_DETECTION"
+    )
+    # 同じ製品（正規化URL、なければブランド＋製品名）の行は追記せず上書き
+    sheets_upsert: bool = Field(default=True, alias="SHEETS_UPSERT")
+    # 書き込みバッファ（複数のハントの行をまとめて append_rows する）
+    sheets_write_behind: bool = Field(default=True, alias="SHEETS_WRITE_BEHIND")
+    sheets_flush_size: int = Field(default=500, alias="SHEETS_FLUSH_SIZE")  # 行
+    sheets_flush_interval: float = Field(
+        default=30.0, alias="SHEETS_FLUSH_INTERVAL"
+    )  # 秒
+    sheets_buffer_max: int = Field(default=5000, alias="SHEETS_BUFFER_MAX")  # 行
+    sheets_flush_retries: int = Field(default=5, alias="SHEETS_FLUSH_RETRIES")
+
+    # 製品の保存先（sqlite: ローカルDBに保存しSheetsへはエクスポート / sheets: Sheetsのみ）
+    product_store: str = Field(default="sqlite", alias="PRODUCT_STORE")
+    product_db_path: str = Field(
+        default="data/products.sqlite3", alias="PRODUCT_DB_PATH"
+    )
 
     # レート制限設定
     serper_rate_limit: int = Field(default=10, alias="SERPER_RATE_LIMIT")  # 10回/分
+    serper_burst: int = Field(default=5, alias="SERPER_BURST")
     firecrawl_rate_limit: int = Field(default=5, alias="FIRECRAWL_RATE_LIMIT")  # 5回/分
+    firecrawl_burst: int = Field(default=2, alias="FIRECRAWL_BURST")
+    firecrawl_map_rate_limit: int = Field(
+        default=3, alias="FIRECRAWL_MAP_RATE_LIMIT"
+    )  # 3回/分（mapは重い）
+    # memory: プロセス内で共有 / sqlite: 同一ホストの全プロセスで共有
+    rate_limit_backend: str = Field(default="memory", alias="RATE_LIMIT_BACKEND")
+    rate_limit_db: str = Field(default="", alias="RATE_LIMIT_DB")  # 空ならCACHE_DIR配下
+    # 429を受けたらレートを下げ、成功が続けば戻す（AIMD）
+    rate_limit_adaptive: bool = Field(default=True, alias="RATE_LIMIT_ADAPTIVE")
+    rate_limit_decrease_factor: float = Field(
+        default=0.5, alias="RATE_LIMIT_DECREASE_FACTOR"
+    )
+    rate_limit_increase_step: float = Field(
+        default=1.0, alias="RATE_LIMIT_INCREASE_STEP"
+    )  # 成功1回あたりの増加量（回/分）
+    rate_limit_max_factor: float = Field(
+        default=2.0, alias="RATE_LIMIT_MAX_FACTOR"
+    )  # 設定レートの何倍まで引き上げを試すか（429を受けるまで上限を探る）
+
+    # 検索結果の事前判定（製品ページではなさそうなURLをスクレイピング前に除外）
+    prefilter_enabled: bool = Field(default=True, alias="PREFILTER_ENABLED")
+    prefilter_threshold: float = Field(
+        default=0.3, alias="PREFILTER_THRESHOLD"
+    )  # 0〜1、手がかりのないページは0.5付近
+
+    # 構造化データ（JSON-LD・microdata・OpenGraph）から製品情報を直接取得
+    structured_data_enabled: bool = Field(
+        default=True, alias="STRUCTURED_DATA_ENABLED"
+    )
+
+    # コンテンツ蒸留設定（製品情報の密集部分だけをLLMに送る）
+    content_distillation_enabled: bool = Field(
+        default=True, alias="CONTENT_DISTILLATION_ENABLED"
+    )
+    distill_max_chars: int = Field(
+        default=6000, alias="DISTILL_MAX_CHARS"
+    )  # 約2000トークン
+
+    # フォールバックスクレイピング設定
+    fallback_max_chars: int = Field(
+        default=8000, alias="FALLBACK_MAX_CHARS"
+    )  # 抽出の入力上限（8000文字）に合わせる
+    fallback_max_bytes: int = Field(
+        default=2 * 1024 * 1024, alias="FALLBACK_MAX_BYTES"
+    )  # 2MB
+
+    # HTTP接続プール設定
+    http_pool_connections: int = Field(
+        default=10, alias="HTTP_POOL_CONNECTIONS"
+    )  # 保持するホスト数
+    http_pool_maxsize: int = Field(
+        default=20, alias="HTTP_POOL_MAXSIZE"
+    )  # ホストあたりの接続数
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_keepalive_expiry: float = Field(
+        default=30.0, alias="HTTP_KEEPALIVE_EXPIRY"
+    )  # 秒
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
 
     # 探索設定
     max_products_per_desire: int = Field(default=20, alias="MAX_PRODUCTS_PER_DESIRE")
@@ -39,6 +120,64 @@ class Settings(BaseSettings):
         default=["en", "zh", "de", "ja", "fr"], alias="SEARCH_LANGUAGES"
     )
 
+    # パイプライン設定（検索・閲覧・抽出を並行実行）
+    pipeline_enabled: bool = Field(default=False, alias="PIPELINE_ENABLED")
+    search_workers: int = Field(default=3, alias="SEARCH_WORKERS")
+    scrape_workers: int = Field(default=4, alias="SCRAPE_WORKERS")
+    extract_workers: int = Field(default=4, alias="EXTRACT_WORKERS")
+
+    # 逐次ハント（上位K件がそろうか予算に達したら打ち切る）
+    incremental_hunt: bool = Field(default=False, alias="INCREMENTAL_HUNT")
+
+    # 1回のハントの予算（0で無制限）
+    hunt_time_budget: float = Field(
+        default=0, alias="HUNT_TIME_BUDGET"
+    )  # 締め切り（秒）
+    hunt_page_budget: int = Field(
+        default=0, alias="HUNT_PAGE_BUDGET"
+    )  # 逐次ハントでスクレイピング・抽出するページ数
+    hunt_max_llm_tokens: int = Field(default=0, alias="HUNT_MAX_LLM_TOKENS")
+    hunt_max_serper_calls: int = Field(default=0, alias="HUNT_MAX_SERPER_CALLS")
+    hunt_max_firecrawl_credits: int = Field(
+        default=0, alias="HUNT_MAX_FIRECRAWL_CREDITS"
+    )
+
+    # 複数ページ一括抽出（1より大きい値で有効化）
+    extraction_batch_size: int = Field(default=1, alias="EXTRACTION_BATCH_SIZE")
+    extraction_batch_token_budget: int = Field(
+        default=20000, alias="EXTRACTION_BATCH_TOKEN_BUDGET"
+    )
+
+    # 二段階抽出（欲求非依存の製品情報抽出 + 軽量な適合度評価）
+    two_phase_extraction: bool = Field(default=False, alias="TWO_PHASE_EXTRACTION")
+    scoring_batch_size: int = Field(default=20, alias="SCORING_BATCH_SIZE")
+
+    # バッチ処理で同時に処理する欲求の数
+    batch_concurrency: int = Field(default=1, alias="BATCH_CONCURRENCY")
+
+    # バッチジャーナル（--batch の進捗と途中成果物を記録し、--resume で再開）
+    batch_journal_enabled: bool = Field(default=True, alias="BATCH_JOURNAL_ENABLED")
+    # 空ならCACHE_DIR配下
+    batch_journal_path: str = Field(default="", alias="BATCH_JOURNAL_PATH")
+
+    # 非同期実行時の同時リクエスト数（ステージごと）
+    async_concurrency: int = Field(default=20, alias="ASYNC_CONCURRENCY")
+
+    # キャッシュ設定
+    cache_dir: str = Field(default=".cache", alias="CACHE_DIR")
+    scrape_cache_enabled: bool = Field(default=True, alias="SCRAPE_CACHE_ENABLED")
+    scrape_cache_ttl: int = Field(default=86400, alias="SCRAPE_CACHE_TTL")  # 秒
+    scrape_cache_domain_ttls: dict[str, int] = Field(
+        default={}, alias="SCRAPE_CACHE_DOMAIN_TTLS"
+    )
+    scrape_cache_max_mb: int = Field(default=500, alias="SCRAPE_CACHE_MAX_MB")
+    search_cache_enabled: bool = Field(default=True, alias="SEARCH_CACHE_ENABLED")
+    search_cache_ttl: int = Field(default=21600, alias="SEARCH_CACHE_TTL")  # 秒
+    search_cache_max_mb: int = Field(default=50, alias="SEARCH_CACHE_MAX_MB")
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl: int = Field(default=604800, alias="LLM_CACHE_TTL")  # 秒
+    llm_cache_max_mb: int = Field(default=200, alias="LLM_CACHE_MAX_MB")
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
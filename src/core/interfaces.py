@@ -7,6 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -106,6 +107,23 @@ class ProductRepository(ABC):
         """複数の製品を一括保存"""
         pass
 
+    def save_batch_deferred(self, products: list["Product"]) -> "Future[None]":
+        """
+        複数の製品を一括保存し、書き込みの完了を Future で通知する
+
+        書き込みを遅延させる実装は、実際に書き込んだ時点で Future を完了させ、
+        書き込めなかった場合は例外を設定する。既定は save_batch を呼び、
+        完了済みの Future を返す（保存に失敗したらそのまま例外を送出する）。
+        """
+        self.save_batch(products)
+        future: Future = Future()
+        future.set_result(None)
+        return future
+
+    def flush(self) -> None:
+        """書き込み待ちの製品があれば書き込む（既定は何もしない）"""
+        pass
+
     @abstractmethod
     def find_by_url(self, url: str) -> "Product | None":
         """URLで製品を検索"""
@@ -0,0 +1,215 @@
+"""
+コンテンツ蒸留
+
+スクレイピングしたMarkdown/テキストから製品情報が密集している部分
+（価格表記、カート・購入ボタン付近、見出し、仕様）を選び出し、
+ナビゲーションやCookieバナー等の定型部分を除いた抜粋を作る。
+LLMに送る文字数を減らしつつ、製品ブロックが切り捨てられるのを防ぐ。
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# 価格表記（通貨記号・通貨コード＋数値、数値＋円/元 等）
+PRICE_PATTERN = re.compile(
+    r"(?:[$€£¥￥₩]|US\$|USD|JPY|EUR|GBP|CNY|RMB|KRW)\s?\d[\d,.]*"
+    r"|\d[\d,.]*\s?(?:円|元|원|€|USD|JPY|EUR)"
+    r"|税込|税抜|送料無料",
+    re.IGNORECASE,
+)
+
+# カート・購入ボタン周辺の文言
+CART_PATTERN = re.compile(
+    r"add to (?:cart|bag|basket)|buy now|in stock|out of stock"
+    r"|カートに入れる|カートへ|購入する|今すぐ購入|在庫あり|在庫なし"
+    r"|加入购物车|立即购买|in den warenkorb|jetzt kaufen"
+    r"|ajouter au panier|añadir al carrito|장바구니|구매하기",
+    re.IGNORECASE,
+)
+
+# 仕様・特徴の見出しや項目
+SPEC_PATTERN = re.compile(
+    r"specification|features|dimensions|weight|material|warranty|model"
+    r"|仕様|スペック|特徴|サイズ|重量|素材|材質|型番|保証"
+    r"|规格|参数|technische daten|caractéristiques|특징",
+    re.IGNORECASE,
+)
+
+# 定型部分（Cookie同意、ログイン、ニュースレター、著作権表示など）
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|privacy policy|terms of (?:use|service)|newsletter|subscribe"
+    r"|sign in|log ?in|create an account|all rights reserved|©|copyright"
+    r"|ログイン|会員登録|プライバシー|利用規約|メールマガジン|クッキー",
+    re.IGNORECASE,
+)
+
+MARKDOWN_LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s")
+
+# 高スコアブロックの前後何ブロックまでを文脈として加点するか
+NEIGHBOR_DISTANCE = 2
+
+
+@dataclass
+class _Block:
+    """本文の段落ブロック"""
+
+    index: int
+    text: str
+    score: float = 0.0
+
+
+def _split_blocks(content: str) -> list[_Block]:
+    """空行と見出しで段落ブロックに分割"""
+    blocks: list[_Block] = []
+    current: list[str] = []
+
+    def flush():
+        text = "\n".join(current).strip()
+        current.clear()
+        if text:
+            blocks.append(_Block(index=len(blocks), text=text))
+
+    for line in content.splitlines():
+        if not line.strip():
+            flush()
+            continue
+        if HEADING_PATTERN.match(line):
+            flush()
+        current.append(line)
+    flush()
+
+    return blocks
+
+
+def _link_density(text: str) -> float:
+    """リンク（Markdown記法）が占める文字数の割合"""
+    link_chars = sum(len(m.group(0)) for m in MARKDOWN_LINK_PATTERN.finditer(text))
+    return link_chars / max(len(text), 1)
+
+
+def _score_block(block: _Block) -> float:
+    """ブロックの製品情報らしさをスコア化"""
+    text = block.text
+    score = 0.0
+
+    score += min(len(PRICE_PATTERN.findall(text)), 3) * 3
+    score += min(len(CART_PATTERN.findall(text)), 2) * 4
+    score += min(len(SPEC_PATTERN.findall(text)), 3)
+
+    heading = HEADING_PATTERN.match(text)
+    if heading:
+        score += 3 if len(heading.group(1)) == 1 else 1
+
+    if _link_density(text) > 0.5:
+        score -= 4  # リンク一覧（ナビゲーション・カテゴリメニュー）
+    if BOILERPLATE_PATTERN.search(text):
+        score -= 3
+
+    return score
+
+
+class ContentDistiller:
+    """
+    製品情報が密集した部分を抜き出して上限文字数に収める
+
+    スコアの高いブロックとその前後（製品名の見出し等）を優先し、
+    残りの枠を手がかりのないブロックで埋めて、元の順序のまま連結する。
+    リンク一覧やCookieバナー等の定型部分は含めない。
+    """
+
+    def __init__(self, max_chars: int = 6000):
+        self.max_chars = max_chars
+
+        self._lock = threading.Lock()
+        self.page_count = 0
+        self.input_chars = 0
+        self.output_chars = 0
+
+    def distill(self, content: str) -> str:
+        """
+        コンテンツを蒸留
+
+        Args:
+            content: スクレイピングしたMarkdown/テキスト
+
+        Returns:
+            上限文字数以内の抜粋
+        """
+        blocks = _split_blocks(content)
+        for block in blocks:
+            block.score = _score_block(block)
+
+        # 製品ブロックの前後（製品名・説明）も文脈として残す
+        base_scores = [block.score for block in blocks]
+        for i, score in enumerate(base_scores):
+            if score <= 0:
+                continue
+            low = max(0, i - NEIGHBOR_DISTANCE)
+            high = min(len(blocks), i + NEIGHBOR_DISTANCE + 1)
+            for j in range(low, high):
+                if j != i and blocks[j].score > -1:
+                    blocks[j].score += score * 0.3
+
+        # 製品らしいブロックを優先し、余った枠は定型部分以外で先頭から埋める
+        candidates = sorted(
+            (b for b in blocks if b.score > 0),
+            key=lambda b: (-b.score, b.index),
+        )
+        candidates += [b for b in blocks if b.score == 0]
+
+        selected = self._fit_budget(candidates)
+        distilled = "\n\n".join(b.text for b in sorted(selected, key=lambda b: b.index))
+
+        if not distilled:
+            distilled = content[: self.max_chars]
+
+        with self._lock:
+            self.page_count += 1
+            self.input_chars += len(content)
+            self.output_chars += len(distilled)
+
+        logger.debug(f"コンテンツ蒸留: {len(content)}文字 -> {len(distilled)}文字")
+        return distilled
+
+    def _fit_budget(self, candidates: list[_Block]) -> list[_Block]:
+        """優先順に上限文字数まで詰める（長すぎるブロックは切り詰め）"""
+        selected: list[_Block] = []
+        used = 0
+
+        for block in candidates:
+            remaining = self.max_chars - used
+            if remaining <= 0:
+                break
+            cost = len(block.text) + 2  # 区切りの空行
+            if cost > remaining:
+                if remaining < 200:
+                    continue  # 小さい隙間は後続の短いブロックに譲る
+                block = _Block(block.index, block.text[: remaining - 2], block.score)
+                cost = remaining
+            selected.append(block)
+            used += cost
+
+        return selected
+
+    def get_statistics(self) -> dict:
+        """
+        蒸留の統計を取得
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            reduction = (
+                1 - self.output_chars / self.input_chars if self.input_chars else 0.0
+            )
+            return {
+                "pages": self.page_count,
+                "input_chars": self.input_chars,
+                "output_chars": self.output_chars,
+                "reduction_rate": f"{reduction * 100:.1f}%",
+            }
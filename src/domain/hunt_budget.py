@@ -0,0 +1,324 @@
+"""
+ハントの予算管理
+
+1回のハントで使える時間（締め切り）・ページ数・LLMトークン数・
+Serper呼び出し回数・Firecrawlクレジットの上限を管理する。
+
+予算はコンテキスト変数で実行中のハントに紐づけるため、
+複数のハントが同じクライアントを共有していても互いに干渉しない。
+各クライアントは API を呼ぶ前に check_budget()（レート制限がある場合は
+acquire_within_budget()）で残りを確認し、呼んだ後に charge_budget() で
+消費量を記録する。
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Protocol
+
+# 予算の対象（charge_budget / check_budget の resource に指定する）
+LLM_TOKENS = "llm_tokens"
+SERPER_CALLS = "serper_calls"
+FIRECRAWL_CREDITS = "firecrawl_credits"
+
+RESOURCE_LABELS = {
+    LLM_TOKENS: "LLMトークン",
+    SERPER_CALLS: "Serper呼び出し",
+    FIRECRAWL_CREDITS: "Firecrawlクレジット",
+}
+
+# timeout_within_budget が返すタイムアウトの下限（秒）
+MIN_TIMEOUT_SECONDS = 0.1
+
+
+class BudgetExceeded(Exception):
+    """ハントの予算を使い切った"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class HuntBudget:
+    """
+    1回のハントの時間・コスト予算
+
+    上限に None または0以下を指定した項目は無制限として扱う。
+    """
+
+    def __init__(
+        self,
+        max_seconds: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        max_llm_tokens: Optional[int] = None,
+        max_serper_calls: Optional[int] = None,
+        max_firecrawl_credits: Optional[int] = None,
+    ):
+        self.max_seconds = max_seconds if max_seconds and max_seconds > 0 else None
+        self.max_pages = max_pages if max_pages and max_pages > 0 else None
+        self.limits = {
+            resource: limit
+            for resource, limit in (
+                (LLM_TOKENS, max_llm_tokens),
+                (SERPER_CALLS, max_serper_calls),
+                (FIRECRAWL_CREDITS, max_firecrawl_credits),
+            )
+            if limit and limit > 0
+        }
+
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.page_count = 0
+        self.usage = {resource: 0 for resource in RESOURCE_LABELS}
+        self.exceeded_reason: Optional[str] = None  # 最初に超過した理由
+
+    @property
+    def elapsed(self) -> float:
+        """開始からの経過秒数"""
+        return time.monotonic() - self.started_at
+
+    @property
+    def remaining_seconds(self) -> Optional[float]:
+        """締め切りまでの残り秒数（締め切りなしなら None）"""
+        if self.max_seconds is None:
+            return None
+        return max(0.0, self.max_seconds - self.elapsed)
+
+    @property
+    def exceeded(self) -> bool:
+        """いずれかの予算を超過してAPI呼び出しを止めたか"""
+        return self.exceeded_reason is not None
+
+    def record_page(self) -> None:
+        """スクレイピング・抽出を行ったページを1件記録"""
+        with self._lock:
+            self.page_count += 1
+
+    def charge(self, resource: str, amount: int = 1) -> None:
+        """
+        消費量を記録
+
+        Args:
+            resource: 予算の対象（LLM_TOKENS 等）
+            amount: 消費量
+        """
+        with self._lock:
+            self.usage[resource] = self.usage.get(resource, 0) + amount
+
+    def deadline_reason(self) -> Optional[str]:
+        """締め切りを過ぎていればその理由、過ぎていなければ None"""
+        if self.max_seconds is not None and self.elapsed >= self.max_seconds:
+            return f"時間予算 {self.max_seconds:g}秒 に到達"
+        return None
+
+    def exhausted(self, resource: Optional[str] = None) -> Optional[str]:
+        """
+        予算を使い切ったか判定
+
+        Args:
+            resource: 確認する対象（None なら全対象とページ数）
+
+        Returns:
+            使い切った場合はその理由、残っていれば None
+        """
+        reason = self.deadline_reason()
+        if reason:
+            return reason
+
+        with self._lock:
+            if resource is None and self.max_pages is not None:
+                if self.page_count >= self.max_pages:
+                    return f"ページ予算 {self.max_pages}件 に到達"
+
+            resources = [resource] if resource else list(self.limits)
+            for name in resources:
+                limit = self.limits.get(name)
+                if limit is not None and self.usage.get(name, 0) >= limit:
+                    return f"{RESOURCE_LABELS.get(name, name)}の予算 {limit} に到達"
+        return None
+
+    def mark_exceeded(self, reason: str) -> None:
+        """予算超過で処理を打ち切ったことを記録（最初の理由を残す）"""
+        with self._lock:
+            if self.exceeded_reason is None:
+                self.exceeded_reason = reason
+
+    def check(self, resource: Optional[str] = None) -> None:
+        """
+        API呼び出しの前に予算を確認
+
+        Args:
+            resource: これから消費する対象（None なら締め切りのみ確認）
+
+        Raises:
+            BudgetExceeded: 締め切りを過ぎたか、対象の予算を使い切った場合
+        """
+        reason = self.exhausted(resource) if resource else self.deadline_reason()
+        if reason is None:
+            return
+        self.mark_exceeded(reason)
+        raise BudgetExceeded(reason)
+
+    def get_usage(self) -> dict:
+        """
+        予算の消費状況を取得
+
+        Returns:
+            消費量と上限の辞書
+        """
+        with self._lock:
+            usage = {
+                "elapsed_seconds": round(self.elapsed, 1),
+                "max_seconds": self.max_seconds,
+                "pages": self.page_count,
+                "max_pages": self.max_pages,
+            }
+            for resource in RESOURCE_LABELS:
+                usage[resource] = self.usage.get(resource, 0)
+                usage[f"max_{resource}"] = self.limits.get(resource)
+            return usage
+
+
+_current_budget: contextvars.ContextVar[Optional[HuntBudget]] = (
+    contextvars.ContextVar("hunt_budget", default=None)
+)
+
+
+def current_budget() -> Optional[HuntBudget]:
+    """実行中のハントの予算（なければ None）"""
+    return _current_budget.get()
+
+
+@contextmanager
+def use_budget(budget: Optional[HuntBudget]) -> Iterator[Optional[HuntBudget]]:
+    """
+    ブロック内の処理に予算を紐づける
+
+    asyncio のタスクには自動で引き継がれる。スレッドプールで実行する処理には
+    contextvars.copy_context().run を使って引き継ぐこと。
+
+    Args:
+        budget: 紐づける予算（None なら無制限）
+    """
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def check_budget(resource: Optional[str] = None) -> None:
+    """実行中のハントの予算を確認（予算がなければ何もしない）"""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.check(resource)
+
+
+def charge_budget(resource: str, amount: int = 1) -> None:
+    """実行中のハントの予算に消費量を記録（予算がなければ何もしない）"""
+    budget = _current_budget.get()
+    if budget is not None and amount:
+        budget.charge(resource, amount)
+
+
+class Limiter(Protocol):
+    """締め切りまで待機できるレートリミッタ（TokenBucket）"""
+
+    def acquire(self, tokens: int = 1, max_wait: Optional[float] = None) -> bool: ...
+
+    async def acquire_async(
+        self, tokens: int = 1, max_wait: Optional[float] = None
+    ) -> bool: ...
+
+
+def _limiter_timeout(budget: Optional[HuntBudget]) -> None:
+    """レート制限の待機が締め切りを超える場合の打ち切り"""
+    reason = f"時間予算 {budget.max_seconds:g}秒 に到達（レート制限待ち）"
+    budget.mark_exceeded(reason)
+    raise BudgetExceeded(reason)
+
+
+def acquire_within_budget(limiter: Limiter, resource: Optional[str] = None) -> None:
+    """
+    予算を確認してからレートリミッタのトークンを取得
+
+    締め切りを過ぎたハントがトークンを消費しないよう先に予算を確認し、
+    待機は締め切りまでに制限する。
+
+    Args:
+        limiter: レートリミッタ
+        resource: これから消費する対象（None なら締め切りのみ確認）
+
+    Raises:
+        BudgetExceeded: 予算を使い切っているか、締め切りまでにトークンが出ない場合
+    """
+    check_budget(resource)
+    budget = _current_budget.get()
+    if not limiter.acquire(max_wait=budget.remaining_seconds if budget else None):
+        _limiter_timeout(budget)
+
+
+async def acquire_within_budget_async(
+    limiter: Limiter, resource: Optional[str] = None
+) -> None:
+    """
+    予算を確認してからレートリミッタのトークンを取得（非同期版）
+
+    Args:
+        limiter: レートリミッタ
+        resource: これから消費する対象（None なら締め切りのみ確認）
+
+    Raises:
+        BudgetExceeded: 予算を使い切っているか、締め切りまでにトークンが出ない場合
+    """
+    check_budget(resource)
+    budget = _current_budget.get()
+    remaining = budget.remaining_seconds if budget else None
+    if not await limiter.acquire_async(max_wait=remaining):
+        _limiter_timeout(budget)
+
+
+def timeout_within_budget(timeout: float) -> float:
+    """
+    リクエストのタイムアウトを締め切りまでの残り時間で切り詰める
+
+    Args:
+        timeout: 通常のタイムアウト秒数
+
+    Returns:
+        締め切りを超えないタイムアウト秒数（締め切りがなければ timeout）
+
+    Raises:
+        BudgetExceeded: 締め切りを過ぎている場合
+    """
+    check_budget()
+    budget = _current_budget.get()
+    remaining = budget.remaining_seconds if budget else None
+    if remaining is None:
+        return timeout
+    # 0 は「タイムアウトなし」と解釈するライブラリがあるため下限を設ける
+    return max(MIN_TIMEOUT_SECONDS, min(timeout, remaining))
+
+
+def wait_within_budget(wait: Callable) -> Callable:
+    """
+    リトライ待機を締め切りまでに収める tenacity の wait
+
+    締め切りを過ぎて待機しないよう待機秒数を残り時間で切り詰める。
+    次の試行の check_budget() で BudgetExceeded になり、リトライが終わる。
+
+    Args:
+        wait: 元の待機戦略
+
+    Returns:
+        残り時間で上限を設けた待機戦略
+    """
+
+    def _wait(retry_state) -> float:
+        seconds = wait(retry_state)
+        budget = _current_budget.get()
+        remaining = budget.remaining_seconds if budget else None
+        return seconds if remaining is None else min(seconds, remaining)
+
+    return _wait
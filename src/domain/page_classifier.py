@@ -0,0 +1,316 @@
+"""
+製品ページの事前判定
+
+検索結果（URL・タイトル・スニペット）だけから製品ページらしさを推定し、
+まとめ記事・フォーラム・Wikipedia・ニュース等をスクレイピング前に除外する。
+除外したページ1件につき、Firecrawlのスクレイピング1回とLLM抽出1回を節約できる。
+
+特徴量はURLパターン、ドメインの傾向、タイトル・スニペットの手がかり、
+小さな単語重み（bag-of-words）で、重みの合計をロジスティック関数で
+0〜1のスコアに変換する。
+"""
+
+import logging
+import math
+import re
+import threading
+from urllib.parse import urlsplit
+
+from src.domain.content_distiller import CART_PATTERN, PRICE_PATTERN
+from src.domain.models import SearchResult
+
+logger = logging.getLogger(__name__)
+
+# 製品ページによく含まれるURLの断片
+PRODUCT_URL_KEYWORDS = [
+    "product",
+    "item",
+    "goods",
+    "shop",
+    "buy",
+    "detail",
+    "p/",
+    "pd/",
+    "/dp/",
+]
+
+# 製品ページではないことが多いURLの断片
+NON_PRODUCT_URL_PATTERN = re.compile(
+    r"/(?:blog|blogs|news|article|articles|magazine|column|columns|forum|forums"
+    r"|thread|threads|community|questions|answers|wiki|tag|tags|search|author"
+    r"|press|guide|guides|review|reviews|ranking|rankings|topics|comments)(?:/|$)"
+    r"|\.pdf$",
+    re.IGNORECASE,
+)
+
+# 製品を販売していることが多いドメイン（部分一致）
+SHOP_DOMAINS = (
+    "amazon.",
+    "rakuten.",
+    "ebay.",
+    "etsy.com",
+    "walmart.com",
+    "target.com",
+    "bestbuy.com",
+    "aliexpress.",
+    "taobao.com",
+    "tmall.com",
+    "jd.com",
+    "otto.de",
+    "zalando.",
+    "fnac.com",
+    "cdiscount.com",
+    "yodobashi.com",
+    "biccamera.com",
+    "shopping.yahoo.co.jp",
+    "coupang.com",
+    "gmarket.co.kr",
+    "myshopify.com",
+)
+
+# 製品ページがほぼないドメイン（部分一致）
+NON_PRODUCT_DOMAINS = (
+    "wikipedia.org",
+    "reddit.com",
+    "quora.com",
+    "zhihu.com",
+    "youtube.com",
+    "pinterest.",
+    "facebook.com",
+    "instagram.com",
+    "twitter.com",
+    "tiktok.com",
+    "medium.com",
+    "chiebukuro.yahoo.co.jp",
+    "note.com",
+    "baike.baidu.com",
+    "tieba.baidu.com",
+)
+
+# まとめ記事・比較記事のタイトル
+LISTICLE_PATTERN = re.compile(
+    r"\b(?:top|best)\s*\d+|\d+\s+best|\bvs\.?\b|\bhow to\b|\bwhat is\b"
+    r"|おすすめ|ランキング|人気\d+|選び方|比較|とは[？?]?"
+    r"|推荐|排行|排名|测评|怎么"
+    r"|die besten|\d+ meilleur|los mejores|추천|순위",
+    re.IGNORECASE,
+)
+
+# 単語ごとの重み（正: 製品ページ寄り / 負: それ以外）
+TOKEN_WEIGHTS = {
+    # 英語
+    "buy": 0.8,
+    "shop": 0.6,
+    "price": 0.6,
+    "sale": 0.4,
+    "order": 0.4,
+    "shipping": 0.6,
+    "stock": 0.6,
+    "official": 0.5,
+    "store": 0.5,
+    "review": -0.4,
+    "reviews": -0.4,
+    "guide": -0.8,
+    "tips": -0.8,
+    "news": -1.0,
+    "blog": -1.0,
+    "forum": -1.2,
+    "thread": -1.0,
+    "wiki": -1.2,
+    "wikipedia": -1.5,
+    "history": -0.8,
+    "definition": -1.2,
+    "meaning": -1.0,
+    "reddit": -1.5,
+    "question": -0.8,
+    # ドイツ語・フランス語・スペイン語
+    "kaufen": 0.8,
+    "preis": 0.6,
+    "versand": 0.5,
+    "acheter": 0.8,
+    "prix": 0.6,
+    "livraison": 0.5,
+    "comprar": 0.8,
+    "precio": 0.6,
+    "envío": 0.5,
+    # 日本語・中国語・韓国語（分かち書きしないため部分一致で数える）
+    "販売": 0.6,
+    "通販": 0.8,
+    "公式": 0.5,
+    "送料": 0.6,
+    "購入": 0.6,
+    "価格": 0.4,
+    "口コミ": -0.4,
+    "ブログ": -1.0,
+    "ニュース": -1.0,
+    "知恵袋": -1.5,
+    "まとめ": -0.8,
+    "购买": 0.8,
+    "旗舰店": 1.0,
+    "价格": 0.4,
+    "包邮": 0.8,
+    "新闻": -1.0,
+    "百科": -1.2,
+    "论坛": -1.2,
+    "구매": 0.8,
+    "가격": 0.4,
+    "뉴스": -1.0,
+    "블로그": -1.0,
+}
+
+# スペース区切りの単語（ラテン文字）
+_WORD_PATTERN = re.compile(r"[a-zà-ÿ]+")
+# 分かち書きしない言語の単語は部分一致で数える
+_SUBSTRING_TOKENS = [t for t in TOKEN_WEIGHTS if not _WORD_PATTERN.fullmatch(t)]
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def is_product_url(url: str) -> bool:
+    """
+    URLが製品ページらしいか（キーワードを含み、記事・フォーラム等のパスでない）
+
+    Args:
+        url: 判定するURL
+
+    Returns:
+        製品ページらしければ True
+    """
+    url_lower = url.lower()
+    if NON_PRODUCT_URL_PATTERN.search(urlsplit(url_lower).path):
+        return False
+    return any(kw in url_lower for kw in PRODUCT_URL_KEYWORDS)
+
+
+def _url_score(url: str) -> float:
+    """URLパターンとドメインの傾向による重み"""
+    score = 0.0
+    host = _host(url)
+    path = urlsplit(url.lower()).path
+
+    if any(domain in host for domain in SHOP_DOMAINS):
+        score += 2.0
+    if any(domain in host for domain in NON_PRODUCT_DOMAINS):
+        score -= 3.0
+
+    if NON_PRODUCT_URL_PATTERN.search(path):
+        score -= 1.5
+    elif any(kw in url.lower() for kw in PRODUCT_URL_KEYWORDS):
+        score += 1.0
+
+    if path in ("", "/"):
+        score += 0.3  # ブランドの公式サイトトップ等
+    return score
+
+
+def _text_score(title: str, snippet: str) -> float:
+    """タイトル・スニペットの手がかりと単語重みによる重み"""
+    text = f"{title} {snippet}"
+    lower = text.lower()
+    score = 0.0
+
+    if PRICE_PATTERN.search(text):
+        score += 1.5
+    if CART_PATTERN.search(text):
+        score += 1.5
+    if LISTICLE_PATTERN.search(title):
+        score -= 1.5
+    if title.rstrip().endswith(("?", "？")):
+        score -= 1.0
+
+    words = set(_WORD_PATTERN.findall(lower))
+    score += sum(TOKEN_WEIGHTS.get(word, 0.0) for word in words)
+    score += sum(TOKEN_WEIGHTS[t] for t in _SUBSTRING_TOKENS if t in lower)
+    return score
+
+
+class ProductPageClassifier:
+    """
+    検索結果が製品ページかをスクレイピング前に判定する軽量分類器
+
+    score() は製品ページらしさ（0〜1）を返し、threshold 未満の
+    検索結果は filter() で除外される。判定が付かない中立の結果は
+    0.5 付近になるため、threshold を0.5より低くしておけば
+    手がかりのないページは残る。
+    """
+
+    def __init__(self, threshold: float = 0.3):
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self.evaluated_count = 0
+        self.skipped_count = 0
+
+    def score(self, result: SearchResult) -> float:
+        """
+        検索結果の製品ページらしさを推定
+
+        Args:
+            result: 検索結果
+
+        Returns:
+            0〜1のスコア
+        """
+        logit = _url_score(result.url) + _text_score(result.title, result.snippet)
+        logit = max(-20.0, min(20.0, logit))
+        return 1 / (1 + math.exp(-logit))
+
+    def accept(self, result: SearchResult) -> bool:
+        """
+        検索結果をスクレイピングするか判定し、統計を記録
+
+        Args:
+            result: 検索結果
+
+        Returns:
+            スクレイピングする場合 True
+        """
+        score = self.score(result)
+        accepted = score >= self.threshold
+
+        with self._lock:
+            self.evaluated_count += 1
+            if not accepted:
+                self.skipped_count += 1
+
+        if not accepted:
+            logger.debug(f"製品ページではないと判定 ({score:.2f}): {result.url}")
+        return accepted
+
+    def filter(self, results: list[SearchResult]) -> list[SearchResult]:
+        """
+        製品ページらしい検索結果だけを残す（順序は維持）
+
+        Args:
+            results: 検索結果のリスト
+
+        Returns:
+            threshold 以上の検索結果
+        """
+        return [result for result in results if self.accept(result)]
+
+    def get_statistics(self) -> dict:
+        """
+        事前判定の統計を取得
+
+        除外した1件ごとにスクレイピングとLLM抽出を1回ずつ節約している。
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            skip_rate = (
+                self.skipped_count / self.evaluated_count * 100
+                if self.evaluated_count
+                else 0.0
+            )
+            return {
+                "evaluated": self.evaluated_count,
+                "skipped": self.skipped_count,
+                "saved_scrapes": self.skipped_count,
+                "saved_llm_calls": self.skipped_count,
+                "skip_rate": f"{skip_rate:.1f}%",
+            }
+
@@ -0,0 +1,372 @@
+"""
+構造化データの解析
+
+ページに埋め込まれた schema.org/Product の JSON-LD、microdata、
+OpenGraph（og:* / product:*）から製品名・ブランド・価格・通貨・URLを
+決定的に取り出す。十分な情報があればLLMによる抽出を省略できる。
+"""
+
+import json
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Optional
+from urllib.parse import urljoin, urlsplit
+
+from src.domain.models import PriceInfo, Product
+from src.domain.page_classifier import SHOP_DOMAINS
+
+logger = logging.getLogger(__name__)
+
+# 閉じタグを持たない要素
+_VOID_TAGS = {"br", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+CURRENCY_SYMBOLS = {
+    "JPY": "¥",
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "CNY": "¥",
+    "KRW": "₩",
+}
+
+# 構造化データのフィールド名（このモジュールが返す辞書のキー）
+FIELDS = ("name", "brand", "description", "price", "currency", "url")
+
+
+# 数値部分（"1 299,00" のような空白区切りの桁も含む）
+_NUMBER_PATTERN = re.compile(r"\d(?:[\d.,]|[ \u00a0\u202f](?=\d{3}))*")
+
+
+def _parse_price(value: Any) -> Optional[float]:
+    """
+    価格表記を数値に変換
+
+    "1,980"・"¥1980"・"1.299,00"（欧州式）・"1 299,00" のいずれにも対応する。
+    "." と "," が両方あれば後ろにある方を小数点とみなす。片方だけの場合は、
+    1回だけ現れて後ろが3桁でなければ小数点、それ以外は桁区切りとみなす。
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = _NUMBER_PATTERN.search(value)
+    if not match:
+        return None
+
+    number = re.sub(r"[ \u00a0\u202f]", "", match.group(0)).rstrip(".,")
+    separators = [c for c in number if c in ".,"]
+    decimal = None
+    if "." in separators and "," in separators:
+        decimal = separators[-1]
+    elif len(separators) == 1 and len(number) - number.index(separators[0]) != 4:
+        decimal = separators[0]
+
+    thousands = {".", ","} - {decimal}
+    number = "".join(c for c in number if c not in thousands)
+    try:
+        return float(number.replace(",", ".") if decimal else number)
+    except ValueError:
+        return None
+
+
+def _text(value: Any) -> str:
+    """文字列・{"name": ...}・リストのいずれからも文字列を取り出す"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return _text(value.get("name", ""))
+    if isinstance(value, list) and value:
+        return _text(value[0])
+    return ""
+
+
+def _is_product_type(node: dict) -> bool:
+    types = node.get("@type", [])
+    if isinstance(types, str):
+        types = [types]
+    return any(isinstance(t, str) and t.endswith("Product") for t in types)
+
+
+def _iter_json_ld_nodes(data: Any):
+    """JSON-LD（@graph・配列を含む）の全ノードを走査"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_json_ld_nodes(data["@graph"])
+
+
+def _offer_fields(offers: Any) -> dict:
+    """offers（Offer / AggregateOffer / 配列）から価格と通貨を取り出す"""
+    if isinstance(offers, list):
+        for offer in offers:
+            fields = _offer_fields(offer)
+            if fields.get("price") is not None:
+                return fields
+        return {}
+    if not isinstance(offers, dict):
+        return {}
+
+    price = offers.get("price", offers.get("lowPrice"))
+    currency = offers.get("priceCurrency", "")
+    spec = offers.get("priceSpecification")
+    if price is None and isinstance(spec, (dict, list)):
+        spec = spec[0] if isinstance(spec, list) and spec else spec
+        if isinstance(spec, dict):
+            price = spec.get("price")
+            currency = currency or spec.get("priceCurrency", "")
+
+    return {"price": _parse_price(price), "currency": _text(currency).upper()}
+
+
+def _json_ld_product(scripts: list[str]) -> dict:
+    """JSON-LD スクリプト群から最初の Product ノードを取り出す"""
+    for script in scripts:
+        try:
+            data = json.loads(script)
+        except ValueError:
+            logger.debug("JSON-LD の解析に失敗しました")
+            continue
+
+        for node in _iter_json_ld_nodes(data):
+            if not _is_product_type(node):
+                continue
+            offers = node.get("offers")
+            if offers is None and isinstance(node.get("hasVariant"), list):
+                offers = [v.get("offers") for v in node["hasVariant"] if v]
+            fields = {
+                "name": _text(node.get("name")),
+                "brand": _text(node.get("brand") or node.get("manufacturer")),
+                "description": _text(node.get("description")),
+                "url": _text(node.get("url")),
+            }
+            fields.update(_offer_fields(offers))
+            return fields
+
+    return {}
+
+
+def _opengraph_product(meta: dict[str, str]) -> dict:
+    """OpenGraph / product:* メタタグから製品情報を取り出す"""
+    price = meta.get("product:price:amount") or meta.get("og:price:amount")
+    if meta.get("og:type", "").lower() not in ("product", "og:product") and not price:
+        return {}
+
+    return {
+        "name": meta.get("og:title", ""),
+        "brand": meta.get("product:brand") or meta.get("og:brand", ""),
+        "description": meta.get("og:description", ""),
+        "price": _parse_price(price),
+        "currency": (
+            meta.get("product:price:currency") or meta.get("og:price:currency", "")
+        ).upper(),
+        "url": meta.get("og:url", ""),
+    }
+
+
+class StructuredDataParser(HTMLParser):
+    """
+    HTMLから JSON-LD・microdata・OpenGraph を収集するパーサ
+
+    チャンク単位で feed() でき、get_data() で統合結果を返す。
+    JSON-LD・microdata の Product を読み終えるか </body> に達すると
+    done が真になる（それ以降を受信しなくてよい）。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: list[str] = []
+        self.meta: dict[str, str] = {}
+        self.microdata: dict[str, Any] = {}
+        self.done = False
+
+        self._json_ld_parts: Optional[list[str]] = None
+        # (タグ名, 開いたスコープ名 or None, 取得中のitemprop or None, テキスト)
+        self._stack: list[tuple[str, Optional[str], Optional[str], list[str]]] = []
+
+    def _scope(self) -> Optional[str]:
+        """現在の microdata スコープ（product / brand / offers 等）"""
+        for _, scope, _, _ in reversed(self._stack):
+            if scope:
+                return scope
+        return None
+
+    def _set_microdata(self, prop: str, value: str) -> None:
+        """Product スコープ内の itemprop を記録（最初の値を優先）"""
+        scope = self._scope()
+        if scope is None or not value.strip():
+            return
+        if scope == "brand" and prop == "name":
+            prop = "brand"
+        elif scope not in ("product", "offers"):
+            return
+        self.microdata.setdefault(prop, value.strip())
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {k: (v or "") for k, v in attrs}
+
+        if tag == "script":
+            if attributes.get("type", "").lower() == "application/ld+json":
+                self._json_ld_parts = []
+            return
+
+        if tag == "meta":
+            key = attributes.get("property") or attributes.get("name")
+            if key and "content" in attributes:
+                self.meta.setdefault(key.lower(), attributes["content"].strip())
+
+        prop = attributes.get("itemprop")
+        scope = None
+        if "itemscope" in attributes:
+            if "schema.org/Product" in attributes.get("itemtype", ""):
+                scope = "product"
+            elif self._scope() is not None and prop:
+                scope = prop  # brand, offers 等の入れ子スコープ
+
+        value = attributes.get("content") or attributes.get("href") or ""
+        if prop and scope is None and value:
+            self._set_microdata(prop, value)
+            prop = None
+        elif scope is not None:
+            prop = None
+
+        if tag not in _VOID_TAGS:
+            self._stack.append((tag, scope, prop, []))
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            if self._json_ld_parts is not None:
+                script = "".join(self._json_ld_parts)
+                self.json_ld.append(script)
+                self._json_ld_parts = None
+                if _json_ld_product([script]).get("name"):
+                    self.done = True
+            return
+
+        if tag in ("body", "html"):
+            self.done = True
+
+        if not any(name == tag for name, _, _, _ in self._stack):
+            return
+        while self._stack:
+            name, scope, prop, parts = self._stack.pop()
+            if prop:
+                self._set_microdata(prop, " ".join("".join(parts).split()))
+            if scope == "product" and self.microdata.get("name"):
+                self.done = True
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        if self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+            return
+        # 入れ子のインライン要素（<b> 等）の文字列も itemprop の値に含める
+        for _, _, prop, parts in reversed(self._stack):
+            if prop:
+                parts.append(data)
+                break
+
+    def get_data(self) -> dict:
+        """
+        JSON-LD > microdata > OpenGraph の優先順で統合した製品情報を返す
+
+        Returns:
+            FIELDS をキーとする辞書（見つからなければ空）
+        """
+        microdata = {
+            "name": self.microdata.get("name", ""),
+            "brand": self.microdata.get("brand", ""),
+            "description": self.microdata.get("description", ""),
+            "price": _parse_price(
+                self.microdata.get("price") or self.microdata.get("lowPrice")
+            ),
+            "currency": self.microdata.get("priceCurrency", "").upper(),
+            "url": self.microdata.get("url", ""),
+        }
+        sources = [
+            _json_ld_product(self.json_ld),
+            microdata,
+            _opengraph_product(self.meta),
+        ]
+
+        merged: dict[str, Any] = {}
+        for field in FIELDS:
+            for source in sources:
+                if source.get(field) not in (None, ""):
+                    merged[field] = source[field]
+                    break
+
+        return merged if merged.get("name") else {}
+
+
+def parse_structured_data(html: str) -> dict:
+    """
+    HTMLから構造化された製品情報を取り出す
+
+    Args:
+        html: ページのHTML
+
+    Returns:
+        name, brand, description, price, currency, url をキーとする辞書
+        （製品情報がなければ空）
+    """
+    parser = StructuredDataParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        logger.debug(f"構造化データの解析エラー: {e}")
+    return parser.get_data()
+
+
+def is_complete(data: dict) -> bool:
+    """LLM抽出を省略できるだけの情報（製品名と価格）が揃っているか"""
+    return bool(data.get("name")) and data.get("price") is not None
+
+
+def product_from_structured(data: dict, source_url: str) -> Optional[Product]:
+    """
+    構造化データから Product を生成
+
+    適合度と評価理由は含まない（別途LLMで評価する）。
+
+    Args:
+        data: parse_structured_data の結果
+        source_url: 情報取得元URL
+
+    Returns:
+        Product（製品名がなければ None）
+    """
+    if not data.get("name"):
+        return None
+
+    price = None
+    if data.get("price") is not None:
+        amount = float(data["price"])
+        currency = data.get("currency") or "USD"
+        symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+        number = f"{amount:,.0f}" if amount.is_integer() else f"{amount:,.2f}"
+        price = PriceInfo(
+            amount=amount, currency=currency, formatted=f"{symbol}{number}"
+        )
+
+    # 相対URL（"/products/123" 等）は情報元のページを基準に解決する
+    url = urljoin(source_url, data.get("url") or "") or source_url
+    host = urlsplit(url).hostname or ""
+    # 通販サイトのURLは公式URLとして扱わない
+    is_shop = any(domain in host for domain in SHOP_DOMAINS)
+
+    return Product(
+        name=data["name"],
+        brand=data.get("brand", ""),
+        description=data.get("description", ""),
+        price=price,
+        official_url=url if not is_shop else None,
+        amazon_url=url if "amazon." in host else None,
+        rakuten_url=url if "rakuten." in host else None,
+        source_url=source_url,
+    )
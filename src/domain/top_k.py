@@ -0,0 +1,92 @@
+"""
+上位K件の製品集計
+
+抽出が完了した製品を順に受け取り、適合度の高い上位K件を
+ヒープで保持する。最小適合度を満たす製品がK件そろった時点で
+以降の探索を打ち切れるようにする。
+"""
+
+import heapq
+import itertools
+from typing import Optional
+
+from src.domain.models import Product
+
+
+class TopKProducts:
+    """
+    適合度上位K件を保持するヒープ
+
+    同じ製品名（大文字小文字・前後の空白を無視）は1件として扱い、
+    適合度の高い方を残す。min_score 未満の製品は保持しない。
+    """
+
+    def __init__(self, k: int, min_score: int = 0):
+        self.k = max(1, k)
+        self.min_score = min_score
+
+        # (適合度, 追加順, 製品名) の最小ヒープ。先頭が入れ替え候補
+        self._heap: list[tuple[int, int, str]] = []
+        self._products: dict[str, Product] = {}
+        self._counter = itertools.count()
+
+    @staticmethod
+    def _key(product: Product) -> str:
+        return product.name.lower().strip()
+
+    def add(self, product: Optional[Product]) -> bool:
+        """
+        製品を追加
+
+        Args:
+            product: 抽出された製品（None は無視）
+
+        Returns:
+            上位K件に入った場合 True
+        """
+        if product is None or product.relevance_score < self.min_score:
+            return False
+
+        key = self._key(product)
+        current = self._products.get(key)
+        if current is not None:
+            if product.relevance_score <= current.relevance_score:
+                return False
+            # 同名製品の適合度を更新（K件以下なのでヒープを作り直す）
+            self._products[key] = product
+            self._heap = [
+                (self._products[name].relevance_score, order, name)
+                for _, order, name in self._heap
+            ]
+            heapq.heapify(self._heap)
+            return True
+
+        entry = (product.relevance_score, next(self._counter), key)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif product.relevance_score > self._heap[0][0]:
+            _, _, removed = heapq.heapreplace(self._heap, entry)
+            del self._products[removed]
+        else:
+            return False
+
+        self._products[key] = product
+        return True
+
+    @property
+    def is_full(self) -> bool:
+        """最小適合度を満たす製品がK件そろったか"""
+        return len(self._heap) >= self.k
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def products(self) -> list[Product]:
+        """
+        保持している製品を適合度の降順で取得
+
+        Returns:
+            製品のリスト（最大K件）
+        """
+        ordered = sorted(self._heap, key=lambda e: (-e[0], e[1]))
+        return [self._products[name] for _, _, name in ordered]
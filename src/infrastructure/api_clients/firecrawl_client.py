@@ -6,19 +6,46 @@ Webページのスクレイピングとサイトマップ取得を担当。
 """
 
 import logging
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
 
-from firecrawl import Firecrawl
-from ratelimit import limits, sleep_and_retry
+import httpx
+from firecrawl import AsyncFirecrawl, Firecrawl
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential_jitter,
-    retry_if_exception_type,
+    retry_if_not_exception_type,
 )
 
 from src.core.config import settings
 from src.core.interfaces import WebScraperClient
+from src.domain.hunt_budget import (
+    FIRECRAWL_CREDITS,
+    BudgetExceeded,
+    acquire_within_budget,
+    acquire_within_budget_async,
+    charge_budget,
+    check_budget,
+    timeout_within_budget,
+    wait_within_budget,
+)
+from src.domain.structured_data import StructuredDataParser, parse_structured_data
+from src.infrastructure.api_clients.html_text import (
+    extract_text_from_chunks,
+    extract_text_from_chunks_async,
+)
+from src.infrastructure.api_clients.http_session import (
+    create_async_client,
+    get_session,
+)
+from src.infrastructure.cache.scrape_cache import ScrapeCache
+from src.infrastructure.rate_limit.adaptive import (
+    RateLimited,
+    rate_limit_from_exception,
+    wait_rate_limited,
+)
+from src.infrastructure.rate_limit.registry import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +56,46 @@ class FirecrawlError(Exception):
     pass
 
 
+@dataclass
+class ScrapedPage:
+    """スクレイピング結果（本文と構造化データ）"""
+
+    content: str
+    structured: dict = field(default_factory=dict)
+
+
+# フォールバックスクレイピング用のリクエストヘッダー
+FALLBACK_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+FALLBACK_TIMEOUT = 15  # 秒（締め切りが近ければ残り時間まで短くする）
+
+
+def _within_deadline(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    受信中も締め切りを確認しながらチャンクを返す
+
+    HTTPクライアントのタイムアウトは読み取り1回ごとのため、
+    ゆっくり届く大きなページでは合計時間を制限できない。
+    """
+    for chunk in chunks:
+        check_budget()
+        yield chunk
+
+
+async def _within_deadline_async(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[bytes]:
+    """受信中も締め切りを確認しながらチャンクを返す（非同期版）"""
+    async for chunk in chunks:
+        check_budget()
+        yield chunk
+
+
 class FirecrawlClient(WebScraperClient):
     """
     Firecrawl v1 APIを使用したWebスクレイピングクライアント
@@ -40,68 +107,205 @@ class FirecrawlClient(WebScraperClient):
     - /scrape で詳細コンテンツを取得
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[ScrapeCache] = None,
+    ):
         self.api_key = api_key or settings.firecrawl_api_key
+        if cache is None and settings.scrape_cache_enabled:
+            cache = ScrapeCache()
+        self.cache = cache
+        self.scrape_limiter = get_rate_limiter("firecrawl", "scrape")
+        self.map_limiter = get_rate_limiter("firecrawl", "map")
         self.app = Firecrawl(api_key=self.api_key) if self.api_key else None
+        self.async_app = AsyncFirecrawl(api_key=self.api_key) if self.api_key else None
+        self._async_http: Optional[httpx.AsyncClient] = None
+
+    def _extract_markdown(self, result: Any, url: str) -> str:
+        """
+        Firecrawlのレスポンスからmarkdownを取り出す
+
+        Args:
+            result: scrape の戻り値（Document または dict）
+            url: スクレイピング対象URL（ログ用）
+
+        Returns:
+            Markdown形式のコンテンツ（取得できなければ空文字）
+        """
+        if result and hasattr(result, "markdown") and result.markdown:
+            content = result.markdown
+        elif result and isinstance(result, dict) and "markdown" in result:
+            content = result["markdown"]
+        else:
+            logger.warning(f"コンテンツが取得できませんでした: {url}")
+            return ""
+
+        logger.info(f"スクレイピング完了: {url} ({len(content)}文字)")
+        return content
+
+    def _formats(self) -> list[str]:
+        """Firecrawlに要求する出力形式（構造化データ用に生HTMLも取得）"""
+        if settings.structured_data_enabled:
+            return ["markdown", "rawHtml"]
+        return ["markdown"]
+
+    def _to_page(self, result: Any, url: str) -> ScrapedPage:
+        """
+        Firecrawlのレスポンスから ScrapedPage を生成
+
+        生HTMLは構造化データ（JSON-LD・microdata・OpenGraph）の解析にだけ使い、
+        保持しない。
+
+        Args:
+            result: scrape の戻り値（Document または dict）
+            url: スクレイピング対象URL
+
+        Returns:
+            ScrapedPage
+        """
+        content = self._extract_markdown(result, url)
+
+        if isinstance(result, dict):
+            raw_html = result.get("rawHtml") or result.get("raw_html")
+        else:
+            raw_html = getattr(result, "raw_html", None)
+
+        structured = parse_structured_data(raw_html) if raw_html else {}
+        if structured:
+            logger.debug(f"構造化データ検出: {url} ({structured.get('name')})")
+        return ScrapedPage(content=content, structured=structured)
+
+    def _handle_scrape_error(self, url: str, error: Exception) -> None:
+        """
+        スクレイピング例外を分類して再送出
+
+        レート制限（429）はレートリミッタに反映して RateLimited を送出、
+        それ以外は FirecrawlError に変換。
+        """
+        limited, retry_after = rate_limit_from_exception(error)
+        if limited:
+            logger.warning(f"Firecrawl レート制限: {url}")
+            self.scrape_limiter.on_throttled(retry_after)
+            raise RateLimited("firecrawl", retry_after) from error
+        logger.error(f"Firecrawl スクレイピングエラー: {url} - {error}")
+        raise FirecrawlError(f"スクレイピング失敗: {url}") from error
 
-    @sleep_and_retry
-    @limits(calls=5, period=60)  # 5回/分のレート制限
     @retry(
         stop=stop_after_attempt(5),
-        wait=wait_exponential_jitter(initial=1, max=60),
-        retry=retry_if_exception_type((Exception,)),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
+        retry=retry_if_not_exception_type(BudgetExceeded),
         before_sleep=lambda retry_state: logger.warning(
             f"Firecrawl scrape リトライ: {retry_state.attempt_number}回目"
         ),
     )
-    def scrape(self, url: str) -> str:
+    def scrape_page(self, url: str) -> ScrapedPage:
         """
-        URLからコンテンツを取得してMarkdown形式で返す
+        URLからコンテンツと構造化データを取得
 
         Args:
             url: スクレイピング対象URL
 
         Returns:
-            Markdown形式のコンテンツ
+            ScrapedPage（本文はMarkdown形式）
 
         Raises:
             FirecrawlError: スクレイピングに失敗した場合
         """
         if not self.app:
             logger.error("Firecrawl APIキーが設定されていません")
-            return ""
+            return ScrapedPage(content="")
+
+        # リトライの各試行もトークンを消費する
+        acquire_within_budget(self.scrape_limiter, FIRECRAWL_CREDITS)
 
         try:
             logger.info(f"スクレイピング開始: {url}")
 
-            result = self.app.scrape(url, formats=["markdown"])
+            result = self.app.scrape(url, formats=self._formats())
+            charge_budget(FIRECRAWL_CREDITS)
+            self.scrape_limiter.on_success()
+            return self._to_page(result, url)
 
-            if result and hasattr(result, "markdown") and result.markdown:
-                content = result.markdown
-                logger.info(f"スクレイピング完了: {url} ({len(content)}文字)")
-                return content
-            elif result and isinstance(result, dict) and "markdown" in result:
-                content = result["markdown"]
-                logger.info(f"スクレイピング完了: {url} ({len(content)}文字)")
-                return content
-            else:
-                logger.warning(f"コンテンツが取得できませんでした: {url}")
-                return ""
+        except Exception as e:
+            self._handle_scrape_error(url, e)
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Firecrawl scrape リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def scrape_page_async(self, url: str) -> ScrapedPage:
+        """
+        URLからコンテンツと構造化データを取得（非同期版）
+
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            ScrapedPage（本文はMarkdown形式）
+
+        Raises:
+            FirecrawlError: スクレイピングに失敗した場合
+        """
+        if not self.async_app:
+            logger.error("Firecrawl APIキーが設定されていません")
+            return ScrapedPage(content="")
+
+        await acquire_within_budget_async(self.scrape_limiter, FIRECRAWL_CREDITS)
+
+        try:
+            logger.info(f"スクレイピング開始: {url}")
+
+            result = await self.async_app.scrape(url, formats=self._formats())
+            charge_budget(FIRECRAWL_CREDITS)
+            self.scrape_limiter.on_success()
+            return self._to_page(result, url)
 
         except Exception as e:
-            error_msg = str(e)
-            if "429" in error_msg or "rate limit" in error_msg.lower():
-                logger.warning(f"Firecrawl レート制限: {url}")
-                raise  # リトライさせる
-            logger.error(f"Firecrawl スクレイピングエラー: {url} - {e}")
-            raise FirecrawlError(f"スクレイピング失敗: {url}") from e
-
-    @sleep_and_retry
-    @limits(calls=3, period=60)  # 3回/分のレート制限（mapは重い）
+            self._handle_scrape_error(url, e)
+
+    def scrape(self, url: str) -> str:
+        """
+        URLからコンテンツを取得してMarkdown形式で返す
+
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            Markdown形式のコンテンツ
+
+        Raises:
+            FirecrawlError: スクレイピングに失敗した場合
+        """
+        return self.scrape_page(url).content
+
+    async def scrape_async(self, url: str) -> str:
+        """
+        URLからコンテンツを取得してMarkdown形式で返す（非同期版）
+
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            Markdown形式のコンテンツ
+
+        Raises:
+            FirecrawlError: スクレイピングに失敗した場合
+        """
+        return (await self.scrape_page_async(url)).content
+
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential_jitter(initial=2, max=60),
-        retry=retry_if_exception_type((Exception,)),
+        wait=wait_within_budget(wait_exponential_jitter(initial=2, max=60)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
         before_sleep=lambda retry_state: logger.warning(
             f"Firecrawl map リトライ: {retry_state.attempt_number}回目"
         ),
@@ -120,10 +324,13 @@ class FirecrawlClient(WebScraperClient):
             logger.error("Firecrawl APIキーが設定されていません")
             return []
 
+        acquire_within_budget(self.map_limiter, FIRECRAWL_CREDITS)
+
         try:
             logger.info(f"サイトマップ取得開始: {url}")
 
             result = self.app.map_url(url)
+            charge_budget(FIRECRAWL_CREDITS)
 
             if result and "links" in result:
                 urls = result["links"]
@@ -134,6 +341,9 @@ class FirecrawlClient(WebScraperClient):
                 return []
 
         except Exception as e:
+            limited, retry_after = rate_limit_from_exception(e)
+            if limited:
+                self.map_limiter.on_throttled(retry_after)
             logger.error(f"Firecrawl マップエラー: {url} - {e}")
             return []
 
@@ -141,7 +351,17 @@ class FirecrawlClient(WebScraperClient):
         """
         フォールバック付きスクレイピング
 
-        Firecrawlが失敗した場合、シンプルなrequestsでフォールバック。
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            コンテンツ（Markdown or HTML）
+        """
+        return self.scrape_page_with_fallback(url).content
+
+    async def scrape_with_fallback_async(self, url: str) -> str:
+        """
+        フォールバック付きスクレイピング（非同期版）
 
         Args:
             url: スクレイピング対象URL
@@ -149,64 +369,181 @@ class FirecrawlClient(WebScraperClient):
         Returns:
             コンテンツ（Markdown or HTML）
         """
+        return (await self.scrape_page_with_fallback_async(url)).content
+
+    def _get_cached_page(self, url: str) -> Optional[ScrapedPage]:
+        """キャッシュ済みのページを取得"""
+        if not self.cache:
+            return None
+        content = self.cache.get(url)
+        if content is None:
+            return None
+        return ScrapedPage(content=content, structured=self.cache.get_structured(url))
+
+    def _store_page(self, url: str, page: ScrapedPage) -> None:
+        """Firecrawlで取得したページをキャッシュ"""
+        if self.cache and page.content:
+            self.cache.set(url, page.content)
+            if page.structured:
+                self.cache.set_structured(url, page.structured)
+
+    def scrape_page_with_fallback(self, url: str) -> ScrapedPage:
+        """
+        フォールバック付きスクレイピング（構造化データ付き）
+
+        キャッシュにあればそれを返す。なければFirecrawlで取得してキャッシュし、
+        失敗した場合はシンプルなHTTP取得でフォールバック。
+
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            ScrapedPage
+        """
+        cached = self._get_cached_page(url)
+        if cached is not None:
+            return cached
+
         try:
-            return self.scrape(url)
+            page = self.scrape_page(url)
+        except BudgetExceeded:
+            # 締め切り・クレジット上限ではフォールバックせずに打ち切る
+            raise
         except Exception:
             logger.warning(f"Firecrawl失敗、フォールバック試行: {url}")
-            return self._fallback_scrape(url)
+            # フォールバック結果は品質が低いためキャッシュしない
+            return self._fallback_scrape_page(url)
 
-    def _fallback_scrape(self, url: str) -> str:
+        self._store_page(url, page)
+        return page
+
+    async def scrape_page_with_fallback_async(self, url: str) -> ScrapedPage:
         """
-        シンプルなrequestsによるフォールバックスクレイピング
+        フォールバック付きスクレイピング（構造化データ付き、非同期版）
 
         Args:
             url: スクレイピング対象URL
 
         Returns:
-            HTMLコンテンツ
+            ScrapedPage
         """
-        import requests
+        cached = self._get_cached_page(url)
+        if cached is not None:
+            return cached
+
+        try:
+            page = await self.scrape_page_async(url)
+        except BudgetExceeded:
+            # 締め切り・クレジット上限ではフォールバックせずに打ち切る
+            raise
+        except Exception:
+            logger.warning(f"Firecrawl失敗、フォールバック試行: {url}")
+            # フォールバック結果は品質が低いためキャッシュしない
+            return await self._fallback_scrape_page_async(url)
 
+        self._store_page(url, page)
+        return page
+
+    def _structured_parser(self) -> Optional[StructuredDataParser]:
+        """フォールバック時に本文と並行して構造化データを集めるパーサ"""
+        return StructuredDataParser() if settings.structured_data_enabled else None
+
+    def _fallback_scrape_page(self, url: str) -> ScrapedPage:
+        """
+        共有セッションによるフォールバックスクレイピング
+
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            ScrapedPage（本文はHTMLから抽出したテキスト）
+        """
+        # 締め切り後はフォールバックもせず、締め切りを超えて待たない
+        timeout = timeout_within_budget(FALLBACK_TIMEOUT)
+        parser = self._structured_parser()
         try:
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
+            with get_session().get(
+                url, headers=FALLBACK_HEADERS, timeout=timeout, stream=True
+            ) as response:
+                response.raise_for_status()
+
+                # 必要な文字数が集まった時点で受信を打ち切る
+                content = extract_text_from_chunks(
+                    _within_deadline(response.iter_content(chunk_size=16 * 1024)),
+                    response.headers.get("Content-Type", ""),
+                    max_chars=settings.fallback_max_chars,
+                    max_bytes=settings.fallback_max_bytes,
+                    structured_parser=parser,
                 )
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
 
-            # 簡易的なHTML→テキスト変換
-            from html.parser import HTMLParser
+            logger.info(f"フォールバックスクレイピング完了: {url} ({len(content)}文字)")
+            return ScrapedPage(
+                content=content, structured=parser.get_data() if parser else {}
+            )
 
-            class TextExtractor(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.text_parts = []
-                    self.skip_tags = {"script", "style", "head", "meta", "link"}
-                    self.current_tag = None
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"フォールバックスクレイピングも失敗: {url} - {e}")
+            return ScrapedPage(content="")
 
-                def handle_starttag(self, tag, attrs):
-                    self.current_tag = tag
+    async def _fallback_scrape_page_async(self, url: str) -> ScrapedPage:
+        """
+        httpxによるフォールバックスクレイピング（非同期版）
 
-                def handle_data(self, data):
-                    if self.current_tag not in self.skip_tags:
-                        text = data.strip()
-                        if text:
-                            self.text_parts.append(text)
+        Args:
+            url: スクレイピング対象URL
+
+        Returns:
+            ScrapedPage（本文はHTMLから抽出したテキスト）
+        """
+        # 締め切り後はフォールバックもせず、締め切りを超えて待たない
+        timeout = timeout_within_budget(FALLBACK_TIMEOUT)
+        parser = self._structured_parser()
+        if self._async_http is None:
+            self._async_http = create_async_client(
+                headers=FALLBACK_HEADERS,
+                timeout=FALLBACK_TIMEOUT,
+                follow_redirects=True,
+            )
 
-            extractor = TextExtractor()
-            extractor.feed(response.text)
-            content = "\n".join(extractor.text_parts)
+        try:
+            async with self._async_http.stream("GET", url, timeout=timeout) as response:
+                response.raise_for_status()
+
+                content = await extract_text_from_chunks_async(
+                    _within_deadline_async(response.aiter_bytes(chunk_size=16 * 1024)),
+                    response.headers.get("Content-Type", ""),
+                    max_chars=settings.fallback_max_chars,
+                    max_bytes=settings.fallback_max_bytes,
+                    structured_parser=parser,
+                )
 
             logger.info(f"フォールバックスクレイピング完了: {url} ({len(content)}文字)")
-            return content
+            return ScrapedPage(
+                content=content, structured=parser.get_data() if parser else {}
+            )
 
+        except BudgetExceeded:
+            raise
         except Exception as e:
             logger.error(f"フォールバックスクレイピングも失敗: {url} - {e}")
-            return ""
+            return ScrapedPage(content="")
+
+    def get_cache_statistics(self) -> dict:
+        """
+        スクレイピングキャッシュの統計を取得
+
+        Returns:
+            統計情報の辞書（キャッシュ無効時は空）
+        """
+        return self.cache.get_statistics() if self.cache else {}
+
+    async def aclose(self) -> None:
+        """非同期HTTPクライアントを閉じる"""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
 
     def scrape_product_pages(
         self, base_url: str, max_pages: int = 5
@@ -5,6 +5,8 @@ LLMによる翻訳・製品情報抽出を担当。
 JSON出力を使用して構造化データを取得。
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 from typing import Optional
@@ -15,11 +17,19 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential_jitter,
-    retry_if_exception_type,
+    retry_if_not_exception_type,
 )
 
 from src.core.config import settings
 from src.core.interfaces import LLMClient
+from src.domain.hunt_budget import (
+    LLM_TOKENS,
+    BudgetExceeded,
+    charge_budget,
+    check_budget,
+    wait_within_budget,
+)
+from src.infrastructure.cache.llm_cache import LLMCache
 from src.domain.models import (
     Product,
     PriceInfo,
@@ -29,6 +39,19 @@ from src.domain.models import (
 
 logger = logging.getLogger(__name__)
 
+# 製品抽出でLLMに渡すコンテンツの最大文字数
+MAX_CONTENT_LENGTH = 8000
+
+# 製品抽出プロンプトのバージョン（プロンプトを変更したら上げ、抽出キャッシュを無効化する）
+EXTRACTION_PROMPT_VERSION = "1"
+
+# 複数ページ一括抽出のトークン見積もり（日本語混在を考慮し1トークン≒3文字）
+CHARS_PER_TOKEN = 3
+
+# 二段階抽出（欲求非依存の製品情報抽出 + 適合度評価）のプロンプトバージョン
+PRODUCT_INFO_PROMPT_VERSION = "1"
+SCORING_PROMPT_VERSION = "1"
+
 
 class GeminiClient(LLMClient):
     """
@@ -38,23 +61,66 @@ class GeminiClient(LLMClient):
     Tenacityによるリトライ機能付き。
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+    ):
         self.api_key = api_key or settings.gemini_api_key
         self.model_name = model or settings.gemini_model
         self.client = genai.Client(api_key=self.api_key)
+        if cache is None and settings.llm_cache_enabled:
+            cache = LLMCache()
+        self.cache = cache
+
+    def _cache_get(self, namespace: str, *parts) -> Optional[object]:
+        """LLMキャッシュから取得（キャッシュ無効時は None）"""
+        if not self.cache:
+            return None
+        return self.cache.get(namespace, self.model_name, *parts)
+
+    def _cache_set(self, namespace: str, *parts, value, desire: str) -> None:
+        """LLMキャッシュに保存（desire をタグにして無効化可能にする）"""
+        if not self.cache:
+            return
+        self.cache.set(
+            namespace,
+            self.model_name,
+            *parts,
+            value=value,
+            tag=self.cache.make_tag(desire),
+        )
+
+    def invalidate_cache(self, desire: Optional[str] = None) -> None:
+        """
+        LLMキャッシュを無効化
+
+        Args:
+            desire: 指定した欲求に関するエントリのみ削除（省略時は全削除）
+        """
+        if not self.cache:
+            return
+        if desire is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate_desire(desire)
+
+    def get_cache_statistics(self) -> dict:
+        """
+        LLMキャッシュの統計を取得
+
+        Returns:
+            統計情報の辞書（キャッシュ無効時は空）
+        """
+        return self.cache.get_statistics() if self.cache else {}
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential_jitter(initial=1, max=30),
-        retry=retry_if_exception_type((Exception,)),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Gemini API リトライ: {retry_state.attempt_number}回目"
-        ),
-    )
     def translate(self, text: str, target_language: str) -> str:
         """
         テキストを指定言語に翻訳し、検索クエリを生成
 
+        同じ欲求（正規化後）・言語・モデルの結果がキャッシュにあればそれを返す。
+
         Args:
             text: 翻訳対象テキスト（欲求）
             target_language: 翻訳先言語コード（en, zh, de等）
@@ -62,7 +128,75 @@ class GeminiClient(LLMClient):
         Returns:
             翻訳された検索クエリ
         """
-        prompt = f"""
+        cached = self._cache_get("translation", text, target_language)
+        if cached is not None:
+            return cached
+
+        query = self._translate(text, target_language)
+
+        # 解析失敗時は元のテキストが返るため、その場合はキャッシュしない
+        if query != text:
+            self._cache_set(
+                "translation", text, target_language, value=query, desire=text
+            )
+        return query
+
+    async def translate_async(self, text: str, target_language: str) -> str:
+        """
+        テキストを指定言語に翻訳し、検索クエリを生成（非同期版）
+
+        Args:
+            text: 翻訳対象テキスト（欲求）
+            target_language: 翻訳先言語コード（en, zh, de等）
+
+        Returns:
+            翻訳された検索クエリ
+        """
+        cached = self._cache_get("translation", text, target_language)
+        if cached is not None:
+            return cached
+
+        query = await self._translate_async(text, target_language)
+
+        if query != text:
+            self._cache_set(
+                "translation", text, target_language, value=query, desire=text
+            )
+        return query
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Gemini API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    def _translate(self, text: str, target_language: str) -> str:
+        """Gemini APIで翻訳を実行（キャッシュなし）"""
+        response = self._generate(
+            self._build_translate_prompt(text, target_language)
+        )
+        return self._parse_translation(response.text, text)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Gemini API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def _translate_async(self, text: str, target_language: str) -> str:
+        """Gemini APIで翻訳を実行（非同期版、キャッシュなし）"""
+        response = await self._generate_async(
+            self._build_translate_prompt(text, target_language)
+        )
+        return self._parse_translation(response.text, text)
+
+    def _build_translate_prompt(self, text: str, target_language: str) -> str:
+        """翻訳用プロンプトを構築"""
+        return f"""
 以下の「欲求」を{target_language}言語に翻訳し、製品検索に最適なクエリを生成してください。
 
 欲求: {text}
@@ -80,16 +214,10 @@ class GeminiClient(LLMClient):
 }}
 """
 
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-            ),
-        )
-
+    def _parse_translation(self, response_text: str, text: str) -> str:
+        """翻訳レスポンスから検索クエリを取り出す"""
         try:
-            result = json.loads(response.text)
+            result = json.loads(response_text)
             return result.get("search_query", text)
         except json.JSONDecodeError:
             logger.warning("JSON解析失敗、元のテキストを返します")
@@ -99,13 +227,55 @@ class GeminiClient(LLMClient):
         """
         欲求を分析し、多言語検索クエリを生成
 
+        同じ欲求（正規化後）・モデルの分析結果がキャッシュにあればそれを返す。
+
         Args:
             desire: ユーザーの欲求テキスト
 
         Returns:
             DesireAnalysis: 分析結果と翻訳クエリ
         """
-        prompt = f"""
+        cached = self._cache_get("desire_analysis", desire)
+        if cached is not None:
+            return DesireAnalysis.model_validate(cached)
+
+        response = self._generate(self._build_desire_prompt(desire))
+        analysis = self._parse_desire_analysis(response.text, desire)
+        self._cache_analysis(desire, analysis)
+        return analysis
+
+    async def analyze_desire_async(self, desire: str) -> DesireAnalysis:
+        """
+        欲求を分析し、多言語検索クエリを生成（非同期版）
+
+        Args:
+            desire: ユーザーの欲求テキスト
+
+        Returns:
+            DesireAnalysis: 分析結果と翻訳クエリ
+        """
+        cached = self._cache_get("desire_analysis", desire)
+        if cached is not None:
+            return DesireAnalysis.model_validate(cached)
+
+        response = await self._generate_async(self._build_desire_prompt(desire))
+        analysis = self._parse_desire_analysis(response.text, desire)
+        self._cache_analysis(desire, analysis)
+        return analysis
+
+    def _cache_analysis(self, desire: str, analysis: DesireAnalysis) -> None:
+        """欲求分析結果をキャッシュ（翻訳クエリがない＝解析失敗時は保存しない）"""
+        if analysis.translated_queries:
+            self._cache_set(
+                "desire_analysis",
+                desire,
+                value=analysis.model_dump(mode="json"),
+                desire=desire,
+            )
+
+    def _build_desire_prompt(self, desire: str) -> str:
+        """欲求分析用プロンプトを構築"""
+        return f"""
 以下の「欲求」を分析し、製品探索に最適な検索戦略を立ててください。
 
 欲求: {desire}
@@ -123,16 +293,10 @@ class GeminiClient(LLMClient):
 }}
 """
 
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-            ),
-        )
-
+    def _parse_desire_analysis(self, response_text: str, desire: str) -> DesireAnalysis:
+        """欲求分析レスポンスを DesireAnalysis に変換"""
         try:
-            result = json.loads(response.text)
+            result = json.loads(response_text)
             queries = [
                 TranslatedQuery(**q) for q in result.get("translated_queries", [])
             ]
@@ -147,18 +311,40 @@ class GeminiClient(LLMClient):
             logger.warning(f"欲求分析の解析失敗: {e}")
             return DesireAnalysis(original_desire=desire)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential_jitter(initial=1, max=30),
-        retry=retry_if_exception_type((Exception,)),
-        before_sleep=lambda retry_state: logger.warning(
-            f"製品抽出リトライ: {retry_state.attempt_number}回目"
-        ),
-    )
     def extract_product(self, content: str, desire: str) -> Optional[Product]:
         """
         Markdownコンテンツから製品情報を抽出
 
+        同じコンテンツ（切り詰め後のハッシュ）・欲求・モデル・プロンプト版の
+        抽出結果がキャッシュにあれば、LLMを呼ばずにそれを返す。
+        「製品なし」の判定もキャッシュされる。
+
+        Args:
+            content: 解析対象のMarkdownコンテンツ
+            desire: ユーザーの欲求（評価の基準として使用）
+
+        Returns:
+            抽出された製品情報、または None
+        """
+        if len(content) < 100:
+            logger.debug("コンテンツが短すぎるためスキップ")
+            return None
+
+        cache_parts = self._extraction_cache_parts(content, desire)
+        cached = self._cache_get("extraction", *cache_parts)
+        if cached is not None:
+            return self._parse_product(cached, desire)
+
+        response_text = self._extract_product(content, desire)
+        self._cache_extraction(cache_parts, response_text, desire)
+        return self._parse_product(response_text, desire)
+
+    async def extract_product_async(
+        self, content: str, desire: str
+    ) -> Optional[Product]:
+        """
+        Markdownコンテンツから製品情報を抽出（非同期版）
+
         Args:
             content: 解析対象のMarkdownコンテンツ
             desire: ユーザーの欲求（評価の基準として使用）
@@ -170,10 +356,314 @@ class GeminiClient(LLMClient):
             logger.debug("コンテンツが短すぎるためスキップ")
             return None
 
-        max_content_length = 8000
-        truncated_content = content[:max_content_length]
+        cache_parts = self._extraction_cache_parts(content, desire)
+        cached = self._cache_get("extraction", *cache_parts)
+        if cached is not None:
+            return self._parse_product(cached, desire)
+
+        response_text = await self._extract_product_async(content, desire)
+        self._cache_extraction(cache_parts, response_text, desire)
+        return self._parse_product(response_text, desire)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"製品抽出リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    def _extract_product(self, content: str, desire: str) -> str:
+        """Gemini APIで製品抽出を実行し、JSON応答テキストを返す（キャッシュなし）"""
+        response = self._generate(self._build_extraction_prompt(content, desire))
+        return response.text
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"製品抽出リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def _extract_product_async(self, content: str, desire: str) -> str:
+        """Gemini APIで製品抽出を実行（非同期版、キャッシュなし）"""
+        response = await self._generate_async(
+            self._build_extraction_prompt(content, desire)
+        )
+        return response.text
+
+    def _extraction_cache_parts(self, content: str, desire: str) -> tuple[str, ...]:
+        """
+        抽出キャッシュのキー要素を生成
+
+        LLMに実際に渡す切り詰め後のコンテンツをハッシュ化するため、
+        8000文字以降だけが変わったページも同一とみなす。
+        """
+        content_hash = hashlib.sha256(
+            content[:MAX_CONTENT_LENGTH].encode("utf-8")
+        ).hexdigest()
+        return content_hash, desire, EXTRACTION_PROMPT_VERSION
+
+    def _cache_extraction(
+        self, cache_parts: tuple[str, ...], response_text: str, desire: str
+    ) -> None:
+        """抽出応答をキャッシュ（JSONとして解析できない応答は保存しない）"""
+        try:
+            json.loads(response_text)
+        except (json.JSONDecodeError, TypeError):
+            return
+        self._cache_set("extraction", *cache_parts, value=response_text, desire=desire)
+
+    def extract_products_batch(
+        self, contents: list[str], desire: str
+    ) -> list[Optional[Product] | Exception]:
+        """
+        複数ページの製品情報を1回のリクエストでまとめて抽出
+
+        キャッシュ済みのページを除き、残りをトークン予算
+        （settings.extraction_batch_token_budget）と最大ページ数
+        （settings.extraction_batch_size）に収まる単位で1リクエストに詰める。
+        応答に含まれなかった・解析できなかったページは、
+        extract_product による単一ページ抽出にフォールバックする。
+
+        Args:
+            contents: 解析対象のMarkdownコンテンツのリスト
+            desire: ユーザーの欲求
+
+        Returns:
+            contents と同じ順序の結果リスト。各要素は Product、
+            製品なしの場合は None、単一ページ抽出でも失敗した場合は例外
+        """
+        results, pending = self._lookup_extractions(contents, desire)
+
+        for batch in self._pack_extraction_batches(contents, pending):
+            try:
+                response_text = self._generate_json(
+                    self._build_batch_extraction_prompt(contents, batch, desire)
+                )
+            except Exception as e:
+                logger.warning(f"一括抽出エラー、単一ページ抽出にフォールバック: {e}")
+                response_text = ""
+
+            failed = self._apply_batch_extraction(
+                contents, batch, response_text, desire, results
+            )
+            for index in failed:
+                try:
+                    results[index] = self.extract_product(contents[index], desire)
+                except Exception as e:
+                    results[index] = e
+
+        return results
+
+    async def extract_products_batch_async(
+        self, contents: list[str], desire: str
+    ) -> list[Optional[Product] | Exception]:
+        """
+        複数ページの製品情報を1回のリクエストでまとめて抽出（非同期版）
+
+        各バッチのリクエストは並行して発行される。
+
+        Args:
+            contents: 解析対象のMarkdownコンテンツのリスト
+            desire: ユーザーの欲求
+
+        Returns:
+            contents と同じ順序の結果リスト（extract_products_batch と同じ）
+        """
+        results, pending = self._lookup_extractions(contents, desire)
+        batches = self._pack_extraction_batches(contents, pending)
+
+        responses = await asyncio.gather(
+            *(
+                self._generate_json_async(
+                    self._build_batch_extraction_prompt(contents, batch, desire)
+                )
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+
+        failed = []
+        for batch, response_text in zip(batches, responses):
+            if isinstance(response_text, Exception):
+                logger.warning(
+                    f"一括抽出エラー、単一ページ抽出にフォールバック: {response_text}"
+                )
+                response_text = ""
+            failed.extend(
+                self._apply_batch_extraction(
+                    contents, batch, response_text, desire, results
+                )
+            )
+
+        fallbacks = await asyncio.gather(
+            *(self.extract_product_async(contents[i], desire) for i in failed),
+            return_exceptions=True,
+        )
+        for index, product in zip(failed, fallbacks):
+            results[index] = product
+
+        return results
+
+    def _lookup_extractions(
+        self, contents: list[str], desire: str
+    ) -> tuple[list[Optional[Product] | Exception], list[int]]:
+        """
+        キャッシュ済みの抽出結果を取得
+
+        Returns:
+            (ページごとの結果, 抽出が必要なページのインデックス)
+        """
+        results: list[Optional[Product] | Exception] = [None] * len(contents)
+        pending = []
+
+        for i, content in enumerate(contents):
+            if len(content) < 100:
+                continue
+
+            cached = self._cache_get(
+                "extraction", *self._extraction_cache_parts(content, desire)
+            )
+            if cached is not None:
+                results[i] = self._parse_product(cached, desire)
+            else:
+                pending.append(i)
+
+        return results, pending
+
+    def _pack_extraction_batches(
+        self, contents: list[str], pending: list[int]
+    ) -> list[list[int]]:
+        """
+        抽出対象ページをトークン予算内のバッチに分割
+
+        Args:
+            contents: 全ページのコンテンツ
+            pending: 抽出が必要なページのインデックス
+
+        Returns:
+            ページインデックスのバッチのリスト
+        """
+        max_pages = max(1, settings.extraction_batch_size)
+        budget = settings.extraction_batch_token_budget * CHARS_PER_TOKEN
+
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_chars = 0
+
+        for index in pending:
+            size = min(len(contents[index]), MAX_CONTENT_LENGTH)
+            if current and (
+                len(current) >= max_pages or current_chars + size > budget
+            ):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(index)
+            current_chars += size
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _apply_batch_extraction(
+        self,
+        contents: list[str],
+        batch: list[int],
+        response_text: str,
+        desire: str,
+        results: list[Optional[Product] | Exception],
+    ) -> list[int]:
+        """
+        一括抽出の応答をページごとの結果に反映
+
+        Returns:
+            応答から結果を得られなかったページのインデックス
+        """
+        items: dict[int, dict] = {}
+        try:
+            for item in json.loads(response_text).get("results", []):
+                items[int(item["page"])] = item
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError):
+            if response_text:
+                logger.warning("一括抽出の解析失敗、単一ページ抽出にフォールバック")
+
+        failed = []
+        for position, index in enumerate(batch, 1):
+            item = items.get(position)
+            if not isinstance(item, dict) or "found" not in item:
+                failed.append(index)
+                continue
+
+            item_text = json.dumps(
+                {k: v for k, v in item.items() if k != "page"}, ensure_ascii=False
+            )
+            self._cache_extraction(
+                self._extraction_cache_parts(contents[index], desire), item_text, desire
+            )
+            results[index] = self._parse_product(item_text, desire)
+
+        return failed
+
+    def _build_batch_extraction_prompt(
+        self, contents: list[str], batch: list[int], desire: str
+    ) -> str:
+        """複数ページ一括抽出用プロンプトを構築"""
+        pages = "\n\n".join(
+            f"### PAGE {position}\n{contents[index][:MAX_CONTENT_LENGTH]}"
+            for position, index in enumerate(batch, 1)
+        )
+
+        return f"""
+以下の複数のWebページコンテンツから、ページごとに製品情報を抽出してください。
+
+## ユーザーの欲求
+{desire}
+
+## Webページコンテンツ（{len(batch)}ページ）
+{pages}
+
+## 指示
+1. 各ページについて、製品情報が見つかった場合は詳細を抽出してください
+2. 製品の欲求への適合度を0-10で評価してください
+3. 価格情報があれば、通貨と金額を抽出してください
+4. 公式サイト、Amazon、楽天、InstagramのURLがあれば抽出してください
+5. 製品情報が見つからないページは found=false としてください
+6. 全ページ分の結果を、page にページ番号を入れて返してください
+
+以下のJSON形式で回答してください：
+{{
+    "results": [
+        {{
+            "page": 1,
+            "found": true,
+            "name": "製品名",
+            "brand": "ブランド名",
+            "description": "製品説明",
+            "price": {{
+                "amount": 1000,
+                "currency": "JPY",
+                "formatted": "¥1,000"
+            }},
+            "official_url": "https://example.com",
+            "amazon_url": null,
+            "rakuten_url": null,
+            "instagram_url": null,
+            "relevance_score": 8,
+            "reasoning": "評価理由"
+        }},
+        {{"page": 2, "found": false}}
+    ]
+}}
+"""
+
+    def _build_extraction_prompt(self, content: str, desire: str) -> str:
+        """製品抽出用プロンプトを構築"""
+        truncated_content = content[:MAX_CONTENT_LENGTH]
 
-        prompt = f"""
+        return f"""
 以下のWebページコンテンツから、製品情報を抽出してください。
 
 ## ユーザーの欲求
@@ -214,16 +704,10 @@ class GeminiClient(LLMClient):
 }}
 """
 
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-            ),
-        )
-
+    def _parse_product(self, response_text: str, desire: str) -> Optional[Product]:
+        """製品抽出レスポンスを Product に変換"""
         try:
-            result = json.loads(response.text)
+            result = json.loads(response_text)
 
             if not result.get("found", False):
                 return None
@@ -257,6 +741,377 @@ class GeminiClient(LLMClient):
             logger.warning(f"製品抽出の解析失敗: {e}")
             return None
 
+    def extract_product_info(self, content: str) -> Optional[Product]:
+        """
+        欲求に依存しない製品情報を抽出（二段階抽出の第1段階）
+
+        製品名・ブランド・価格・URLのみを抽出し、適合度は評価しない。
+        結果はページ内容のハッシュ単位でキャッシュされ、欲求が異なる
+        ハントでも再利用される。
+
+        Args:
+            content: 解析対象のMarkdownコンテンツ
+
+        Returns:
+            製品情報（relevance_score=0）、または None
+        """
+        if len(content) < 100:
+            logger.debug("コンテンツが短すぎるためスキップ")
+            return None
+
+        cache_parts = self._product_info_cache_parts(content)
+        cached = self._cache_get("product_info", *cache_parts)
+        if cached is not None:
+            return self._parse_product(cached, desire="")
+
+        response_text = self._generate_json(self._build_product_info_prompt(content))
+        self._cache_product_info(cache_parts, response_text)
+        return self._parse_product(response_text, desire="")
+
+    async def extract_product_info_async(self, content: str) -> Optional[Product]:
+        """
+        欲求に依存しない製品情報を抽出（非同期版）
+
+        Args:
+            content: 解析対象のMarkdownコンテンツ
+
+        Returns:
+            製品情報（relevance_score=0）、または None
+        """
+        if len(content) < 100:
+            logger.debug("コンテンツが短すぎるためスキップ")
+            return None
+
+        cache_parts = self._product_info_cache_parts(content)
+        cached = self._cache_get("product_info", *cache_parts)
+        if cached is not None:
+            return self._parse_product(cached, desire="")
+
+        response_text = await self._generate_json_async(
+            self._build_product_info_prompt(content)
+        )
+        self._cache_product_info(cache_parts, response_text)
+        return self._parse_product(response_text, desire="")
+
+    def score_products(
+        self, products: list[Product], desire: str
+    ) -> list[tuple[int, str]]:
+        """
+        製品の欲求への適合度を一括評価（二段階抽出の第2段階）
+
+        ページ本文ではなく抽出済みの製品情報だけを送るため、抽出よりも
+        大幅に小さいプロンプトで済む。評価済みの (製品, 欲求) の組は
+        キャッシュから返し、未評価の製品のみを batch_size 件ずつ送る。
+
+        Args:
+            products: 評価対象の製品リスト
+            desire: ユーザーの欲求
+
+        Returns:
+            products と同じ順序の (適合度, 評価理由) のリスト
+        """
+        scores, pending = self._lookup_scores(products, desire)
+
+        batch_size = max(1, settings.scoring_batch_size)
+        for i in range(0, len(pending), batch_size):
+            chunk = pending[i : i + batch_size]
+            prompt = self._build_scoring_prompt([products[j] for j in chunk], desire)
+            try:
+                response_text = self._generate_json(prompt)
+            except Exception as e:
+                logger.error(f"適合度評価エラー: {e}")
+                continue
+            self._apply_scores(products, chunk, response_text, desire, scores)
+
+        return [score or (0, "") for score in scores]
+
+    async def score_products_async(
+        self, products: list[Product], desire: str
+    ) -> list[tuple[int, str]]:
+        """
+        製品の欲求への適合度を一括評価（非同期版）
+
+        Args:
+            products: 評価対象の製品リスト
+            desire: ユーザーの欲求
+
+        Returns:
+            products と同じ順序の (適合度, 評価理由) のリスト
+        """
+        scores, pending = self._lookup_scores(products, desire)
+
+        batch_size = max(1, settings.scoring_batch_size)
+        chunks = [
+            pending[i : i + batch_size] for i in range(0, len(pending), batch_size)
+        ]
+        responses = await asyncio.gather(
+            *(
+                self._generate_json_async(
+                    self._build_scoring_prompt([products[j] for j in chunk], desire)
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+
+        for chunk, response_text in zip(chunks, responses):
+            if isinstance(response_text, Exception):
+                logger.error(f"適合度評価エラー: {response_text}")
+                continue
+            self._apply_scores(products, chunk, response_text, desire, scores)
+
+        return [score or (0, "") for score in scores]
+
+    def score_relevance(self, product: Product, desire: str) -> tuple[int, str]:
+        """
+        単一製品の欲求への適合度を評価
+
+        Args:
+            product: 評価対象の製品
+            desire: ユーザーの欲求
+
+        Returns:
+            (適合度, 評価理由)
+        """
+        return self.score_products([product], desire)[0]
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Gemini API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    def _generate_json(self, prompt: str) -> str:
+        """プロンプトを送信してJSON応答テキストを返す"""
+        response = self._generate(prompt)
+        return response.text
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_within_budget(wait_exponential_jitter(initial=1, max=30)),
+        retry=retry_if_not_exception_type(BudgetExceeded),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Gemini API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def _generate_json_async(self, prompt: str) -> str:
+        """プロンプトを送信してJSON応答テキストを返す（非同期版）"""
+        response = await self._generate_async(prompt)
+        return response.text
+
+    def _product_info_cache_parts(self, content: str) -> tuple[str, ...]:
+        """製品情報キャッシュのキー要素を生成"""
+        content_hash = hashlib.sha256(
+            content[:MAX_CONTENT_LENGTH].encode("utf-8")
+        ).hexdigest()
+        return content_hash, PRODUCT_INFO_PROMPT_VERSION
+
+    def _cache_product_info(
+        self, cache_parts: tuple[str, ...], response_text: str
+    ) -> None:
+        """製品情報応答をキャッシュ（欲求に依存しないためタグなし）"""
+        if not self.cache:
+            return
+        try:
+            json.loads(response_text)
+        except (json.JSONDecodeError, TypeError):
+            return
+        self.cache.set(
+            "product_info", self.model_name, *cache_parts, value=response_text
+        )
+
+    def _build_product_info_prompt(self, content: str) -> str:
+        """欲求非依存の製品情報抽出プロンプトを構築"""
+        truncated_content = content[:MAX_CONTENT_LENGTH]
+
+        return f"""
+以下のWebページコンテンツから、製品情報を抽出してください。
+
+## Webページコンテンツ
+{truncated_content}
+
+## 指示
+1. ページの主な製品について、詳細を抽出してください
+2. 価格情報があれば、通貨と金額を抽出してください
+3. 公式サイト、Amazon、楽天、InstagramのURLがあれば抽出してください
+4. description は製品の用途・特徴がわかるよう具体的に記述してください
+5. 製品情報が見つからない場合は、found=false を返してください
+
+以下のJSON形式で回答してください：
+{{
+    "found": true,
+    "name": "製品名",
+    "brand": "ブランド名",
+    "description": "製品説明",
+    "price": {{
+        "amount": 1000,
+        "currency": "JPY",
+        "formatted": "¥1,000"
+    }},
+    "official_url": "https://example.com",
+    "amazon_url": null,
+    "rakuten_url": null,
+    "instagram_url": null
+}}
+
+製品が見つからない場合：
+{{
+    "found": false
+}}
+"""
+
+    def _score_cache_parts(self, product: Product, desire: str) -> tuple[str, ...]:
+        """適合度キャッシュのキー要素を生成"""
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [
+                    product.name,
+                    product.brand,
+                    product.description,
+                    product.price.formatted if product.price else "",
+                ],
+                ensure_ascii=False,
+            ).encode("utf-8")
+        ).hexdigest()
+        return fingerprint, desire, SCORING_PROMPT_VERSION
+
+    def _lookup_scores(
+        self, products: list[Product], desire: str
+    ) -> tuple[list[Optional[tuple[int, str]]], list[int]]:
+        """
+        キャッシュ済みの適合度を取得
+
+        Returns:
+            (製品ごとの評価結果（未評価は None）, 未評価製品のインデックス)
+        """
+        scores: list[Optional[tuple[int, str]]] = []
+        pending = []
+
+        for i, product in enumerate(products):
+            cached = self._cache_get(
+                "relevance", *self._score_cache_parts(product, desire)
+            )
+            if cached is not None:
+                scores.append((cached["relevance_score"], cached["reasoning"]))
+            else:
+                scores.append(None)
+                pending.append(i)
+
+        return scores, pending
+
+    def _apply_scores(
+        self,
+        products: list[Product],
+        chunk: list[int],
+        response_text: str,
+        desire: str,
+        scores: list[Optional[tuple[int, str]]],
+    ) -> None:
+        """評価応答を scores に反映し、キャッシュに保存"""
+        try:
+            items = json.loads(response_text).get("scores", [])
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"適合度評価の解析失敗: {e}")
+            return
+
+        for item in items:
+            try:
+                position = int(item["index"]) - 1
+                score = max(0, min(10, int(item.get("relevance_score", 0))))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            if not 0 <= position < len(chunk):
+                continue
+
+            index = chunk[position]
+            reasoning = str(item.get("reasoning", ""))
+            scores[index] = (score, reasoning)
+            self._cache_set(
+                "relevance",
+                *self._score_cache_parts(products[index], desire),
+                value={"relevance_score": score, "reasoning": reasoning},
+                desire=desire,
+            )
+
+    def _build_scoring_prompt(self, products: list[Product], desire: str) -> str:
+        """適合度評価プロンプトを構築"""
+        lines = []
+        for i, product in enumerate(products, 1):
+            price = product.price.formatted if product.price else "不明"
+            lines.append(
+                f"[{i}] {product.name} / {product.brand or '不明'} / 価格: {price}\n"
+                f"    {product.description[:300]}"
+            )
+        product_list = "\n".join(lines)
+
+        return f"""
+以下の各製品について、ユーザーの欲求への適合度を0-10で評価してください。
+
+## ユーザーの欲求
+{desire}
+
+## 製品一覧
+{product_list}
+
+以下のJSON形式で、全製品分を回答してください：
+{{
+    "scores": [
+        {{"index": 1, "relevance_score": 8, "reasoning": "評価理由"}}
+    ]
+}}
+"""
+
+    def _generate(self, contents: str) -> types.GenerateContentResponse:
+        """
+        JSON出力でコンテンツを生成
+
+        ハントの予算（LLMトークン・締め切り）を確認してから送信し、
+        消費したトークン数を予算に記録する。
+
+        Args:
+            contents: プロンプト
+
+        Returns:
+            Gemini APIの応答
+
+        Raises:
+            BudgetExceeded: 予算を使い切っている場合（リトライしない）
+        """
+        check_budget(LLM_TOKENS)
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=self._json_config(),
+        )
+        self._charge_tokens(response)
+        return response
+
+    async def _generate_async(self, contents: str) -> types.GenerateContentResponse:
+        """JSON出力でコンテンツを生成（非同期版）"""
+        check_budget(LLM_TOKENS)
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=self._json_config(),
+        )
+        self._charge_tokens(response)
+        return response
+
+    @staticmethod
+    def _charge_tokens(response: types.GenerateContentResponse) -> None:
+        """応答の usage_metadata から消費トークン数を予算に記録"""
+        usage = getattr(response, "usage_metadata", None)
+        charge_budget(LLM_TOKENS, getattr(usage, "total_token_count", None) or 0)
+
+    def _json_config(self) -> types.GenerateContentConfig:
+        """JSON出力用の生成設定"""
+        return types.GenerateContentConfig(
+            response_mime_type="application/json",
+        )
+
     def generate_search_queries(
         self, desire: str, languages: list[str]
     ) -> list[TranslatedQuery]:
@@ -270,27 +1125,96 @@ class GeminiClient(LLMClient):
         Returns:
             TranslatedQuery のリスト
         """
+        cached = self._cache_get("search_queries", desire, languages)
+        if cached is not None:
+            return [TranslatedQuery.model_validate(q) for q in cached]
+
         queries = []
         for lang in languages:
             try:
                 query = self.translate(desire, lang)
-                queries.append(
-                    TranslatedQuery(
-                        original=desire,
-                        language=lang,
-                        query=query,
-                        search_intent=f"Product search for: {desire}",
-                    )
-                )
+                queries.append(self._make_query(desire, lang, query))
             except Exception as e:
                 logger.error(f"翻訳エラー ({lang}): {e}")
-                queries.append(
-                    TranslatedQuery(
-                        original=desire,
-                        language=lang,
-                        query=desire,
-                        search_intent="",
-                    )
-                )
+                queries.append(self._make_query(desire, lang, None))
+
+        self._cache_queries(desire, languages, queries)
+        return queries
+
+    async def generate_search_queries_async(
+        self, desire: str, languages: list[str]
+    ) -> list[TranslatedQuery]:
+        """
+        欲求から複数言語の検索クエリを生成（非同期版）
+
+        全言語の翻訳を並行して実行する。
+
+        Args:
+            desire: ユーザーの欲求
+            languages: 対象言語コードのリスト
+
+        Returns:
+            TranslatedQuery のリスト
+        """
+        cached = self._cache_get("search_queries", desire, languages)
+        if cached is not None:
+            return [TranslatedQuery.model_validate(q) for q in cached]
 
+        translations = await asyncio.gather(
+            *(self.translate_async(desire, lang) for lang in languages),
+            return_exceptions=True,
+        )
+
+        queries = []
+        for lang, query in zip(languages, translations):
+            if isinstance(query, Exception):
+                logger.error(f"翻訳エラー ({lang}): {query}")
+                queries.append(self._make_query(desire, lang, None))
+                continue
+
+            queries.append(self._make_query(desire, lang, query))
+
+        self._cache_queries(desire, languages, queries)
         return queries
+
+    def _make_query(
+        self, desire: str, language: str, query: Optional[str]
+    ) -> TranslatedQuery:
+        """
+        TranslatedQuery を生成
+
+        Args:
+            desire: ユーザーの欲求
+            language: 言語コード
+            query: 翻訳されたクエリ（翻訳失敗時は None で元の欲求を使う）
+
+        Returns:
+            TranslatedQuery
+        """
+        if query is None:
+            return TranslatedQuery(
+                original=desire,
+                language=language,
+                query=desire,
+                search_intent="",
+            )
+
+        return TranslatedQuery(
+            original=desire,
+            language=language,
+            query=query,
+            search_intent=f"Product search for: {desire}",
+        )
+
+    def _cache_queries(
+        self, desire: str, languages: list[str], queries: list[TranslatedQuery]
+    ) -> None:
+        """検索クエリをキャッシュ（翻訳失敗を含む場合は保存しない）"""
+        if all(q.search_intent for q in queries):
+            self._cache_set(
+                "search_queries",
+                desire,
+                languages,
+                value=[q.model_dump() for q in queries],
+                desire=desire,
+            )
@@ -0,0 +1,322 @@
+"""
+HTML→テキスト変換
+
+フォールバックスクレイピング用のストリーミング抽出器。
+受信したチャンクを順にパースし、本文テキストが上限文字数に達するか
+バイト数上限を超えた時点でダウンロードを打ち切れるようにする。
+"""
+
+import codecs
+import logging
+import re
+from html.parser import HTMLParser
+from typing import AsyncIterable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 中身をテキストとして扱わない要素（ネストしていても閉じタグまでスキップ）
+SKIP_TAGS = {
+    "script",
+    "style",
+    "head",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "canvas",
+    "nav",
+    "footer",
+}
+
+# 閉じタグを持たない要素（タグスタックに積まない）
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+# 前後で改行するブロック要素
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+
+CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+HEADER_CHARSET_PATTERN = re.compile(r"charset=([\w-]+)", re.IGNORECASE)
+
+# 文字コード判定のために溜める先頭バイト数
+SNIFF_BYTES = 1024
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    タグスタックを持つHTML→テキスト抽出器
+
+    script/style/nav 等の内側はネストや閉じ忘れがあってもスキップし、
+    hidden 属性や aria-hidden="true" の要素も除外する。
+    max_chars に達したら done になり、以降のデータは無視する。
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.lines: list[str] = []
+        self.char_count = 0
+        self._line: list[str] = []
+        self._stack: list[tuple[str, bool]] = []  # (タグ名, スキップ対象か)
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        """必要な文字数を集め終えたか"""
+        return self.max_chars is not None and self.char_count >= self.max_chars
+
+    def _flush_line(self) -> None:
+        """組み立て中の行を確定"""
+        line = " ".join("".join(self._line).split())
+        self._line = []
+        if line and not self.done:
+            self.lines.append(line)
+            self.char_count += len(line) + 1
+
+    def _push(self, tag: str, skip: bool) -> None:
+        self._stack.append((tag, skip))
+        if skip:
+            self._skip_depth += 1
+
+    def _pop_to(self, tag: str) -> None:
+        """tag までスタックを巻き戻す（閉じ忘れの子要素もまとめて閉じる）"""
+        if not any(name == tag for name, _ in self._stack):
+            return
+        while self._stack:
+            name, skip = self._stack.pop()
+            if skip:
+                self._skip_depth -= 1
+            if name == tag:
+                break
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush_line()
+        if tag in VOID_TAGS:
+            return
+        if tag == "body":
+            self._pop_to("head")  # </head> が省略されている場合
+
+        attributes = dict(attrs)
+        hidden = "hidden" in attributes or attributes.get("aria-hidden") == "true"
+        self._push(tag, tag in SKIP_TAGS or hidden)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_endtag(self, tag):
+        self._pop_to(tag)
+        if tag in BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        # チャンクの境目で分割された語をつなげるため、空白の正規化は行の確定時に行う
+        self._line.append(data)
+
+    def get_text(self) -> str:
+        """抽出したテキストを取得"""
+        self._flush_line()
+        text = "\n".join(self.lines)
+        return text[: self.max_chars] if self.max_chars else text
+
+
+def html_to_text(html: str, max_chars: Optional[int] = None) -> str:
+    """
+    HTML文字列からテキストを抽出
+
+    Args:
+        html: HTML文字列
+        max_chars: 抽出する最大文字数（None で無制限）
+
+    Returns:
+        抽出したテキスト
+    """
+    extractor = StreamingTextExtractor(max_chars)
+    extractor.feed(html)
+    return extractor.get_text()
+
+
+def _detect_encoding(content_type: str, head: bytes) -> str:
+    """Content-Type ヘッダーまたは先頭の <meta charset> から文字コードを決める"""
+    match = HEADER_CHARSET_PATTERN.search(content_type or "")
+    if not match:
+        match = CHARSET_PATTERN.search(head)
+    if match:
+        encoding = match.group(1)
+        encoding = encoding.decode("ascii") if isinstance(encoding, bytes) else encoding
+        try:
+            codecs.lookup(encoding)
+            return encoding
+        except LookupError:
+            logger.debug(f"不明な文字コード: {encoding}")
+    return "utf-8"
+
+
+class _ChunkFeeder:
+    """バイト列チャンクをデコードして抽出器に流し込む"""
+
+    def __init__(
+        self,
+        content_type: str,
+        max_chars: int,
+        max_bytes: int,
+        structured_parser: Optional[HTMLParser] = None,
+    ):
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.extractor = StreamingTextExtractor(max_chars)
+        self.structured_parser = structured_parser
+        self.received_bytes = 0
+        self._decoder = None
+        self._head = b""  # 文字コード判定用に溜める先頭部分
+
+    def _decode(self, chunk: bytes, final: bool = False) -> str:
+        """先頭 SNIFF_BYTES を溜めて文字コードを判定してからデコード"""
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < SNIFF_BYTES and not final:
+                return ""
+            encoding = _detect_encoding(self.content_type, self._head)
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            chunk, self._head = self._head, b""
+        return self._decoder.decode(chunk, final=final)
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        チャンクを処理
+
+        本文が上限文字数に達した後も、構造化データのパーサが製品情報を
+        読み終える（done が真になる）か </body> に達するまでは受信を続ける
+        （JSON-LD は <body> の末尾に置かれることが多い）。
+
+        Returns:
+            続きを受信する必要があれば True
+        """
+        self.received_bytes += len(chunk)
+        self._feed_text(self._decode(chunk))
+
+        if self.received_bytes >= self.max_bytes:
+            logger.debug(f"受信バイト数の上限に到達: {self.received_bytes}バイト")
+            return False
+        return not self.extractor.done or not self._structured_done()
+
+    def _structured_done(self) -> bool:
+        """構造化データのパーサがこれ以上の入力を必要としないか"""
+        if self.structured_parser is None:
+            return True
+        return getattr(self.structured_parser, "done", False)
+
+    def _feed_text(self, text: str) -> None:
+        # 上限に達した抽出器にはパースさせない
+        if not self.extractor.done:
+            self.extractor.feed(text)
+        if self.structured_parser is not None:
+            self.structured_parser.feed(text)
+
+    def get_text(self) -> str:
+        self._feed_text(self._decode(b"", final=True))
+        return self.extractor.get_text()
+
+
+def extract_text_from_chunks(
+    chunks: Iterable[bytes],
+    content_type: str,
+    max_chars: int,
+    max_bytes: int,
+    structured_parser: Optional[HTMLParser] = None,
+) -> str:
+    """
+    受信中のレスポンスからテキストを抽出（必要量に達したら打ち切る）
+
+    Args:
+        chunks: レスポンス本文のチャンク
+        content_type: Content-Type ヘッダー
+        max_chars: 抽出する最大文字数
+        max_bytes: 受信する最大バイト数
+        structured_parser: 同じHTMLを並行して流し込むパーサ（構造化データ収集用）
+
+    Returns:
+        抽出したテキスト
+    """
+    feeder = _ChunkFeeder(content_type, max_chars, max_bytes, structured_parser)
+    for chunk in chunks:
+        if chunk and not feeder.feed(chunk):
+            break
+    return feeder.get_text()
+
+
+async def extract_text_from_chunks_async(
+    chunks: AsyncIterable[bytes],
+    content_type: str,
+    max_chars: int,
+    max_bytes: int,
+    structured_parser: Optional[HTMLParser] = None,
+) -> str:
+    """
+    受信中のレスポンスからテキストを抽出（非同期版）
+
+    Args:
+        chunks: レスポンス本文のチャンク
+        content_type: Content-Type ヘッダー
+        max_chars: 抽出する最大文字数
+        max_bytes: 受信する最大バイト数
+        structured_parser: 同じHTMLを並行して流し込むパーサ（構造化データ収集用）
+
+    Returns:
+        抽出したテキスト
+    """
+    feeder = _ChunkFeeder(content_type, max_chars, max_bytes, structured_parser)
+    async for chunk in chunks:
+        if chunk and not feeder.feed(chunk):
+            break
+    return feeder.get_text()
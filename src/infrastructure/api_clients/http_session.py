@@ -0,0 +1,187 @@
+"""
+共有HTTPセッション
+
+Serper検索やフォールバックスクレイピングで使うHTTP接続をプールし、
+keep-alive で TCP/TLS ハンドシェイクを使い回す。
+同期側はプロセス共有の requests.Session、非同期側は httpx.AsyncClient
+（h2 パッケージがあれば HTTP/2）を同じ設定で生成する。
+"""
+
+import logging
+import threading
+from typing import Any, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _AsyncConnectionStats:
+    """httpx の trace 拡張で新規接続・TLSハンドシェイクを数える"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.connection_count = 0
+        self.tls_handshake_count = 0
+        self.http2_count = 0
+
+    async def trace(self, event_name: str, info: dict) -> None:
+        """httpcore から呼ばれるトレースコールバック"""
+        with self._lock:
+            if event_name == "connection.connect_tcp.complete":
+                self.connection_count += 1
+            elif event_name == "connection.start_tls.complete":
+                self.tls_handshake_count += 1
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """リクエスト送信前フック（trace を差し込む）"""
+        request.extensions["trace"] = self.trace
+        with self._lock:
+            self.request_count += 1
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """レスポンス受信フック（HTTPバージョンを記録）"""
+        if response.http_version == "HTTP/2":
+            with self._lock:
+                self.http2_count += 1
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.request_count,
+                "connections": self.connection_count,
+                "tls_handshakes": self.tls_handshake_count,
+                "http2_responses": self.http2_count,
+                "reuse_rate": _reuse_rate(self.request_count, self.connection_count),
+            }
+
+
+_async_stats = _AsyncConnectionStats()
+
+
+def _reuse_rate(requests_count: int, connections: int) -> str:
+    """接続再利用率（既存接続で処理したリクエストの割合）"""
+    if requests_count == 0:
+        return "0.0%"
+    reused = max(0, requests_count - connections)
+    return f"{reused / requests_count * 100:.1f}%"
+
+
+def _http2_available() -> bool:
+    """HTTP/2 が有効かつ h2 パッケージが使えるか"""
+    if not settings.http2_enabled:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.debug("h2 がインストールされていないため HTTP/1.1 を使用します")
+        return False
+    return True
+
+
+def get_session() -> requests.Session:
+    """
+    プロセス共有の requests.Session を取得
+
+    接続プールのサイズは HTTP_POOL_CONNECTIONS（ホスト数）と
+    HTTP_POOL_MAXSIZE（ホストあたりの接続数）で設定する。
+
+    Returns:
+        共有の requests.Session
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=settings.http_pool_connections,
+                pool_maxsize=settings.http_pool_maxsize,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def create_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    接続プール設定済みの httpx.AsyncClient を生成
+
+    AsyncClient はイベントループに紐づくため共有せず、
+    呼び出し側で生成して aclose() で閉じる。
+
+    Args:
+        **kwargs: httpx.AsyncClient に渡す追加引数（timeout, headers 等）
+
+    Returns:
+        httpx.AsyncClient
+    """
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_pool_maxsize,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=_http2_available(),
+        event_hooks={
+            "request": [_async_stats.on_request],
+            "response": [_async_stats.on_response],
+        },
+        **kwargs,
+    )
+
+
+def _session_statistics() -> dict:
+    """requests.Session の urllib3 接続プールから再利用状況を集計"""
+    with _session_lock:
+        session = _session
+    if session is None:
+        return {"requests": 0, "connections": 0, "reuse_rate": "0.0%", "hosts": {}}
+
+    hosts = {}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[pool.host] = {
+                "requests": pool.num_requests,
+                "connections": pool.num_connections,
+            }
+
+    total_requests = sum(h["requests"] for h in hosts.values())
+    total_connections = sum(h["connections"] for h in hosts.values())
+    return {
+        "requests": total_requests,
+        "connections": total_connections,
+        "reuse_rate": _reuse_rate(total_requests, total_connections),
+        "hosts": hosts,
+    }
+
+
+def get_http_statistics() -> dict:
+    """
+    HTTP接続の再利用統計を取得
+
+    connections がリクエスト数より十分小さければ、
+    ハンドシェイクが複数リクエストで共有できている。
+
+    Returns:
+        統計情報の辞書（sync: requests.Session, async: httpx）
+    """
+    return {
+        "sync": _session_statistics(),
+        "async": _async_stats.get_statistics(),
+    }
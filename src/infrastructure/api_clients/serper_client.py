@@ -8,8 +8,8 @@ Google検索結果を取得するためのクライアント。
 import logging
 from typing import Optional
 
+import httpx
 import requests
-from ratelimit import limits, sleep_and_retry
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -19,13 +19,53 @@ from tenacity import (
 
 from src.core.config import settings
 from src.core.interfaces import SearchClient
+from src.domain.hunt_budget import (
+    SERPER_CALLS,
+    acquire_within_budget,
+    acquire_within_budget_async,
+    charge_budget,
+    wait_within_budget,
+)
 from src.domain.models import SearchResult
+from src.infrastructure.api_clients.http_session import (
+    create_async_client,
+    get_session,
+)
+from src.infrastructure.cache.search_cache import SearchCache
+from src.infrastructure.rate_limit.adaptive import (
+    RateLimited,
+    parse_exhausted_window,
+    parse_retry_after,
+    wait_rate_limited,
+)
+from src.infrastructure.rate_limit.registry import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 # Serper API エンドポイント
 SERPER_API_URL = "https://google.serper.dev/search"
 
+# 言語コードをGoogle検索のフォーマットに変換
+GL_MAPPING = {
+    "en": "us",
+    "zh": "cn",
+    "de": "de",
+    "ja": "jp",
+    "fr": "fr",
+    "es": "es",
+    "ko": "kr",
+}
+
+HL_MAPPING = {
+    "en": "en",
+    "zh": "zh-cn",
+    "de": "de",
+    "ja": "ja",
+    "fr": "fr",
+    "es": "es",
+    "ko": "ko",
+}
+
 
 class SerperClient(SearchClient):
     """
@@ -35,25 +75,209 @@ class SerperClient(SearchClient):
     レート制限とリトライ機能を備える。
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[SearchCache] = None,
+    ):
         self.api_key = api_key or settings.serper_api_key
-        self.rate_limit = settings.serper_rate_limit
+        self.rate_limiter = get_rate_limiter("serper", "search")
+        if cache is None and settings.search_cache_enabled:
+            cache = SearchCache()
+        self.cache = cache
+        self.session = get_session()
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _build_headers(self) -> dict[str, str]:
+        """リクエストヘッダーを構築"""
+        return {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json",
+        }
+
+    def _build_payload(
+        self, query: str, num_results: int, language: Optional[str] = None
+    ) -> dict:
+        """
+        リクエストペイロードを構築
+
+        Args:
+            query: 検索クエリ
+            num_results: 取得する結果数
+            language: 言語コード（指定時は gl/hl を付与）
+
+        Returns:
+            ペイロードの辞書
+        """
+        payload = {
+            "q": query,
+            "num": min(num_results, 100),  # 最大100件
+        }
+
+        if language is not None:
+            payload["gl"], payload["hl"] = self._locale(language)
+
+        return payload
+
+    def _locale(self, language: Optional[str]) -> tuple[str, str]:
+        """言語コードを (gl, hl) に変換（言語指定なしは空文字）"""
+        if language is None:
+            return "", ""
+        return GL_MAPPING.get(language, "us"), HL_MAPPING.get(language, "en")
+
+    def _get_cached(
+        self, query: str, num_results: int, language: Optional[str] = None
+    ) -> Optional[list[SearchResult]]:
+        """キャッシュから検索結果を取得"""
+        if not self.cache:
+            return None
+        gl, hl = self._locale(language)
+        return self.cache.get(query, min(num_results, 100), gl, hl)
+
+    def _store_cached(
+        self,
+        query: str,
+        num_results: int,
+        results: list[SearchResult],
+        language: Optional[str] = None,
+    ) -> None:
+        """検索結果をキャッシュに保存（空の結果はエラーの可能性があるため保存しない）"""
+        if not self.cache or not results:
+            return
+        gl, hl = self._locale(language)
+        self.cache.set(query, min(num_results, 100), results, gl, hl)
+
+    def _parse_results(self, data: dict) -> list[SearchResult]:
+        """
+        APIレスポンスをSearchResultのリストに変換
+
+        Args:
+            data: Serper APIのJSONレスポンス
+
+        Returns:
+            SearchResult のリスト
+        """
+        results = []
+
+        # オーガニック検索結果を処理
+        organic_results = data.get("organic", [])
+        for i, item in enumerate(organic_results):
+            result = SearchResult(
+                title=item.get("title", ""),
+                url=item.get("link", ""),
+                snippet=item.get("snippet", ""),
+                position=i + 1,
+            )
+            results.append(result)
+
+        return results
+
+    def _observe_response(self, response: requests.Response | httpx.Response) -> None:
+        """
+        レスポンスをレートリミッタに反映
+
+        429なら Retry-After に従って停止し RateLimited を送出する。
+        成功時はレートを少し戻し、残り回数が0ならリセットまで停止する。
+
+        Raises:
+            RateLimited: レート制限に到達した場合
+        """
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers)
+            self.rate_limiter.on_throttled(retry_after)
+            raise RateLimited("serper", retry_after)
+
+        if response.status_code < 400:
+            self.rate_limiter.on_success()
+            exhausted = parse_exhausted_window(response.headers)
+            if exhausted:
+                self.rate_limiter.pause(exhausted)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """非同期HTTPクライアントを取得（遅延初期化）"""
+        if self._async_client is None:
+            self._async_client = create_async_client(timeout=30)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """非同期HTTPクライアントを閉じる"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def search(self, query: str, num_results: int = 10) -> list[SearchResult]:
+        """
+        Google検索を実行
+
+        キャッシュにより多い件数の結果があればAPIを呼ばずに返す。
+
+        Args:
+            query: 検索クエリ
+            num_results: 取得する結果数（最大100）
+
+        Returns:
+            SearchResult のリスト
+        """
+        cached = self._get_cached(query, num_results)
+        if cached is not None:
+            return cached
+
+        results = self._search(query, num_results)
+        self._store_cached(query, num_results, results)
+        return results
 
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # 10回/分のレート制限
     @retry(
         stop=stop_after_attempt(5),
-        wait=wait_exponential_jitter(initial=1, max=60),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
         retry=retry_if_exception_type(
-            (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+            (requests.ConnectionError, requests.Timeout, RateLimited)
         ),
         before_sleep=lambda retry_state: logger.warning(
             f"Serper API リトライ: {retry_state.attempt_number}回目"
         ),
     )
-    def search(self, query: str, num_results: int = 10) -> list[SearchResult]:
+    def _search(self, query: str, num_results: int) -> list[SearchResult]:
+        """Serper APIで検索を実行（キャッシュなし）"""
+        if not self.api_key:
+            logger.error("Serper APIキーが設定されていません")
+            return []
+
+        acquire_within_budget(self.rate_limiter, SERPER_CALLS)
+
+        try:
+            response = self.session.post(
+                SERPER_API_URL,
+                headers=self._build_headers(),
+                json=self._build_payload(query, num_results),
+                timeout=30,
+            )
+            charge_budget(SERPER_CALLS)
+            self._observe_response(response)
+            response.raise_for_status()
+
+            results = self._parse_results(response.json())
+            logger.info(f"検索完了: '{query}' -> {len(results)}件")
+            return results
+
+        except RateLimited:
+            raise  # リトライさせる
+        except requests.HTTPError as e:
+            logger.error(f"Serper API HTTPエラー: {e}")
+            return []
+        except requests.RequestException as e:
+            logger.error(f"Serper API リクエストエラー: {e}")
+            raise  # リトライさせる
+        except Exception as e:
+            logger.error(f"Serper API 予期しないエラー: {e}")
+            return []
+
+    async def search_async(
+        self, query: str, num_results: int = 10
+    ) -> list[SearchResult]:
         """
-        Google検索を実行
+        Google検索を実行（非同期版）
 
         Args:
             query: 検索クエリ
@@ -62,53 +286,54 @@ class SerperClient(SearchClient):
         Returns:
             SearchResult のリスト
         """
+        cached = self._get_cached(query, num_results)
+        if cached is not None:
+            return cached
+
+        results = await self._search_async(query, num_results)
+        self._store_cached(query, num_results, results)
+        return results
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
+        retry=retry_if_exception_type((httpx.TransportError, RateLimited)),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Serper API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def _search_async(
+        self, query: str, num_results: int
+    ) -> list[SearchResult]:
+        """Serper APIで検索を実行（非同期版、キャッシュなし）"""
         if not self.api_key:
             logger.error("Serper APIキーが設定されていません")
             return []
 
-        headers = {
-            "X-API-KEY": self.api_key,
-            "Content-Type": "application/json",
-        }
-
-        payload = {
-            "q": query,
-            "num": min(num_results, 100),  # 最大100件
-        }
+        await acquire_within_budget_async(self.rate_limiter, SERPER_CALLS)
 
         try:
-            response = requests.post(
+            response = await self._get_async_client().post(
                 SERPER_API_URL,
-                headers=headers,
-                json=payload,
-                timeout=30,
+                headers=self._build_headers(),
+                json=self._build_payload(query, num_results),
             )
+            charge_budget(SERPER_CALLS)
+            self._observe_response(response)
             response.raise_for_status()
 
-            data = response.json()
-            results = []
-
-            # オーガニック検索結果を処理
-            organic_results = data.get("organic", [])
-            for i, item in enumerate(organic_results):
-                result = SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("link", ""),
-                    snippet=item.get("snippet", ""),
-                    position=i + 1,
-                )
-                results.append(result)
-
+            results = self._parse_results(response.json())
             logger.info(f"検索完了: '{query}' -> {len(results)}件")
             return results
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 429:
-                logger.warning("Serper API レート制限に到達")
-                raise  # リトライさせる
+        except RateLimited:
+            raise  # リトライさせる
+        except httpx.HTTPStatusError as e:
             logger.error(f"Serper API HTTPエラー: {e}")
             return []
-        except requests.RequestException as e:
+        except httpx.TransportError as e:
             logger.error(f"Serper API リクエストエラー: {e}")
             raise  # リトライさせる
         except Exception as e:
@@ -141,6 +366,9 @@ class SerperClient(SearchClient):
         """
         特定言語での検索
 
+        同じクエリ・ロケールでより多い件数の結果がキャッシュにあれば、
+        APIを呼ばずにそれを返す。
+
         Args:
             query: 検索クエリ
             language: 言語コード（en, zh, de, ja等）
@@ -149,68 +377,122 @@ class SerperClient(SearchClient):
         Returns:
             SearchResult のリスト
         """
+        cached = self._get_cached(query, num_results, language)
+        if cached is not None:
+            return cached
+
+        results = self._search_in_language(query, language, num_results)
+        self._store_cached(query, num_results, results, language)
+        return results
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
+        retry=retry_if_exception_type(RateLimited),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Serper API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    def _search_in_language(
+        self, query: str, language: str, num_results: int
+    ) -> list[SearchResult]:
+        """Serper APIで特定言語の検索を実行（キャッシュなし）"""
         if not self.api_key:
             logger.error("Serper APIキーが設定されていません")
             return []
 
-        headers = {
-            "X-API-KEY": self.api_key,
-            "Content-Type": "application/json",
-        }
-
-        # 言語コードをGoogle検索のフォーマットに変換
-        gl_mapping = {
-            "en": "us",
-            "zh": "cn",
-            "de": "de",
-            "ja": "jp",
-            "fr": "fr",
-            "es": "es",
-            "ko": "kr",
-        }
-
-        hl_mapping = {
-            "en": "en",
-            "zh": "zh-cn",
-            "de": "de",
-            "ja": "ja",
-            "fr": "fr",
-            "es": "es",
-            "ko": "ko",
-        }
-
-        payload = {
-            "q": query,
-            "num": min(num_results, 100),
-            "gl": gl_mapping.get(language, "us"),
-            "hl": hl_mapping.get(language, "en"),
-        }
+        acquire_within_budget(self.rate_limiter, SERPER_CALLS)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 SERPER_API_URL,
-                headers=headers,
-                json=payload,
+                headers=self._build_headers(),
+                json=self._build_payload(query, num_results, language),
                 timeout=30,
             )
+            charge_budget(SERPER_CALLS)
+            self._observe_response(response)
             response.raise_for_status()
 
-            data = response.json()
-            results = []
+            results = self._parse_results(response.json())
+            logger.info(f"言語検索完了 ({language}): '{query}' -> {len(results)}件")
+            return results
+
+        except RateLimited:
+            raise  # リトライさせる
+        except Exception as e:
+            logger.error(f"言語検索エラー ({language}): {e}")
+            return []
+
+    async def search_in_language_async(
+        self, query: str, language: str, num_results: int = 10
+    ) -> list[SearchResult]:
+        """
+        特定言語での検索（非同期版）
+
+        Args:
+            query: 検索クエリ
+            language: 言語コード（en, zh, de, ja等）
+            num_results: 取得する結果数
+
+        Returns:
+            SearchResult のリスト
+        """
+        cached = self._get_cached(query, num_results, language)
+        if cached is not None:
+            return cached
+
+        results = await self._search_in_language_async(query, language, num_results)
+        self._store_cached(query, num_results, results, language)
+        return results
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_within_budget(
+            wait_rate_limited(wait_exponential_jitter(initial=1, max=60))
+        ),
+        retry=retry_if_exception_type(RateLimited),
+        before_sleep=lambda retry_state: logger.warning(
+            f"Serper API リトライ: {retry_state.attempt_number}回目"
+        ),
+    )
+    async def _search_in_language_async(
+        self, query: str, language: str, num_results: int
+    ) -> list[SearchResult]:
+        """Serper APIで特定言語の検索を実行（非同期版、キャッシュなし）"""
+        if not self.api_key:
+            logger.error("Serper APIキーが設定されていません")
+            return []
+
+        await acquire_within_budget_async(self.rate_limiter, SERPER_CALLS)
 
-            organic_results = data.get("organic", [])
-            for i, item in enumerate(organic_results):
-                result = SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("link", ""),
-                    snippet=item.get("snippet", ""),
-                    position=i + 1,
-                )
-                results.append(result)
+        try:
+            response = await self._get_async_client().post(
+                SERPER_API_URL,
+                headers=self._build_headers(),
+                json=self._build_payload(query, num_results, language),
+            )
+            charge_budget(SERPER_CALLS)
+            self._observe_response(response)
+            response.raise_for_status()
 
+            results = self._parse_results(response.json())
             logger.info(f"言語検索完了 ({language}): '{query}' -> {len(results)}件")
             return results
 
+        except RateLimited:
+            raise  # リトライさせる
         except Exception as e:
             logger.error(f"言語検索エラー ({language}): {e}")
             return []
+
+    def get_cache_statistics(self) -> dict:
+        """
+        検索キャッシュの統計を取得
+
+        Returns:
+            統計情報の辞書（キャッシュ無効時は空）
+        """
+        return self.cache.get_statistics() if self.cache else {}
@@ -0,0 +1,193 @@
+"""
+LLM応答キャッシュ
+
+欲求分析・翻訳などのLLM呼び出し結果を永続化して再利用する。
+キーは「種別:SHA-256(モデル名 + 正規化した入力)」で、
+欲求ごとのタグでまとめて無効化できる。
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.config import settings
+from src.infrastructure.cache.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+# 正規化時に末尾から除去する句読点
+_TRAILING_PUNCTUATION = "。．.！!？?、,，…"
+
+
+def normalize_text(text: str) -> str:
+    """
+    キャッシュキー用にテキストを正規化
+
+    NFKC正規化（全角英数→半角など）、小文字化、空白の圧縮、
+    末尾の句読点除去を行う。「在宅勤務を快適にしたい。」と
+    「在宅勤務を快適にしたい」は同じキーになる。
+
+    Args:
+        text: 元のテキスト
+
+    Returns:
+        正規化されたテキスト
+    """
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    normalized = re.sub(r"\s+", " ", normalized).strip()
+    return normalized.rstrip(_TRAILING_PUNCTUATION).strip()
+
+
+class LLMCache:
+    """
+    LLM応答のキャッシュ
+
+    種別（namespace）ごとにヒット率を集計する。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.ttl = settings.llm_cache_ttl if ttl is None else ttl
+        self._store = SQLiteCache(
+            path=path or Path(settings.cache_dir) / "llm.sqlite3",
+            default_ttl=self.ttl,
+            max_bytes=max_bytes or settings.llm_cache_max_mb * 1024 * 1024,
+        )
+        self._stats_lock = threading.Lock()
+        self._namespace_stats: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(namespace: str, model: str, *parts: Any) -> str:
+        """
+        キャッシュキーを生成
+
+        Args:
+            namespace: 種別（"desire_analysis", "translation" 等）
+            model: モデル名
+            *parts: キーに含める入力（文字列は正規化される）
+
+        Returns:
+            キャッシュキー
+        """
+        normalized = [normalize_text(p) if isinstance(p, str) else p for p in parts]
+        raw = json.dumps([model, *normalized], ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"{namespace}:{digest}"
+
+    @staticmethod
+    def make_tag(text: str) -> str:
+        """欲求テキストから無効化用タグを生成"""
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+    def _record(self, namespace: str, hit: bool) -> None:
+        """種別ごとのヒット/ミスを記録"""
+        with self._stats_lock:
+            stats = self._namespace_stats.setdefault(
+                namespace, {"hits": 0, "misses": 0}
+            )
+            stats["hits" if hit else "misses"] += 1
+
+    def get(self, namespace: str, model: str, *parts: Any) -> Optional[Any]:
+        """
+        キャッシュ済みの応答を取得
+
+        Args:
+            namespace: 種別
+            model: モデル名
+            *parts: キーに含める入力
+
+        Returns:
+            JSONデコードされた値、または None
+        """
+        raw = self._store.get(self.make_key(namespace, model, *parts))
+        self._record(namespace, raw is not None)
+
+        if raw is None:
+            return None
+
+        logger.debug(f"LLMキャッシュヒット: {namespace}")
+        return json.loads(raw)
+
+    def set(
+        self,
+        namespace: str,
+        model: str,
+        *parts: Any,
+        value: Any,
+        tag: str = "",
+    ) -> None:
+        """
+        応答をキャッシュに保存
+
+        Args:
+            namespace: 種別
+            model: モデル名
+            *parts: キーに含める入力
+            value: 保存する値（JSONシリアライズ可能なもの）
+            tag: 無効化用タグ（make_tag の戻り値）
+        """
+        self._store.set(
+            self.make_key(namespace, model, *parts),
+            json.dumps(value, ensure_ascii=False),
+            tag=tag,
+        )
+
+    def invalidate_desire(self, desire: str) -> int:
+        """
+        欲求に関連する全エントリを削除
+
+        Args:
+            desire: 欲求テキスト（正規化して照合）
+
+        Returns:
+            削除した件数
+        """
+        count = self._store.delete_tag(self.make_tag(desire))
+        logger.info(f"LLMキャッシュ無効化: {desire} ({count}件)")
+        return count
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        種別単位で全エントリを削除
+
+        Args:
+            namespace: 種別
+
+        Returns:
+            削除した件数
+        """
+        count = self._store.delete_prefix(f"{namespace}:")
+        logger.info(f"LLMキャッシュ無効化: {namespace} ({count}件)")
+        return count
+
+    def clear(self) -> None:
+        """全キャッシュを削除"""
+        self._store.clear()
+
+    def get_statistics(self) -> dict:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            全体の統計と、種別ごとのヒット率
+        """
+        stats = self._store.get_statistics()
+
+        with self._stats_lock:
+            namespaces = {}
+            for namespace, counts in self._namespace_stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                hit_rate = counts["hits"] / lookups * 100 if lookups > 0 else 0
+                namespaces[namespace] = {**counts, "hit_rate": f"{hit_rate:.1f}%"}
+
+        stats["namespaces"] = namespaces
+        return stats
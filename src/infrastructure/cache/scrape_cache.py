@@ -0,0 +1,189 @@
+"""
+スクレイピングキャッシュ
+
+正規化したURLのハッシュをキーに、取得済みMarkdownを保存する。
+ドメインごとにTTLを変えられる（価格変動の激しいECサイトは短めに）。
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.core.config import settings
+from src.infrastructure.cache.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+# 構造化データ（JSON-LD等の解析結果）を本文と別に保存する際のキー接頭辞
+STRUCTURED_PREFIX = "structured:"
+
+# 正規化時に除去するトラッキング用クエリパラメータ
+TRACKING_PARAMS = {
+    "gclid",
+    "fbclid",
+    "yclid",
+    "msclkid",
+    "ref",
+    "ref_",
+    "tag",
+    "psc",
+    "spm",
+    "scid",
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    キャッシュキー用にURLを正規化
+
+    - スキームとホストを小文字化
+    - フラグメントを除去
+    - utm_* 等のトラッキングパラメータを除去し、残りをソート
+    - 末尾スラッシュを除去
+
+    Args:
+        url: 元のURL
+
+    Returns:
+        正規化されたURL
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ""))
+
+
+class ScrapeCache:
+    """
+    スクレイピング結果のキャッシュ
+
+    キーは正規化URLのSHA-256。値は取得したMarkdownで、
+    取得日時とともにSQLiteへ保存される。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        default_ttl: Optional[int] = None,
+        domain_ttls: Optional[dict[str, int]] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.default_ttl = (
+            settings.scrape_cache_ttl if default_ttl is None else default_ttl
+        )
+        self.domain_ttls = (
+            settings.scrape_cache_domain_ttls if domain_ttls is None else domain_ttls
+        )
+        self._store = SQLiteCache(
+            path=path or Path(settings.cache_dir) / "scrape.sqlite3",
+            default_ttl=self.default_ttl,
+            max_bytes=max_bytes or settings.scrape_cache_max_mb * 1024 * 1024,
+        )
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        """URLからキャッシュキーを生成"""
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        """
+        URLのドメインに応じたTTLを返す
+
+        サブドメインも親ドメインの設定に一致する（例: "amazon.co.jp" は
+        "www.amazon.co.jp" にも適用）。
+
+        Args:
+            url: 対象URL
+
+        Returns:
+            TTL（秒）
+        """
+        host = urlsplit(url).hostname or ""
+
+        for domain, ttl in self.domain_ttls.items():
+            domain = domain.lower()
+            if host == domain or host.endswith("." + domain):
+                return ttl
+
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        キャッシュ済みコンテンツを取得
+
+        Args:
+            url: 対象URL
+
+        Returns:
+            Markdownコンテンツ、または None
+        """
+        content = self._store.get(self.make_key(url))
+        if content is not None:
+            logger.debug(f"スクレイピングキャッシュヒット: {url}")
+        return content
+
+    def set(self, url: str, content: str) -> None:
+        """
+        コンテンツをキャッシュに保存
+
+        Args:
+            url: 対象URL
+            content: 取得したMarkdownコンテンツ
+        """
+        if not content:
+            return
+        self._store.set(self.make_key(url), content, ttl=self.ttl_for(url))
+
+    def get_structured(self, url: str) -> dict:
+        """
+        キャッシュ済みの構造化データを取得
+
+        Args:
+            url: 対象URL
+
+        Returns:
+            構造化データ（なければ空の辞書）
+        """
+        # 本文の取得でヒット/ミスを記録済みのため統計は更新しない
+        value = self._store.peek(STRUCTURED_PREFIX + self.make_key(url))
+        return json.loads(value) if value else {}
+
+    def set_structured(self, url: str, data: dict) -> None:
+        """
+        構造化データをキャッシュに保存（本文と同じTTL）
+
+        Args:
+            url: 対象URL
+            data: 構造化データ
+        """
+        self._store.set(
+            STRUCTURED_PREFIX + self.make_key(url),
+            json.dumps(data, ensure_ascii=False),
+            ttl=self.ttl_for(url),
+        )
+
+    def invalidate(self, url: str) -> bool:
+        """URLのキャッシュを削除"""
+        key = self.make_key(url)
+        self._store.delete(STRUCTURED_PREFIX + key)
+        return self._store.delete(key)
+
+    def clear(self) -> None:
+        """全キャッシュを削除"""
+        self._store.clear()
+
+    def get_statistics(self) -> dict:
+        """キャッシュ統計を取得"""
+        return self._store.get_statistics()
@@ -0,0 +1,127 @@
+"""
+検索結果キャッシュ
+
+Serper APIのレスポンスを (query, gl, hl) 単位で保存する。
+より多い件数で取得済みの結果があれば、少ない件数の要求にもそれを切り出して返す。
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+from src.core.config import settings
+from src.domain.models import SearchResult
+from src.infrastructure.cache.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    検索結果のキャッシュ
+
+    キーは (正規化クエリ, gl, hl)。値には取得時の num と結果リストを保存し、
+    要求件数 num が保存済みの num 以下であればヒットとする。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.ttl = settings.search_cache_ttl if ttl is None else ttl
+        self._store = SQLiteCache(
+            path=path or Path(settings.cache_dir) / "search.sqlite3",
+            default_ttl=self.ttl,
+            max_bytes=max_bytes or settings.search_cache_max_mb * 1024 * 1024,
+        )
+
+    @staticmethod
+    def make_key(query: str, gl: str = "", hl: str = "") -> str:
+        """検索条件からキャッシュキーを生成"""
+        normalized = " ".join(query.split()).lower()
+        raw = json.dumps([normalized, gl, hl], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str, peek: bool = False) -> Optional[dict]:
+        """保存済みエントリを読み込む（peek=True なら統計を更新しない）"""
+        raw = self._store.peek(key) if peek else self._store.get(key)
+        if raw is None:
+            return None
+
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            self._store.delete(key)
+            return None
+
+    def get(
+        self, query: str, num: int, gl: str = "", hl: str = ""
+    ) -> Optional[list[SearchResult]]:
+        """
+        キャッシュ済みの検索結果を取得
+
+        Args:
+            query: 検索クエリ
+            num: 要求する結果数
+            gl: 国コード
+            hl: 言語コード
+
+        Returns:
+            SearchResult のリスト（先頭 num 件）、または None
+        """
+        key = self.make_key(query, gl, hl)
+        entry = self._load(key, peek=True)
+
+        if entry is None or entry.get("num", 0) < num:
+            self._store.record_miss()
+            return None
+
+        # ヒットとして記録し、LRU用のアクセス日時を更新
+        self._store.get(key)
+
+        logger.debug(f"検索キャッシュヒット: '{query}' ({gl}/{hl}, num={num})")
+        return [SearchResult(**r) for r in entry["results"][:num]]
+
+    def set(
+        self,
+        query: str,
+        num: int,
+        results: list[SearchResult],
+        gl: str = "",
+        hl: str = "",
+    ) -> None:
+        """
+        検索結果をキャッシュに保存
+
+        既により多い件数のエントリがある場合は上書きしない。
+
+        Args:
+            query: 検索クエリ
+            num: 要求した結果数
+            results: 検索結果
+            gl: 国コード
+            hl: 言語コード
+        """
+        key = self.make_key(query, gl, hl)
+
+        existing = self._load(key, peek=True)
+        if existing is not None and existing.get("num", 0) > num:
+            return
+
+        value = json.dumps(
+            {"num": num, "results": [r.model_dump() for r in results]},
+            ensure_ascii=False,
+        )
+        self._store.set(key, value)
+
+    def clear(self) -> None:
+        """全キャッシュを削除"""
+        self._store.clear()
+
+    def get_statistics(self) -> dict:
+        """キャッシュ統計を取得"""
+        return self._store.get_statistics()
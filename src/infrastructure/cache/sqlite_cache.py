@@ -0,0 +1,299 @@
+"""
+SQLiteキャッシュ
+
+ローカルファイルに永続化されるキー・バリューキャッシュ。
+TTLによる期限切れと、合計サイズ上限を超えた際のLRU退避に対応。
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """
+    SQLiteを使用した永続キャッシュ
+
+    特徴:
+    - プロセス再起動後も有効
+    - エントリごとのTTL
+    - 合計サイズ上限を超えたら最終アクセスが古い順に退避（LRU）
+    - ヒット/ミス統計
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        default_ttl: int,
+        max_bytes: int,
+    ):
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                tag TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_tag ON entries(tag)")
+        self._conn.commit()
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.expired_count = 0
+        self.eviction_count = 0
+
+    def _migrate(self) -> None:
+        """旧バージョンで作成されたテーブルに不足カラムを追加"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "tag" not in columns:
+            self._conn.execute(
+                "ALTER TABLE entries ADD COLUMN tag TEXT NOT NULL DEFAULT ''"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        キャッシュから値を取得
+
+        期限切れのエントリは削除してミス扱いにする。
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされた値、または None
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[tuple[str, float]]:
+        """
+        キャッシュから値と保存日時を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            (値, 保存日時のUNIX時刻) のタプル、または None
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.miss_count += 1
+                return None
+
+            value, created_at, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expired_count += 1
+                self.miss_count += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hit_count += 1
+            return value, created_at
+
+    def peek(self, key: str) -> Optional[str]:
+        """
+        統計やアクセス日時を更新せずに値を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            有効期限内の値、または None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_miss(self) -> None:
+        """
+        ミスを記録
+
+        値は存在するが呼び出し側の条件を満たさず使えなかった場合に使用する。
+        """
+        with self._lock:
+            self.miss_count += 1
+
+    def set(
+        self, key: str, value: str, ttl: Optional[int] = None, tag: str = ""
+    ) -> None:
+        """
+        キャッシュに値を保存
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+            ttl: 有効期間（秒）。省略時は default_ttl
+            tag: まとめて無効化するためのタグ（delete_tag で使用）
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        size = len(value.encode("utf-8"))
+
+        if size > self.max_bytes:
+            logger.debug(f"キャッシュ上限を超えるため保存しません: {key} ({size}バイト)")
+            return
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (key, value, size, created_at, expires_at, accessed_at, tag)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, value, size, now, now + ttl, now, tag),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> bool:
+        """
+        エントリを削除
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            削除できた場合True
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def delete_tag(self, tag: str) -> int:
+        """
+        タグが一致するエントリを削除
+
+        Args:
+            tag: 削除対象のタグ
+
+        Returns:
+            削除した件数
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE tag = ?", (tag,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        キーが指定の接頭辞で始まるエントリを削除
+
+        Args:
+            prefix: キーの接頭辞
+
+        Returns:
+            削除した件数
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+        logger.info(f"キャッシュをクリアしました: {self.path}")
+
+    def _evict(self) -> None:
+        """期限切れエントリを削除し、サイズ上限を超えていればLRUで退避"""
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall()
+
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self.eviction_count += len(evicted)
+        logger.debug(f"キャッシュ退避: {len(evicted)}件 ({self.path.name})")
+
+    def get_statistics(self) -> dict:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+
+        lookups = self.hit_count + self.miss_count
+        hit_rate = (self.hit_count / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+            "expired": self.expired_count,
+            "evictions": self.eviction_count,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "hit_rate": f"{hit_rate:.1f}%",
+        }
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,148 @@
+"""
+レート制限レスポンスの解釈
+
+429エラーを表す RateLimited 例外と、Retry-After / RateLimit-* ヘッダーの解析、
+tenacity のリトライ待機戦略を提供する。
+"""
+
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+logger = logging.getLogger(__name__)
+
+RESET_HEADERS = ("RateLimit-Reset", "X-RateLimit-Reset", "X-Ratelimit-Reset")
+REMAINING_HEADERS = (
+    "RateLimit-Remaining",
+    "X-RateLimit-Remaining",
+    "X-Ratelimit-Remaining",
+)
+
+
+class RateLimited(Exception):
+    """プロバイダからレート制限（429）を受けた"""
+
+    def __init__(self, provider: str, retry_after: Optional[float] = None):
+        self.provider = provider
+        self.retry_after = retry_after
+        detail = f"（{retry_after:.1f}秒後に再試行）" if retry_after is not None else ""
+        super().__init__(f"{provider} レート制限{detail}")
+
+
+def _header(
+    headers: Optional[Mapping[str, str]], names: tuple[str, ...]
+) -> Optional[str]:
+    """候補名のうち最初に見つかったヘッダー値を返す"""
+    if not headers:
+        return None
+    for name in names:
+        value = headers.get(name)
+        if value:
+            return value
+    return None
+
+
+def _reset_seconds(value: str) -> Optional[float]:
+    """RateLimit-Reset の値を残り秒数に変換（Unix時刻にも対応）"""
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if seconds > 1_000_000_000:
+        seconds -= time.time()
+    return max(0.0, seconds)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    レスポンスヘッダーから再試行までの秒数を取得
+
+    Retry-After（秒数またはHTTP日付）を優先し、
+    なければ RateLimit-Reset 系のヘッダーを使う。
+
+    Args:
+        headers: レスポンスヘッダー
+
+    Returns:
+        待機秒数（ヘッダーがなければ None）
+    """
+    value = _header(headers, ("Retry-After", "retry-after"))
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            logger.debug(f"Retry-After を解析できません: {value}")
+
+    reset = _header(headers, RESET_HEADERS)
+    return _reset_seconds(reset) if reset else None
+
+
+def parse_exhausted_window(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    成功レスポンスのヘッダーから、残り回数が0の場合のリセットまでの秒数を取得
+
+    Args:
+        headers: レスポンスヘッダー
+
+    Returns:
+        リセットまでの秒数（残りがある、またはヘッダーがなければ None）
+    """
+    remaining = _header(headers, REMAINING_HEADERS)
+    if remaining is None:
+        return None
+    try:
+        if float(remaining) > 0:
+            return None
+    except ValueError:
+        return None
+
+    reset = _header(headers, RESET_HEADERS)
+    return _reset_seconds(reset) if reset else None
+
+
+def rate_limit_from_exception(error: Exception) -> tuple[bool, Optional[float]]:
+    """
+    SDKの例外がレート制限によるものか判定
+
+    status_code 属性（Firecrawl SDK）またはレスポンスのステータスで判定する。
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        (レート制限かどうか, 再試行までの秒数)
+    """
+    response: Any = getattr(error, "response", None)
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(response, "status_code", None)
+    if status != 429:
+        return False, None
+    return True, parse_retry_after(getattr(response, "headers", None))
+
+
+class wait_rate_limited(wait_base):
+    """
+    レート制限時はリトライ側で待たない tenacity 待機戦略
+
+    RateLimited の場合はレートリミッタ側で Retry-After 分の停止が
+    設定済みのため、次の試行の acquire() で待機させる。
+    それ以外のエラーは fallback の待機戦略に従う。
+    """
+
+    def __init__(self, fallback: wait_base):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        outcome = retry_state.outcome
+        if outcome is not None and isinstance(outcome.exception(), RateLimited):
+            return 0.0
+        return self.fallback(retry_state)
@@ -0,0 +1,104 @@
+"""
+レート制限レジストリ
+
+(プロバイダ, エンドポイント) ごとに共有のレートリミッタを提供する。
+同じプロセス内の全クライアント・全スレッドが同じバケットを使うため、
+クライアントを複数生成しても合計で上限を超えない。
+RATE_LIMIT_BACKEND=sqlite の場合は同じホスト上の全プロセスで共有する。
+"""
+
+import logging
+import threading
+from pathlib import Path
+
+from src.core.config import settings
+from src.infrastructure.rate_limit.sqlite_bucket import SQLiteTokenBucket
+from src.infrastructure.rate_limit.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_limiters: dict[tuple[str, str], TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def _limit_config(provider: str, endpoint: str) -> tuple[float, int]:
+    """
+    設定から (1分あたりの回数, バースト) を取得
+
+    Args:
+        provider: プロバイダ名（serper, firecrawl 等）
+        endpoint: エンドポイント名（search, scrape, map 等）
+
+    Returns:
+        (rate_per_minute, burst)
+    """
+    limits = {
+        ("serper", "search"): (settings.serper_rate_limit, settings.serper_burst),
+        ("firecrawl", "scrape"): (
+            settings.firecrawl_rate_limit,
+            settings.firecrawl_burst,
+        ),
+        ("firecrawl", "map"): (settings.firecrawl_map_rate_limit, 1),
+    }
+
+    if (provider, endpoint) not in limits:
+        raise KeyError(f"未定義のレート制限です: {provider}/{endpoint}")
+
+    return limits[(provider, endpoint)]
+
+
+def _create_bucket(name: str, rate: float, burst: int) -> TokenBucket:
+    """
+    設定されたバックエンドでトークンバケットを生成
+
+    Args:
+        name: バケット名（provider/endpoint）
+        rate: 1分あたりの回数
+        burst: バースト数
+
+    Returns:
+        TokenBucket（sqlite バックエンドなら SQLiteTokenBucket）
+    """
+    backend = settings.rate_limit_backend.lower()
+    adaptive_options = {
+        "adaptive": settings.rate_limit_adaptive,
+        "decrease_factor": settings.rate_limit_decrease_factor,
+        "increase_step": settings.rate_limit_increase_step,
+        "max_rate_per_minute": rate * settings.rate_limit_max_factor,
+    }
+
+    if backend == "sqlite":
+        path = settings.rate_limit_db or Path(settings.cache_dir) / "rate_limit.sqlite3"
+        return SQLiteTokenBucket(name, rate, burst, path=path, **adaptive_options)
+    if backend != "memory":
+        logger.warning(f"不明なレート制限バックエンド: {backend}（memoryを使用）")
+
+    return TokenBucket(name, rate, burst, **adaptive_options)
+
+
+def get_rate_limiter(provider: str, endpoint: str) -> TokenBucket:
+    """
+    プロバイダ・エンドポイントの共有レートリミッタを取得
+
+    Args:
+        provider: プロバイダ名
+        endpoint: エンドポイント名
+
+    Returns:
+        共有の TokenBucket
+    """
+    key = (provider, endpoint)
+
+    with _lock:
+        if key not in _limiters:
+            rate, burst = _limit_config(provider, endpoint)
+            _limiters[key] = _create_bucket(f"{provider}/{endpoint}", rate, burst)
+            logger.debug(f"レートリミッタ作成: {provider}/{endpoint} ({rate}回/分)")
+        return _limiters[key]
+
+
+def get_all_statistics() -> list[dict]:
+    """全レートリミッタの統計を取得"""
+    with _lock:
+        limiters = list(_limiters.values())
+    return [limiter.get_statistics() for limiter in limiters]
@@ -0,0 +1,161 @@
+"""
+プロセス間で共有するトークンバケット
+
+同じホスト上の複数プロセス（main.py --batch を並列起動した場合など）が
+SQLiteファイルを介してバケットの残量と適応制御後のレートを共有する。
+全プロセス合計で設定したレート上限に収まるように待機時間を割り当てる。
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.infrastructure.rate_limit.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    SQLiteに残量とレートを保存するトークンバケット
+
+    429によるレートの引き下げ・成功による引き上げも共有するため、
+    どのプロセスが429を受けても全プロセスの補充速度が下がる。
+    予約は BEGIN IMMEDIATE のトランザクション内で行うため、
+    複数プロセスから同時に呼ばれても残量の読み書きが競合しない。
+    時刻はプロセス間で共通の壁時計（time.time）を使う。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int = 1,
+        path: str | Path = ".cache/rate_limit.sqlite3",
+        **adaptive_options,
+    ):
+        super().__init__(name, rate_per_minute, burst, **adaptive_options)
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+            timeout=30,
+            isolation_level=None,  # トランザクションを明示的に管理する
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                rate REAL
+            )
+            """
+        )
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(buckets)")
+        }
+        if "rate" not in columns:
+            # レートを共有する前に作られたDB
+            self._conn.execute("ALTER TABLE buckets ADD COLUMN rate REAL")
+
+    def _update(
+        self,
+        change: Callable[[float], float],
+        change_rate: Optional[Callable[[float], float]] = None,
+    ) -> float:
+        """
+        共有バケットの残量を読み出し、補充してから change を適用して保存
+
+        共有のレートがあればこのプロセスのレートとして採用し、
+        change_rate があれば補充後にレートを変更して保存する。
+
+        Args:
+            change: 補充後の残量を受け取り、新しい残量を返す関数
+            change_rate: 現在のレートを受け取り、新しいレートを返す関数
+
+        Returns:
+            保存した残量
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT tokens, updated_at, rate FROM buckets WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+
+            if row is not None and row[2] is not None:
+                self.rate_per_minute = min(
+                    self.max_rate_per_minute, max(self.min_rate_per_minute, row[2])
+                )
+            if row is None:
+                available = float(self.burst)
+            else:
+                available = self._refill(row[0], max(0.0, now - row[1]))
+
+            if change_rate is not None:
+                self.rate_per_minute = change_rate(self.rate_per_minute)
+            available = change(available)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at, rate)"
+                " VALUES (?, ?, ?, ?)",
+                (self.name, available, now, self.rate_per_minute),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        return available
+
+    def _take(self, tokens: int) -> float:
+        """
+        共有バケットからトークンを差し引き、待機秒数を返す
+
+        Args:
+            tokens: 消費するトークン数
+
+        Returns:
+            待機秒数（0なら即時実行可能）
+        """
+        available = self._update(lambda current: current - tokens)
+        return 0.0 if available >= 0 else -available / self.rate_per_second
+
+    def _give_back(self, tokens: int) -> None:
+        """
+        予約したトークンを共有バケットに返却
+
+        Args:
+            tokens: 返却するトークン数
+        """
+        self._update(lambda current: current + tokens)
+
+    def _adjust_rate(self, change: Callable[[float], float]) -> None:
+        """
+        共有のレートを変更（全プロセスの補充速度が変わる）
+
+        Args:
+            change: 現在のレート（回/分）を受け取り、新しいレートを返す関数
+        """
+        self._update(lambda current: current, change_rate=change)
+
+    def _pause(self, seconds: float) -> None:
+        """
+        全プロセスで指定秒数リクエストを止める
+
+        Args:
+            seconds: 一時停止する秒数
+        """
+        floor = 1 - seconds * self.rate_per_second
+        self._update(lambda current: min(current, floor))
+
+    def close(self) -> None:
+        """DB接続を閉じる"""
+        with self._lock:
+            self._conn.close()
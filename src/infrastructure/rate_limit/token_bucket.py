@@ -0,0 +1,269 @@
+"""
+トークンバケット方式のレート制限
+
+一定速度でトークンが補充され、バケット容量（burst）までは
+連続したリクエストを即座に許可する。
+スレッドからもasyncioからも使用できる。
+
+429を受けたら補充速度を下げ（乗算的減少）、成功が続けば
+少しずつ戻す（加算的増加）AIMD方式で実際の許容量に追従する。
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 適応制御で下げられる下限（設定レートに対する割合）
+MIN_RATE_FACTOR = 0.1
+
+
+class TokenBucket:
+    """
+    スレッドセーフなトークンバケット
+
+    acquire() はトークンを「予約」してから待機するため、
+    複数のスレッド・タスクが同時に待っても到着順に間隔を空けて実行される。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int = 1,
+        adaptive: bool = False,
+        decrease_factor: float = 0.5,
+        increase_step: float = 1.0,
+        max_rate_per_minute: Optional[float] = None,
+    ):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute は正の値が必要です: {rate_per_minute}")
+
+        self.name = name
+        self.rate_per_minute = rate_per_minute
+        self.burst = max(1, burst)
+
+        # AIMD設定
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate_per_minute = rate_per_minute * MIN_RATE_FACTOR
+        self.max_rate_per_minute = max(
+            rate_per_minute, max_rate_per_minute or rate_per_minute
+        )
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+        self.acquired_count = 0
+        self.waited_count = 0
+        self.total_wait_seconds = 0.0
+        self.throttled_count = 0
+
+    @property
+    def rate_per_second(self) -> float:
+        """1秒あたりの補充トークン数"""
+        return self.rate_per_minute / 60
+
+    def _refill(self, available: float, elapsed: float) -> float:
+        """経過時間分のトークンを補充した残量を返す（上限は burst）"""
+        return min(float(self.burst), available + elapsed * self.rate_per_second)
+
+    def _take(self, tokens: int) -> float:
+        """
+        バケットからトークンを差し引き、待機秒数を返す
+
+        残量が負になった分は将来の補充で返済する（予約）。
+
+        Args:
+            tokens: 消費するトークン数
+
+        Returns:
+            待機秒数（0なら即時実行可能）
+        """
+        now = time.monotonic()
+        self._tokens = self._refill(self._tokens, now - self._updated_at)
+        self._updated_at = now
+
+        self._tokens -= tokens
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+    def _give_back(self, tokens: int) -> None:
+        """
+        予約したトークンを返却（待機せずに取りやめた場合）
+
+        Args:
+            tokens: 返却するトークン数
+        """
+        self._tokens += tokens
+
+    def _adjust_rate(self, change: Callable[[float], float]) -> None:
+        """
+        補充レートを変更（それまでの経過時間分は変更前のレートで補充する）
+
+        Args:
+            change: 現在のレート（回/分）を受け取り、新しいレートを返す関数
+        """
+        now = time.monotonic()
+        self._tokens = self._refill(self._tokens, now - self._updated_at)
+        self._updated_at = now
+        self.rate_per_minute = change(self.rate_per_minute)
+
+    def _pause(self, seconds: float) -> None:
+        """
+        指定秒数が経過するまで次のトークンが出ないよう残量を減らす
+
+        次の acquire() がちょうど seconds 秒待つよう、残量を 1 - 補充量 に抑える。
+
+        Args:
+            seconds: 一時停止する秒数
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self._refill(self._tokens, now - self._updated_at),
+            1 - seconds * self.rate_per_second,
+        )
+        self._updated_at = now
+
+    def _reserve(
+        self, tokens: int, max_wait: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        トークンを予約し、実行可能になるまでの待機秒数を返す
+
+        Args:
+            tokens: 消費するトークン数
+            max_wait: 待機できる最大秒数（None なら無制限）
+
+        Returns:
+            待機秒数（0なら即時実行可能）。max_wait を超える場合は予約を取り消して None
+        """
+        with self._lock:
+            wait = self._take(tokens)
+            if max_wait is not None and wait > max_wait:
+                self._give_back(tokens)
+                logger.debug(
+                    f"レート制限の待機が上限を超えるため中止 ({self.name}): "
+                    f"{wait:.1f}秒 > {max_wait:.1f}秒"
+                )
+                return None
+
+            self.acquired_count += 1
+            if wait > 0:
+                self.waited_count += 1
+                self.total_wait_seconds += wait
+
+        if wait > 0:
+            logger.debug(f"レート制限待機 ({self.name}): {wait:.1f}秒")
+        return wait
+
+    def acquire(self, tokens: int = 1, max_wait: Optional[float] = None) -> bool:
+        """
+        トークンを取得（必要なら待機）
+
+        Args:
+            tokens: 消費するトークン数
+            max_wait: 待機できる最大秒数（None なら無制限）
+
+        Returns:
+            取得できれば True。待機が max_wait を超える場合はトークンを消費せず False
+        """
+        wait = self._reserve(tokens, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(
+        self, tokens: int = 1, max_wait: Optional[float] = None
+    ) -> bool:
+        """
+        トークンを取得（非同期版、イベントループをブロックしない）
+
+        Args:
+            tokens: 消費するトークン数
+            max_wait: 待機できる最大秒数（None なら無制限）
+
+        Returns:
+            取得できれば True。待機が max_wait を超える場合はトークンを消費せず False
+        """
+        wait = self._reserve(tokens, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """
+        レートは変えずに一定時間リクエストを止める
+
+        残り回数が0になったことをヘッダーで知らされた場合に使う。
+
+        Args:
+            seconds: 一時停止する秒数
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._pause(seconds)
+        logger.info(f"レート制限の上限に到達 ({self.name}): {seconds:.1f}秒停止")
+
+    def on_success(self) -> None:
+        """成功したリクエストを記録し、適応制御ならレートを少し戻す（加算的増加）"""
+        if not self.adaptive:
+            return
+        with self._lock:
+            if self.rate_per_minute < self.max_rate_per_minute:
+                self._adjust_rate(
+                    lambda rate: min(
+                        self.max_rate_per_minute, rate + self.increase_step
+                    )
+                )
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        429を受けたことを記録し、レートを下げて一時停止する（乗算的減少）
+
+        Args:
+            retry_after: Retry-After 等で指定された待機秒数
+                         （不明なら下げた後のレートで1回分の間隔）
+        """
+        with self._lock:
+            self.throttled_count += 1
+            if self.adaptive:
+                self._adjust_rate(
+                    lambda rate: max(
+                        self.min_rate_per_minute, rate * self.decrease_factor
+                    )
+                )
+            pause = retry_after if retry_after is not None else 1 / self.rate_per_second
+            self._pause(pause)
+
+        logger.warning(
+            f"レート制限を受信 ({self.name}): {pause:.1f}秒停止, "
+            f"レート {self.rate_per_minute:.1f}回/分"
+        )
+
+    def get_statistics(self) -> dict:
+        """
+        レート制限の統計を取得
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate_per_minute": round(self.rate_per_minute, 2),
+                "burst": self.burst,
+                "acquired": self.acquired_count,
+                "waited": self.waited_count,
+                "throttled": self.throttled_count,
+                "total_wait_seconds": round(self.total_wait_seconds, 1),
+            }
@@ -0,0 +1,358 @@
+"""
+バッチジャーナル
+
+--batch 実行の進捗をSQLiteに記録し、中断したバッチを途中から再開できるようにする。
+欲求ごとの状態、途中成果物（欲求分析・リサーチ結果・抽出済み製品）、
+保存済みマーカー、完了した結果を保持する。
+
+再開時は完了済みの欲求を記録から復元し、途中の欲求は保存済みの成果物から
+続きを実行するため、一度支払ったAPI呼び出しを繰り返さない。
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 欲求の状態
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 途中成果物の段階
+STAGE_ANALYSIS = "analysis"  # 欲求分析・翻訳クエリ
+STAGE_RESEARCH = "research"  # スクレイピング済みのリサーチ結果
+STAGE_PRODUCTS = "products"  # 重複除去・ランキング後の製品
+STAGE_RESULT = "result"  # 完了したハント結果
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def batch_id(desires: list[str]) -> str:
+    """
+    欲求リストからバッチIDを生成（同じリストなら同じID）
+
+    Args:
+        desires: 欲求のリスト
+
+    Returns:
+        16桁の16進文字列
+    """
+    digest = hashlib.sha256("\n".join(desires).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+class DesireCheckpoint:
+    """
+    1件の欲求の途中成果物を読み書きするハンドル
+
+    Director はステップごとに load() で記録を確認し、なければ実行して
+    store() で記録する。値はJSONに変換できる形で渡す。
+    """
+
+    def __init__(self, journal: "BatchJournal", run_id: str, index: int):
+        self.journal = journal
+        self.run_id = run_id
+        self.index = index
+        # 製品の書き込みの完了（書き込みバッファ経由で保存した場合に設定される）
+        self.saving: Optional[Future] = None
+
+    def load(self, stage: str) -> Optional[Any]:
+        """記録済みの成果物を取得（なければ None）"""
+        return self.journal.load_artifact(self.run_id, self.index, stage)
+
+    def store(self, stage: str, value: Any) -> None:
+        """成果物を記録"""
+        self.journal.store_artifact(self.run_id, self.index, stage, value)
+
+    @property
+    def saved(self) -> bool:
+        """製品の保存が完了しているか"""
+        return self.journal.is_saved(self.run_id, self.index)
+
+    def mark_saved(self, count: int) -> None:
+        """製品の保存が完了したことを記録"""
+        self.journal.mark_saved(self.run_id, self.index, count)
+
+
+class BatchJournal:
+    """
+    SQLiteを使用したバッチ実行の記録
+
+    特徴:
+    - 書き込みごとにコミットするため、強制終了しても直前までの進捗が残る
+    - バッチIDは欲求リストの内容から決まる（同じファイルを再実行すれば再開できる）
+    - 保存済みマーカーにより、再開時にシートへ同じ行を書き込まない
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        self.path = Path(
+            path
+            or settings.batch_journal_path
+            or Path(settings.cache_dir) / "batch_journal.sqlite3"
+        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS desires (
+                run_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                desire TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                saved_count INTEGER,
+                error TEXT NOT NULL DEFAULT '',
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, idx)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                run_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_id, idx, stage)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def start(self, desires: list[str], resume: bool = False) -> str:
+        """
+        バッチの記録を開始
+
+        Args:
+            desires: 欲求のリスト
+            resume: True なら既存の記録を引き継ぐ。False なら同じバッチの記録を消して
+                最初から実行する
+
+        Returns:
+            バッチID
+        """
+        run_id = batch_id(desires)
+        now = time.time()
+
+        with self._lock:
+            if not resume:
+                self._conn.execute("DELETE FROM desires WHERE run_id = ?", (run_id,))
+                self._conn.execute("DELETE FROM artifacts WHERE run_id = ?", (run_id,))
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO desires (run_id, idx, desire, status, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(run_id, i, desire, PENDING, now) for i, desire in enumerate(desires)],
+            )
+            self._conn.commit()
+
+        if resume:
+            progress = self.get_progress(run_id)
+            logger.info(
+                f"バッチを再開します: {progress['done']}/{progress['total']}件 完了済み"
+            )
+        return run_id
+
+    def checkpoint(self, run_id: str, index: int) -> DesireCheckpoint:
+        """
+        欲求の処理開始を記録し、途中成果物のハンドルを返す
+
+        Args:
+            run_id: バッチID
+            index: 欲求のインデックス
+
+        Returns:
+            DesireCheckpoint
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE desires SET status = ?, attempts = attempts + 1, updated_at = ?
+                WHERE run_id = ? AND idx = ?
+                """,
+                (RUNNING, time.time(), run_id, index),
+            )
+            self._conn.commit()
+        return DesireCheckpoint(self, run_id, index)
+
+    def completed(self, run_id: str) -> dict[int, dict]:
+        """
+        完了済みの欲求の結果を取得
+
+        Args:
+            run_id: バッチID
+
+        Returns:
+            インデックス → 記録したハント結果 の辞書
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT d.idx, a.value FROM desires d
+                JOIN artifacts a
+                    ON a.run_id = d.run_id AND a.idx = d.idx AND a.stage = ?
+                WHERE d.run_id = ? AND d.status = ?
+                """,
+                (STAGE_RESULT, run_id, DONE),
+            ).fetchall()
+        return {idx: json.loads(value) for idx, value in rows}
+
+    def complete(
+        self, run_id: str, index: int, result: dict, error: str = ""
+    ) -> None:
+        """
+        欲求の処理完了を記録
+
+        エラーで終わった欲求は failed として記録し、再開時にもう一度実行する
+        （記録済みの途中成果物はそのまま使う）。
+
+        Args:
+            run_id: バッチID
+            index: 欲求のインデックス
+            result: ハント結果（JSONに変換できる辞書）
+            error: エラー内容（正常終了なら空）
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO artifacts (run_id, idx, stage, value, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (run_id, index, STAGE_RESULT, _dumps(result), now),
+            )
+            self._conn.execute(
+                """
+                UPDATE desires SET status = ?, error = ?, updated_at = ?
+                WHERE run_id = ? AND idx = ?
+                """,
+                (FAILED if error else DONE, error, now, run_id, index),
+            )
+            self._conn.commit()
+
+    def load_artifact(self, run_id: str, index: int, stage: str) -> Optional[Any]:
+        """
+        途中成果物を取得
+
+        Args:
+            run_id: バッチID
+            index: 欲求のインデックス
+            stage: 段階（STAGE_ANALYSIS 等）
+
+        Returns:
+            記録した値、または None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT value FROM artifacts
+                WHERE run_id = ? AND idx = ? AND stage = ?
+                """,
+                (run_id, index, stage),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_artifact(self, run_id: str, index: int, stage: str, value: Any) -> None:
+        """
+        途中成果物を記録
+
+        Args:
+            run_id: バッチID
+            index: 欲求のインデックス
+            stage: 段階（STAGE_ANALYSIS 等）
+            value: JSONに変換できる値
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO artifacts (run_id, idx, stage, value, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (run_id, index, stage, _dumps(value), time.time()),
+            )
+            self._conn.commit()
+
+    def is_saved(self, run_id: str, index: int) -> bool:
+        """欲求の製品を保存済みか"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT saved_count FROM desires WHERE run_id = ? AND idx = ?",
+                (run_id, index),
+            ).fetchone()
+        return bool(row) and row[0] is not None
+
+    def mark_saved(self, run_id: str, index: int, count: int) -> None:
+        """
+        欲求の製品を保存したことを記録
+
+        保存直後に強制終了した場合は記録が残らず、再開時に同じ製品を
+        もう一度保存することがある（最低1回の保存を保証する）。
+
+        Args:
+            run_id: バッチID
+            index: 欲求のインデックス
+            count: 保存した件数
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE desires SET saved_count = ?, updated_at = ?
+                WHERE run_id = ? AND idx = ?
+                """,
+                (count, time.time(), run_id, index),
+            )
+            self._conn.commit()
+
+    def get_progress(self, run_id: str) -> dict:
+        """
+        バッチの進捗を取得
+
+        Args:
+            run_id: バッチID
+
+        Returns:
+            状態ごとの件数の辞書
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM desires WHERE run_id = ? GROUP BY status",
+                (run_id,),
+            ).fetchall()
+
+        counts = dict(rows)
+        total = sum(counts.values())
+        done = counts.get(DONE, 0)
+        return {
+            "total": total,
+            "done": done,
+            "failed": counts.get(FAILED, 0),
+            "running": counts.get(RUNNING, 0),
+            "pending": counts.get(PENDING, 0),
+            "progress": f"{(done / total * 100) if total else 0:.1f}%",
+        }
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,334 @@
+"""
+列指向フォーマットでの製品データ入出力
+
+製品ストアを Parquet / Arrow IPC に書き出し・読み込みする。
+読み込み時の絞り込み（適合度・検索言語・欲求・価格）は pyarrow の式で
+列単位にまとめて評価するため、製品を1件ずつ Product に変換せずに済む。
+Parquet では行グループの統計を使って該当しない部分を読み飛ばす。
+
+pyarrow は任意の依存（`uv sync --extra arrow`）で、使用時に読み込む。
+"""
+
+import functools
+import logging
+import operator
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from src.core.interfaces import ProductRepository
+from src.domain.models import PriceInfo, Product
+from src.infrastructure.repositories.sqlite_repo import SQLiteProductRepository
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# 列名と型（pyarrow は遅延インポートするため型名で持つ）
+SCHEMA_FIELDS = (
+    ("name", "string"),
+    ("brand", "string"),
+    ("description", "string"),
+    ("price_amount", "float64"),
+    ("price_currency", "string"),
+    ("price_formatted", "string"),
+    ("official_url", "string"),
+    ("amazon_url", "string"),
+    ("rakuten_url", "string"),
+    ("instagram_url", "string"),
+    ("relevance_score", "int8"),
+    ("reasoning", "string"),
+    ("source_language", "string"),
+    ("source_url", "string"),
+    ("desire", "string"),
+    ("extracted_at", "timestamp[us]"),
+)
+COLUMNS = tuple(name for name, _ in SCHEMA_FIELDS)
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+IPC_SUFFIXES = {".arrow", ".ipc", ".feather"}
+
+
+def _require_pyarrow():
+    """pyarrow を読み込む（未インストールならインストール方法を示して失敗）"""
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Arrow の入出力には pyarrow が必要です"
+            "（uv sync --extra arrow または pip install pyarrow）"
+        ) from e
+    return pyarrow
+
+
+def _schema() -> "pa.Schema":
+    pa = _require_pyarrow()
+    return pa.schema([(name, pa.type_for_alias(t)) for name, t in SCHEMA_FIELDS])
+
+
+def products_to_table(products: Iterable[Product]) -> "pa.Table":
+    """
+    Product のリストを Arrow テーブルに変換
+
+    Args:
+        products: 製品
+
+    Returns:
+        SCHEMA_FIELDS の列を持つテーブル
+    """
+    columns: dict[str, list] = {name: [] for name in COLUMNS}
+    for product in products:
+        price = product.price
+        columns["name"].append(product.name)
+        columns["brand"].append(product.brand)
+        columns["description"].append(product.description)
+        columns["price_amount"].append(price.amount if price else None)
+        columns["price_currency"].append(price.currency if price else None)
+        columns["price_formatted"].append(price.formatted if price else None)
+        columns["official_url"].append(product.official_url)
+        columns["amazon_url"].append(product.amazon_url)
+        columns["rakuten_url"].append(product.rakuten_url)
+        columns["instagram_url"].append(product.instagram_url)
+        columns["relevance_score"].append(product.relevance_score)
+        columns["reasoning"].append(product.reasoning)
+        columns["source_language"].append(product.source_language)
+        columns["source_url"].append(product.source_url)
+        columns["desire"].append(product.desire)
+        columns["extracted_at"].append(product.extracted_at)
+    return columns_to_table(columns)
+
+
+def columns_to_table(columns: dict[str, list]) -> "pa.Table":
+    """
+    列ごとの値のリストを Arrow テーブルに変換
+
+    抽出日時は datetime と ISO 8601 文字列（SQLiteの保存形式）のどちらでもよい。
+
+    Args:
+        columns: 列名 → 値のリスト（SCHEMA_FIELDS の全列）
+
+    Returns:
+        SCHEMA_FIELDS の列を持つテーブル
+    """
+    pa = _require_pyarrow()
+    schema = _schema()
+
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        if pa.types.is_timestamp(field.type) and any(
+            isinstance(v, str) for v in values
+        ):
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def table_to_products(table: "pa.Table") -> list[Product]:
+    """
+    Arrow テーブルを Product のリストに変換
+
+    Args:
+        table: SCHEMA_FIELDS の列を持つテーブル
+
+    Returns:
+        製品のリスト
+    """
+    products = []
+    for row in table.to_pylist():
+        price = None
+        if row["price_formatted"] is not None or row["price_amount"] is not None:
+            price = PriceInfo(
+                amount=row["price_amount"],
+                currency=row["price_currency"] or "",
+                formatted=row["price_formatted"] or "",
+            )
+        products.append(
+            Product(
+                name=row["name"],
+                brand=row["brand"] or "",
+                description=row["description"] or "",
+                price=price,
+                official_url=row["official_url"],
+                amazon_url=row["amazon_url"],
+                rakuten_url=row["rakuten_url"],
+                instagram_url=row["instagram_url"],
+                relevance_score=row["relevance_score"] or 0,
+                reasoning=row["reasoning"] or "",
+                source_language=row["source_language"] or "",
+                source_url=row["source_url"] or "",
+                desire=row["desire"] or "",
+                extracted_at=row["extracted_at"] or datetime.now(),
+            )
+        )
+    return products
+
+
+def build_filter(
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    languages: Optional[Iterable[str]] = None,
+    desires: Optional[Iterable[str]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    currency: Optional[str] = None,
+):
+    """
+    絞り込み条件を pyarrow の式に変換（すべての条件の AND）
+
+    Args:
+        min_score: 適合度の下限
+        max_score: 適合度の上限
+        languages: 検索言語コード（いずれかに一致）
+        desires: 欲求（いずれかに一致）
+        min_price: 価格の下限
+        max_price: 価格の上限
+        currency: 通貨コード（価格で絞り込む場合は指定を推奨）
+
+    Returns:
+        pyarrow.compute.Expression、条件がなければ None
+    """
+    pc = _require_pyarrow().compute
+    field = pc.field
+
+    conditions = []
+    if min_score is not None:
+        conditions.append(field("relevance_score") >= min_score)
+    if max_score is not None:
+        conditions.append(field("relevance_score") <= max_score)
+    if languages is not None:
+        conditions.append(field("source_language").isin(list(languages)))
+    if desires is not None:
+        conditions.append(field("desire").isin(list(desires)))
+    if min_price is not None:
+        conditions.append(field("price_amount") >= min_price)
+    if max_price is not None:
+        conditions.append(field("price_amount") <= max_price)
+    if currency is not None:
+        conditions.append(field("price_currency") == currency)
+
+    return functools.reduce(operator.and_, conditions) if conditions else None
+
+
+def filter_table(table: "pa.Table", **filters) -> "pa.Table":
+    """
+    読み込み済みのテーブルを絞り込む
+
+    Args:
+        table: 製品のテーブル
+        **filters: build_filter() の引数
+
+    Returns:
+        条件に一致する行のテーブル
+    """
+    expression = build_filter(**filters)
+    return table if expression is None else table.filter(expression)
+
+
+def write_table(table: "pa.Table", path: str | Path) -> None:
+    """
+    テーブルをファイルに書き出す（拡張子で形式を判定）
+
+    Args:
+        table: 書き出すテーブル
+        path: .parquet / .pq なら Parquet、.arrow / .ipc / .feather なら Arrow IPC
+
+    Raises:
+        ValueError: 対応していない拡張子の場合
+    """
+    pa = _require_pyarrow()
+    path = Path(path)
+    suffix = path.suffix.lower()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if suffix in PARQUET_SUFFIXES:
+        pa.parquet.write_table(table, path, compression="zstd")
+    elif suffix in IPC_SUFFIXES:
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        raise ValueError(f"対応していないファイル形式です: {path.name}")
+
+
+def read_table(
+    path: str | Path, columns: Optional[list[str]] = None, **filters
+) -> "pa.Table":
+    """
+    ファイルから製品のテーブルを読み込み、条件で絞り込む
+
+    Parquet では条件を読み込み時に適用し、該当しない行グループを読み飛ばす。
+
+    Args:
+        path: Parquet または Arrow IPC ファイル
+        columns: 読み込む列（None なら全列）
+        **filters: build_filter() の引数
+
+    Returns:
+        条件に一致する行のテーブル
+
+    Raises:
+        ValueError: 対応していない拡張子の場合
+    """
+    pa = _require_pyarrow()
+    path = Path(path)
+    suffix = path.suffix.lower()
+    expression = build_filter(**filters)
+
+    if suffix in PARQUET_SUFFIXES:
+        return pa.parquet.read_table(path, columns=columns, filters=expression)
+    if suffix in IPC_SUFFIXES:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if expression is not None:
+            table = table.filter(expression)
+        return table.select(columns) if columns else table
+    raise ValueError(f"対応していないファイル形式です: {path.name}")
+
+
+def export_products(repository: ProductRepository, path: str | Path) -> int:
+    """
+    製品ストアの全製品をファイルに書き出す
+
+    SQLiteリポジトリからは Product を経由せず列単位で読み出す。
+
+    Args:
+        repository: 製品リポジトリ
+        path: 書き出し先（拡張子で形式を判定）
+
+    Returns:
+        書き出した製品数
+    """
+    if isinstance(repository, SQLiteProductRepository):
+        table = columns_to_table(repository.fetch_columns(COLUMNS))
+    else:
+        table = products_to_table(repository.get_all())
+
+    write_table(table, path)
+    logger.info(f"製品をエクスポートしました: {table.num_rows}件 -> {path}")
+    return table.num_rows
+
+
+def import_products(
+    path: str | Path, repository: ProductRepository, **filters
+) -> int:
+    """
+    ファイルの製品を製品ストアに取り込む
+
+    Args:
+        path: Parquet または Arrow IPC ファイル
+        repository: 取り込み先の製品リポジトリ
+        **filters: build_filter() の引数（一致する製品だけ取り込む）
+
+    Returns:
+        取り込んだ製品数
+    """
+    products = table_to_products(read_table(path, **filters))
+    repository.save_batch(products)
+    logger.info(f"製品をインポートしました: {len(products)}件 <- {path}")
+    return len(products)
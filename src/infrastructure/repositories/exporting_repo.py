@@ -0,0 +1,125 @@
+"""
+エクスポート付きリポジトリ
+
+主となる保存先（SQLite等）に書き込んだ製品を、Google Sheets 等の
+エクスポート先にも書き出す。読み取りはすべて主保存先から行う。
+"""
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from src.core.interfaces import ProductRepository
+from src.domain.models import Product
+
+logger = logging.getLogger(__name__)
+
+
+class ExportError(Exception):
+    """エクスポート先への書き出しに失敗した"""
+
+    pass
+
+
+class ExportingProductRepository(ProductRepository):
+    """
+    主保存先＋エクスポート先の製品リポジトリ
+
+    エクスポート先への書き出しに失敗しても主保存先への保存は成功扱いにし、
+    エラーはログに残す（エクスポート先は閲覧用の写しという位置づけ）。
+    ただし save_batch_deferred の Future にはエクスポート先の失敗も設定する。
+    """
+
+    def __init__(self, primary: ProductRepository, sinks: list[ProductRepository]):
+        self.primary = primary
+        self.sinks = sinks
+
+    def save(self, product: Product) -> None:
+        """単一の製品を保存"""
+        self.save_batch([product])
+
+    def save_batch(self, products: list[Product]) -> None:
+        """
+        主保存先に一括保存し、各エクスポート先にも書き出す
+
+        Args:
+            products: 保存する製品のリスト
+        """
+        if not products:
+            return
+
+        self.primary.save_batch(products)
+
+        for sink in self.sinks:
+            try:
+                sink.save_batch(products)
+            except Exception as e:
+                logger.error(f"エクスポートエラー ({type(sink).__name__}): {e}")
+
+    def save_batch_deferred(self, products: list[Product]) -> Future:
+        """
+        主保存先・各エクスポート先に一括保存し、書き込みの完了を Future で通知する
+
+        Future はすべての保存先の書き込みが終わった時点で完了し、
+        エクスポート先のいずれかが失敗していれば ExportError を設定する。
+
+        Args:
+            products: 保存する製品のリスト
+
+        Returns:
+            書き込みの完了を通知する Future
+        """
+        futures = [self.primary.save_batch_deferred(products)]
+        for sink in self.sinks:
+            try:
+                futures.append(sink.save_batch_deferred(products))
+            except Exception as e:
+                failed: Future = Future()
+                failed.set_exception(e)
+                futures.append(failed)
+
+        combined: Future = Future()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def _on_done(_future: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            errors = [
+                f"{type(sink).__name__}: {future.exception()}"
+                for sink, future in zip([self.primary, *self.sinks], futures)
+                if future.exception() is not None
+            ]
+            for error in errors:
+                logger.error(f"エクスポートエラー ({error})")
+            if errors:
+                combined.set_exception(ExportError("; ".join(errors)))
+            else:
+                combined.set_result(None)
+
+        for future in futures:
+            future.add_done_callback(_on_done)
+        return combined
+
+    def flush(self) -> None:
+        """主保存先・各エクスポート先の書き込み待ちの製品を書き込む"""
+        for repository in [self.primary, *self.sinks]:
+            try:
+                repository.flush()
+            except Exception as e:
+                logger.error(f"書き込みエラー ({type(repository).__name__}): {e}")
+
+    def find_by_url(self, url: str) -> Optional[Product]:
+        """URLで製品を検索"""
+        return self.primary.find_by_url(url)
+
+    def get_all(self) -> list[Product]:
+        """全製品を取得"""
+        return self.primary.get_all()
+
+    def exists_by_name(self, name: str) -> bool:
+        """製品名で重複チェック"""
+        return self.primary.exists_by_name(name)
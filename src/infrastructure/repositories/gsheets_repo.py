@@ -3,12 +3,16 @@ Google Sheets リポジトリ
 
 製品データの永続化を担当。
 バッチ更新による効率化とレート制限対応。
+検索系はシートのスナップショットをメモリに保持して引く。
 """
 
 import logging
+import threading
+from datetime import datetime
 from typing import Optional
 
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 from tenacity import (
     retry,
@@ -20,9 +24,14 @@ from tenacity import (
 from src.core.config import settings
 from src.core.interfaces import ProductRepository
 from src.domain.models import Product, PriceInfo
+from src.infrastructure.repositories.product_identity import product_key
+from src.infrastructure.repositories.sheet_snapshot import SheetSnapshot
 
 logger = logging.getLogger(__name__)
 
+# upsert 時に変更の有無の判定から除外する列
+VOLATILE_COLUMNS = {"抽出日時"}
+
 # Google Sheets API のスコープ
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -38,6 +47,8 @@ class GSheetsProductRepository(ProductRepository):
     - バッチ更新による効率化
     - 重複チェック機能
     - 自動ヘッダー作成
+    - スナップショットによる O(1) の検索（snapshot_ttl 秒ごとに変更を確認）
+    - upsert（同じ製品の行は上書きし、新しい製品だけ追記）
     """
 
     def __init__(
@@ -45,15 +56,33 @@ class GSheetsProductRepository(ProductRepository):
         credentials_path: Optional[str] = None,
         spreadsheet_id: Optional[str] = None,
         worksheet_name: Optional[str] = None,
+        snapshot_ttl: Optional[int] = None,
+        change_detection: Optional[bool] = None,
+        upsert: Optional[bool] = None,
     ):
         self.credentials_path = credentials_path or settings.google_credentials_path
         self.spreadsheet_id = spreadsheet_id or settings.spreadsheet_id
         self.worksheet_name = worksheet_name or settings.worksheet_name
+        self.snapshot_ttl = (
+            settings.sheets_snapshot_ttl if snapshot_ttl is None else snapshot_ttl
+        )
+        self.change_detection = (
+            settings.sheets_change_detection
+            if change_detection is None
+            else change_detection
+        )
+        self.upsert = settings.sheets_upsert if upsert is None else upsert
 
         self._client: Optional[gspread.Client] = None
         self._worksheet: Optional[gspread.Worksheet] = None
         self._write_queue: list[Product] = []
 
+        self._snapshot: Optional[SheetSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._upsert_lock = threading.Lock()  # 行番号の決定から書き込みまでを直列化
+        self.snapshot_loads = 0
+        self.snapshot_checks = 0
+
     def _get_client(self) -> gspread.Client:
         """gspreadクライアントを取得（遅延初期化）"""
         if self._client is None:
@@ -114,6 +143,10 @@ class GSheetsProductRepository(ProductRepository):
         Args:
             product: 保存する製品
         """
+        if self.upsert:
+            self._upsert_batch([product])
+            return
+
         worksheet = self._get_worksheet()
         row = product.to_row()
 
@@ -124,6 +157,8 @@ class GSheetsProductRepository(ProductRepository):
             logger.error(f"製品保存エラー: {product.name} - {e}")
             raise
 
+        self._add_to_snapshot([row])
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential_jitter(initial=1, max=30),
@@ -132,18 +167,26 @@ class GSheetsProductRepository(ProductRepository):
             f"Google Sheets バッチ保存リトライ: {retry_state.attempt_number}回目"
         ),
     )
-    def save_batch(self, products: list[Product]) -> None:
+    def save_batch(
+        self, products: list[Product], upsert: Optional[bool] = None
+    ) -> None:
         """
         複数の製品を一括保存（推奨）
 
         バッチ更新により、API呼び出しを最小化。
+        upsert が有効なら保存済みの製品の行は上書きし、新しい製品だけを追記する。
 
         Args:
             products: 保存する製品のリスト
+            upsert: 同じ製品の行を上書きするか（Noneなら self.upsert）
         """
         if not products:
             return
 
+        if self.upsert if upsert is None else upsert:
+            self._upsert_batch(products)
+            return
+
         worksheet = self._get_worksheet()
         rows = [p.to_row() for p in products]
 
@@ -155,6 +198,81 @@ class GSheetsProductRepository(ProductRepository):
             logger.error(f"バッチ保存エラー: {e}")
             raise
 
+        self._add_to_snapshot(rows)
+
+    def _upsert_batch(self, products: list[Product]) -> None:
+        """
+        同一性キー（正規化URL、なければブランド＋製品名）で upsert
+
+        内容が変わった既存行は batch_update 1回でまとめて上書きし、
+        新しい製品は append_rows 1回で追記する。抽出日時だけが異なる行は
+        書き込まない。同じバッチ内の同じ製品は後のものを使う。
+
+        Args:
+            products: 保存する製品のリスト
+        """
+        worksheet = self._get_worksheet()
+
+        with self._upsert_lock:
+            snapshot = self._get_snapshot()
+            updates: dict[int, list[str]] = {}  # records のインデックス → 行
+            appends: dict[str, list[str]] = {}  # 同一性キー → 行
+
+            for product in products:
+                key = product_key(product)
+                row = product.to_row()
+                index = snapshot.find_index(key)
+                if index is None:
+                    appends[key] = row
+                elif self._row_changed(snapshot.records[index], row):
+                    updates[index] = row
+                else:
+                    updates.pop(index, None)
+
+            try:
+                if updates:
+                    worksheet.batch_update(
+                        [
+                            {"range": self._row_range(index + 2), "values": [row]}
+                            for index, row in updates.items()
+                        ]
+                    )
+                if appends:
+                    worksheet.append_rows(list(appends.values()))
+            except Exception as e:
+                logger.error(f"バッチ保存エラー: {e}")
+                raise
+
+            with self._snapshot_lock:
+                if self._snapshot is snapshot:
+                    for index, row in updates.items():
+                        snapshot.update_row(index, row)
+                    snapshot.add_rows(list(appends.values()))
+                    if self.change_detection and (updates or appends):
+                        snapshot.touch(self._modified_time())
+
+        unchanged = len(products) - len(updates) - len(appends)
+        logger.info(
+            f"バッチ保存完了: 更新{len(updates)}件 / 追加{len(appends)}件 / "
+            f"変更なし{unchanged}件"
+        )
+
+    @staticmethod
+    def _row_changed(record: dict, row: list[str]) -> bool:
+        """シートの行と新しい行の内容が異なるか（抽出日時は比較しない）"""
+        for column, value in zip(Product.get_header_row(), row):
+            if column in VOLATILE_COLUMNS:
+                continue
+            if str(record.get(column, "")) != value:
+                return True
+        return False
+
+    @staticmethod
+    def _row_range(row_number: int) -> str:
+        """行全体（ヘッダーと同じ列数）のA1形式の範囲"""
+        last_column = len(Product.get_header_row())
+        return f"A{row_number}:{rowcol_to_a1(row_number, last_column)}"
+
     def queue_product(self, product: Product) -> None:
         """
         製品を書き込みキューに追加
@@ -183,6 +301,68 @@ class GSheetsProductRepository(ProductRepository):
         self._write_queue = []
         return count
 
+    def _modified_time(self) -> Optional[str]:
+        """スプレッドシートの更新日時（Drive API、取得できなければ None）"""
+        try:
+            return self._get_worksheet().spreadsheet.get_lastUpdateTime()
+        except Exception as e:
+            logger.debug(f"更新日時の取得エラー: {e}")
+            return None
+
+    def _load_snapshot(self) -> SheetSnapshot:
+        """シート全体を読み込んでスナップショットを作成"""
+        worksheet = self._get_worksheet()
+        modified_time = self._modified_time() if self.change_detection else None
+        # 数値に見えるセル（"19.90" 等）を変換させず、書き込んだ文字列のまま比較する
+        records = worksheet.get_all_records(numericise_ignore=["all"])
+        snapshot = SheetSnapshot(records, modified_time)
+        self.snapshot_loads += 1
+        logger.info(f"シートのスナップショットを読み込みました: {len(snapshot)}件")
+        return snapshot
+
+    def _get_snapshot(self) -> SheetSnapshot:
+        """
+        スナップショットを取得（なければ読み込み、古ければ更新）
+
+        snapshot_ttl 秒を過ぎたら、変更検知が有効ならスプレッドシートの
+        更新日時だけを確認し、変わっていなければ読み込み直さない。
+
+        Returns:
+            SheetSnapshot
+        """
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age >= self.snapshot_ttl:
+                self.snapshot_checks += 1
+                modified_time = (
+                    self._modified_time() if self.change_detection else None
+                )
+                if modified_time is not None and (
+                    modified_time == snapshot.modified_time
+                ):
+                    snapshot.touch()
+                else:
+                    snapshot = None
+
+            if snapshot is None:
+                snapshot = self._snapshot = self._load_snapshot()
+            return snapshot
+
+    def _add_to_snapshot(self, rows: list[list[str]]) -> None:
+        """追記した行を読み込み済みのスナップショットに反映"""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                return
+            self._snapshot.add_rows(rows)
+            if self.change_detection:
+                # 自分の書き込みによる更新日時の変化で読み込み直さないようにする
+                self._snapshot.touch(self._modified_time())
+
+    def refresh(self) -> None:
+        """スナップショットを破棄し、次の検索でシートを読み込み直す"""
+        with self._snapshot_lock:
+            self._snapshot = None
+
     def find_by_url(self, url: str) -> Optional[Product]:
         """
         URLで製品を検索
@@ -193,22 +373,10 @@ class GSheetsProductRepository(ProductRepository):
         Returns:
             見つかった製品、または None
         """
-        worksheet = self._get_worksheet()
-
         try:
-            # 全データを取得
-            records = worksheet.get_all_records()
-
-            for record in records:
-                # 公式URL、Amazon、楽天のいずれかにマッチ
-                if (
-                    record.get("公式URL") == url
-                    or record.get("Amazon URL") == url
-                    or record.get("楽天URL") == url
-                ):
-                    return self._record_to_product(record)
-
-            return None
+            # 公式URL、Amazon、楽天のいずれかにマッチ
+            record = self._get_snapshot().find_by_url(url)
+            return self._record_to_product(record) if record else None
 
         except Exception as e:
             logger.error(f"URL検索エラー: {e}")
@@ -221,10 +389,8 @@ class GSheetsProductRepository(ProductRepository):
         Returns:
             製品のリスト
         """
-        worksheet = self._get_worksheet()
-
         try:
-            records = worksheet.get_all_records()
+            records = self._get_snapshot().records
             products = []
 
             for record in records:
@@ -274,15 +440,24 @@ class GSheetsProductRepository(ProductRepository):
                 source_language=record.get("検索言語", ""),
                 source_url=record.get("情報元URL", ""),
                 desire=record.get("欲求", ""),
+                extracted_at=self._parse_datetime(record.get("抽出日時")),
             )
 
         except Exception as e:
             logger.warning(f"レコード変換エラー: {e}")
             return None
 
+    @staticmethod
+    def _parse_datetime(value) -> datetime:
+        """抽出日時の列を datetime に変換（読めなければ現在時刻）"""
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            return datetime.now()
+
     def exists_by_name(self, name: str) -> bool:
         """
-        製品名で重複チェック
+        製品名で重複チェック（大文字小文字・全角半角・空白の違いは無視）
 
         Args:
             name: チェックする製品名
@@ -290,11 +465,8 @@ class GSheetsProductRepository(ProductRepository):
         Returns:
             存在すればTrue
         """
-        worksheet = self._get_worksheet()
-
         try:
-            records = worksheet.get_all_records()
-            return any(record.get("製品名") == name for record in records)
+            return self._get_snapshot().exists_by_name(name)
         except Exception as e:
             logger.error(f"重複チェックエラー: {e}")
             return False
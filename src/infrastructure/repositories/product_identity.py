@@ -0,0 +1,92 @@
+"""
+製品の同一性判定
+
+保存先をまたいで同じ製品を1件として扱うためのキーを生成する。
+製品ページのURL（正規化済み）と正規化した製品名の組を優先し、
+製品ページのURLがなければ正規化したブランド名＋製品名を使う。
+"""
+
+import unicodedata
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from src.domain.models import Product
+from src.infrastructure.cache.scrape_cache import normalize_url
+
+
+def normalize_name(name: str) -> str:
+    """
+    製品名・ブランド名を比較用に正規化
+
+    全角英数字を半角にし（NFKC）、小文字化して連続する空白を1つにまとめる。
+
+    Args:
+        name: 元の名前
+
+    Returns:
+        正規化された名前
+    """
+    return " ".join(unicodedata.normalize("NFKC", name).lower().split())
+
+
+def canonical_url(product: Product) -> Optional[str]:
+    """
+    製品を代表するURL（公式 > Amazon > 楽天）を正規化して返す
+
+    情報元URLはまとめ記事等で複数の製品に共通することがあるため使わない。
+    サイトのトップページ（パスが空または "/"）も複数の製品に共通するため使わない。
+
+    Args:
+        product: 製品
+
+    Returns:
+        正規化されたURL、またはURLがなければ None
+    """
+    return _first_url((product.official_url, product.amazon_url, product.rakuten_url))
+
+
+def _first_url(urls: Iterable[Optional[str]]) -> Optional[str]:
+    for url in urls:
+        if url and url.strip():
+            url = normalize_url(url)
+            parts = urlsplit(url)
+            if parts.path != "/" or parts.query:
+                return url
+    return None
+
+
+def identity_key(name: str, brand: str = "", urls: Iterable[Optional[str]] = ()) -> str:
+    """
+    製品名・ブランド・URL（公式 > Amazon > 楽天の順）から同一性キーを生成
+
+    1つのページに複数の製品が載っていることがあるため、URLには製品名を組み合わせる。
+
+    Args:
+        name: 製品名
+        brand: ブランド名
+        urls: 製品ページのURL（優先順）
+
+    Returns:
+        "url:<正規化URL>|<製品名>" または "name:<ブランド>|<製品名>"
+    """
+    url = _first_url(urls)
+    if url:
+        return f"url:{url}|{normalize_name(name)}"
+    return f"name:{normalize_name(brand)}|{normalize_name(name)}"
+
+
+def product_key(product: Product) -> str:
+    """
+    製品の同一性キーを生成
+
+    Args:
+        product: 製品
+
+    Returns:
+        "url:<正規化URL>|<製品名>" または "name:<ブランド>|<製品名>"
+    """
+    return identity_key(
+        product.name,
+        product.brand,
+        (product.official_url, product.amazon_url, product.rakuten_url),
+    )
@@ -0,0 +1,153 @@
+"""
+シートのスナップショット
+
+ワークシートの全レコードを一度だけ読み込んでメモリに保持し、
+URL列と正規化した製品名のハッシュインデックスを張る。
+検索のたびにシート全体をダウンロードせず、O(1) で引けるようにする。
+"""
+
+import time
+from typing import Optional
+
+from src.domain.models import Product
+from src.infrastructure.repositories.product_identity import (
+    identity_key,
+    normalize_name,
+)
+
+# インデックスを張るURL列
+URL_COLUMNS = ("公式URL", "Amazon URL", "楽天URL")
+NAME_COLUMN = "製品名"
+BRAND_COLUMN = "ブランド"
+
+
+def record_key(record: dict) -> str:
+    """シートのレコードから製品の同一性キーを生成"""
+    return identity_key(
+        str(record.get(NAME_COLUMN, "")),
+        str(record.get(BRAND_COLUMN, "")),
+        (str(record.get(column) or "") for column in URL_COLUMNS),
+    )
+
+
+class SheetSnapshot:
+    """
+    ワークシートのレコードとインデックス
+
+    records[i] はシートの i + 2 行目（1行目はヘッダー）に対応する。
+    """
+
+    def __init__(self, records: list[dict], modified_time: Optional[str] = None):
+        self.records: list[dict] = []
+        self.modified_time = modified_time  # 読み込み時点のシートの更新日時
+        self.loaded_at = time.monotonic()
+
+        self._url_index: dict[str, int] = {}
+        self._name_index: dict[str, int] = {}
+        self._key_index: dict[str, int] = {}  # 同一性キー → records のインデックス
+        self.add_records(records)
+
+    @property
+    def age(self) -> float:
+        """読み込み（または変更確認）からの経過秒数"""
+        return time.monotonic() - self.loaded_at
+
+    def touch(self, modified_time: Optional[str] = None) -> None:
+        """シートに変更がないことを確認した時刻を記録"""
+        self.loaded_at = time.monotonic()
+        if modified_time is not None:
+            self.modified_time = modified_time
+
+    def add_records(self, records: list[dict]) -> None:
+        """
+        末尾に追記されたレコードを取り込み、インデックスを更新
+
+        同じURL・製品名のレコードが複数ある場合は先頭のものを引く
+        （シートを上から走査した場合と同じ結果になる）。
+
+        Args:
+            records: シートのレコード（ヘッダーをキーとする辞書）
+        """
+        for record in records:
+            self.records.append(record)
+            self._index(len(self.records) - 1)
+
+    def _entries(self, record: dict) -> list[tuple[dict[str, int], str]]:
+        """レコードを登録する (インデックス, キー) の組"""
+        entries = [
+            (self._url_index, str(record[column]))
+            for column in URL_COLUMNS
+            if record.get(column)
+        ]
+        name = record.get(NAME_COLUMN)
+        if name:
+            entries.append((self._name_index, normalize_name(str(name))))
+            entries.append((self._key_index, record_key(record)))
+        return entries
+
+    def _index(self, index: int) -> None:
+        """records[index] をインデックスに登録"""
+        for table, key in self._entries(self.records[index]):
+            table.setdefault(key, index)
+
+    def _reindex_key(self, table: dict[str, int], key: str) -> None:
+        """key を持つ先頭のレコードを引くようにインデックスを付け直す"""
+        table.pop(key, None)
+        for index, record in enumerate(self.records):
+            if any(t is table and k == key for t, k in self._entries(record)):
+                table[key] = index
+                return
+
+    def add_rows(self, rows: list[list[str]]) -> None:
+        """
+        追記した行（Product.to_row() の形式）を取り込む
+
+        Args:
+            rows: 追記した行のリスト
+        """
+        header = Product.get_header_row()
+        self.add_records([dict(zip(header, row)) for row in rows])
+
+    def update_row(self, index: int, row: list[str]) -> None:
+        """
+        上書きした行（Product.to_row() の形式）を取り込む
+
+        Args:
+            index: records のインデックス
+            row: 上書きした行
+        """
+        old_entries = self._entries(self.records[index])
+        self.records[index] = dict(zip(Product.get_header_row(), row))
+        new_entries = self._entries(self.records[index])
+
+        # 上書きで消えたキー（変更前のURL等）は、同じキーの別の行があればそちらに付け替える
+        for table, key in old_entries:
+            if table.get(key) == index and not any(
+                t is table and k == key for t, k in new_entries
+            ):
+                self._reindex_key(table, key)
+        self._index(index)
+
+    def find_index(self, key: str) -> Optional[int]:
+        """
+        同一性キーが一致するレコードのインデックス（シートの行番号は +2）
+
+        Args:
+            key: product_key() で生成したキー
+
+        Returns:
+            records のインデックス、または None
+        """
+        return self._key_index.get(key)
+
+    def find_by_url(self, url: str) -> Optional[dict]:
+        """公式・Amazon・楽天URLのいずれかが一致するレコード"""
+        index = self._url_index.get(url)
+        return self.records[index] if index is not None else None
+
+    def exists_by_name(self, name: str) -> bool:
+        """正規化した製品名が一致するレコードがあるか"""
+        return normalize_name(name) in self._name_index
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,321 @@
+"""
+SQLite リポジトリ
+
+製品データをローカルのSQLiteに永続化する。
+URL・正規化した製品名・欲求にインデックスを張り、
+行数が増えても検索が全件走査にならないようにする。
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.core.config import settings
+from src.core.interfaces import ProductRepository
+from src.domain.models import PriceInfo, Product
+from src.infrastructure.repositories.product_identity import (
+    identity_key,
+    normalize_name,
+    product_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# products テーブルのカラム（product_key・first_seen_at 以外）
+COLUMNS = (
+    "name",
+    "name_norm",
+    "brand",
+    "description",
+    "price_amount",
+    "price_currency",
+    "price_formatted",
+    "official_url",
+    "amazon_url",
+    "rakuten_url",
+    "instagram_url",
+    "relevance_score",
+    "reasoning",
+    "source_language",
+    "source_url",
+    "desire",
+    "extracted_at",
+)
+
+# 同一性キーの形式のバージョン（PRAGMA user_version に記録）
+KEY_VERSION = 1
+
+# インデックスを張るカラム
+INDEXED_COLUMNS = ("official_url", "amazon_url", "rakuten_url", "name_norm", "desire")
+
+_UPSERT_SQL = f"""
+    INSERT INTO products (product_key, first_seen_at, {", ".join(COLUMNS)})
+    VALUES (?, ?, {", ".join("?" for _ in COLUMNS)})
+    ON CONFLICT(product_key) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in COLUMNS)}
+"""
+
+_SELECT_SQL = f"SELECT {', '.join(COLUMNS)} FROM products"
+
+
+def _product_to_row(product: Product) -> tuple:
+    """Product を products テーブルの行（COLUMNS の順）に変換"""
+    price = product.price
+    return (
+        product.name,
+        normalize_name(product.name),
+        product.brand,
+        product.description,
+        price.amount if price else None,
+        price.currency if price else None,
+        price.formatted if price else None,
+        product.official_url,
+        product.amazon_url,
+        product.rakuten_url,
+        product.instagram_url,
+        product.relevance_score,
+        product.reasoning,
+        product.source_language,
+        product.source_url,
+        product.desire,
+        product.extracted_at.isoformat(),
+    )
+
+
+def _row_to_product(row: tuple) -> Product:
+    """products テーブルの行（COLUMNS の順）を Product に変換"""
+    data = dict(zip(COLUMNS, row))
+
+    price = None
+    if data["price_formatted"] is not None or data["price_amount"] is not None:
+        price = PriceInfo(
+            amount=data["price_amount"],
+            currency=data["price_currency"] or "",
+            formatted=data["price_formatted"] or "",
+        )
+
+    return Product(
+        name=data["name"],
+        brand=data["brand"],
+        description=data["description"],
+        price=price,
+        official_url=data["official_url"],
+        amazon_url=data["amazon_url"],
+        rakuten_url=data["rakuten_url"],
+        instagram_url=data["instagram_url"],
+        relevance_score=data["relevance_score"],
+        reasoning=data["reasoning"],
+        source_language=data["source_language"],
+        source_url=data["source_url"],
+        desire=data["desire"],
+        extracted_at=datetime.fromisoformat(data["extracted_at"]),
+    )
+
+
+class SQLiteProductRepository(ProductRepository):
+    """
+    SQLiteを使用した製品リポジトリ
+
+    特徴:
+    - 製品の同一性キー（正規化URL、なければブランド＋製品名）で upsert
+    - 一括保存は1トランザクション
+    - 公式/Amazon/楽天URL・正規化製品名・欲求のインデックス
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        self.path = Path(path or settings.product_db_path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                product_key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                name_norm TEXT NOT NULL,
+                brand TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                price_amount REAL,
+                price_currency TEXT,
+                price_formatted TEXT,
+                official_url TEXT,
+                amazon_url TEXT,
+                rakuten_url TEXT,
+                instagram_url TEXT,
+                relevance_score INTEGER NOT NULL DEFAULT 0,
+                reasoning TEXT NOT NULL DEFAULT '',
+                source_language TEXT NOT NULL DEFAULT '',
+                source_url TEXT NOT NULL DEFAULT '',
+                desire TEXT NOT NULL DEFAULT '',
+                extracted_at TEXT NOT NULL,
+                first_seen_at TEXT NOT NULL
+            )
+            """
+        )
+        for column in INDEXED_COLUMNS:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_products_{column} "
+                f"ON products({column})"
+            )
+        self._conn.commit()
+        self._migrate_keys()
+
+    def _migrate_keys(self) -> None:
+        """古い形式の同一性キーで保存された行のキーを付け直す"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= KEY_VERSION:
+            return
+
+        rows = self._conn.execute(
+            "SELECT product_key, name, brand, official_url, amazon_url, rakuten_url"
+            " FROM products"
+        ).fetchall()
+        updates = [
+            (identity_key(name, brand, urls), key)
+            for key, name, brand, *urls in rows
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE OR REPLACE products SET product_key = ? WHERE product_key = ?",
+                [(new, old) for new, old in updates if new != old],
+            )
+            self._conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+        if rows:
+            logger.info(f"同一性キーを更新しました: {len(rows)}件")
+
+    def save(self, product: Product) -> None:
+        """
+        単一の製品を保存（同じ製品が保存済みなら更新）
+
+        Args:
+            product: 保存する製品
+        """
+        self.save_batch([product])
+
+    def save_batch(self, products: list[Product]) -> None:
+        """
+        複数の製品を1トランザクションで一括保存
+
+        同一性キーが一致する製品は上書きし、初回保存日時だけを残す。
+
+        Args:
+            products: 保存する製品のリスト
+        """
+        if not products:
+            return
+
+        now = datetime.now().isoformat()
+        rows = [(product_key(p), now, *_product_to_row(p)) for p in products]
+
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(_UPSERT_SQL, rows)
+            except sqlite3.Error as e:
+                logger.error(f"バッチ保存エラー: {e}")
+                raise
+
+        logger.info(f"バッチ保存完了: {len(products)}件")
+
+    def _query(self, where: str = "", params: tuple = ()) -> list[Product]:
+        with self._lock:
+            rows = self._conn.execute(f"{_SELECT_SQL} {where}", params).fetchall()
+        return [_row_to_product(row) for row in rows]
+
+    def find_by_url(self, url: str) -> Optional[Product]:
+        """
+        URLで製品を検索（公式・Amazon・楽天URLのいずれかに一致）
+
+        Args:
+            url: 検索するURL
+
+        Returns:
+            見つかった製品、または None
+        """
+        products = self._query(
+            "WHERE official_url = ? OR amazon_url = ? OR rakuten_url = ? LIMIT 1",
+            (url, url, url),
+        )
+        return products[0] if products else None
+
+    def find_by_desire(self, desire: str) -> list[Product]:
+        """
+        欲求に紐づく製品を適合度の高い順に取得
+
+        Args:
+            desire: 欲求
+
+        Returns:
+            製品のリスト
+        """
+        return self._query(
+            "WHERE desire = ? ORDER BY relevance_score DESC", (desire,)
+        )
+
+    def get_all(self) -> list[Product]:
+        """
+        全製品を取得
+
+        Returns:
+            製品のリスト
+        """
+        products = self._query()
+        logger.info(f"全製品取得完了: {len(products)}件")
+        return products
+
+    def exists_by_name(self, name: str) -> bool:
+        """
+        製品名で重複チェック（大文字小文字・全角半角・空白の違いは無視）
+
+        Args:
+            name: チェックする製品名
+
+        Returns:
+            存在すればTrue
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM products WHERE name_norm = ? LIMIT 1",
+                (normalize_name(name),),
+            ).fetchone()
+        return row is not None
+
+    def fetch_columns(self, columns: Iterable[str] = COLUMNS) -> dict[str, list]:
+        """
+        全製品を列ごとの値のリストとして取得（Product に変換しない）
+
+        Args:
+            columns: 取得する列（COLUMNS の一部）
+
+        Returns:
+            列名 → 値のリスト
+        """
+        columns = list(columns)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"不明な列です: {sorted(unknown)}")
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM products"
+            ).fetchall()
+
+        values = list(zip(*rows)) if rows else [() for _ in columns]
+        return {column: list(v) for column, v in zip(columns, values)}
+
+    def count(self) -> int:
+        """保存されている製品数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,306 @@
+"""
+ライトビハインド書き込みバッファ
+
+save_batch で受け取った製品をメモリに溜め、件数・経過時間・終了時の
+いずれかを契機にまとめて書き込む。複数のハント（欲求）の行を1回の
+append_rows にまとめることで、Google Sheets API の呼び出しを大幅に減らす。
+"""
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from tenacity import Retrying, stop_after_attempt, wait_exponential_jitter
+
+from src.core.config import settings
+from src.core.interfaces import ProductRepository
+from src.domain.models import Product
+
+logger = logging.getLogger(__name__)
+
+
+class FlushError(Exception):
+    """書き込みバッファの行を書き込めなかった"""
+
+    pass
+
+
+class WriteBehindRepository(ProductRepository):
+    """
+    書き込みをバックグラウンドでまとめて行うリポジトリのラッパー
+
+    特徴:
+    - flush_size 件溜まるか、最古の行が max_age 秒を超えたら書き込む
+    - バッファが max_buffer 件に達したら書き込みが進むまで save_batch を待たせる
+    - 書き込み失敗は指数バックオフでリトライし、失敗した行はバッファに残す
+    - プロセス終了時（atexit）に残りを書き込む
+
+    強制終了（SIGKILL・OOM等）ではバッファ内の行は失われる。
+    書き込みの完了を知りたい場合は save_batch_deferred の Future を使う。
+    読み取りは書き込み待ちの行を反映するため、先にバッファを書き込んでから行う。
+    """
+
+    def __init__(
+        self,
+        repository: ProductRepository,
+        flush_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_buffer: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.repository = repository
+        self.flush_size = max(1, flush_size or settings.sheets_flush_size)
+        self.max_age = settings.sheets_flush_interval if max_age is None else max_age
+        self.max_buffer = max(
+            self.flush_size, max_buffer or settings.sheets_buffer_max
+        )
+        self.max_retries = max(1, max_retries or settings.sheets_flush_retries)
+
+        self._buffer: list[Product] = []
+        self._oldest_at: Optional[float] = None  # バッファ内の最古の行を受け取った時刻
+        self._backoff_until = 0.0  # リトライを使い切った後、次に書き込みを試す時刻
+        # 行の通し番号（受け取った順）。buffer は先頭から書き込むので、
+        # 通し番号が flushed_count 以下の行は書き込み済み
+        self._waiters: list[tuple[int, Future]] = []  # (最後の行の通し番号, 通知先)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # 書き込みを直列化
+        self._closed = False
+
+        self.enqueued_count = 0
+        self.flushed_count = 0
+        self.flush_calls = 0
+        self.failed_flushes = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save(self, product: Product) -> None:
+        """単一の製品をバッファに追加"""
+        self.save_batch([product])
+
+    def save_batch(self, products: list[Product]) -> None:
+        """
+        製品をバッファに追加（書き込みはバックグラウンドで行う）
+
+        バッファが上限に達している場合は空きができるまで待つ。
+
+        Args:
+            products: 保存する製品のリスト
+        """
+        self._enqueue(products)
+
+    def save_batch_deferred(self, products: list[Product]) -> Future:
+        """
+        製品をバッファに追加し、書き込みの完了を Future で通知する
+
+        すぐには書き込まず、通常の条件（件数・経過時間・終了時）で他の行と
+        まとめて書き込んだ時点で Future を完了させる。行を含むバッチの
+        書き込みに失敗した場合は FlushError を設定する（行はバッファに残る）。
+
+        Args:
+            products: 保存する製品のリスト
+
+        Returns:
+            書き込みの完了を通知する Future
+        """
+        future: Future = Future()
+        sequence = self._enqueue(products)
+        with self._cond:
+            if sequence is not None and self.flushed_count < sequence:
+                self._waiters.append((sequence, future))
+                return future
+        future.set_result(None)
+        return future
+
+    def _enqueue(self, products: list[Product]) -> Optional[int]:
+        """
+        製品をバッファに追加
+
+        Returns:
+            追加した最後の行の通し番号（バッファを経由せずに書き込んだ場合は None）
+        """
+        if not products:
+            return None
+
+        with self._cond:
+            while (
+                self._buffer
+                and len(self._buffer) + len(products) > self.max_buffer
+                and not self._closed
+            ):
+                self._cond.notify_all()
+                self._cond.wait(timeout=1.0)
+
+            closed = self._closed
+            if not closed:
+                if not self._buffer:
+                    self._oldest_at = time.monotonic()
+                self._buffer.extend(products)
+                self.enqueued_count += len(products)
+                sequence = self.enqueued_count
+                # 書き込みスレッドに待機時間を計算し直させる
+                self._cond.notify_all()
+
+        if closed:
+            # 終了処理後の書き込みはその場で行う
+            self.repository.save_batch(products)
+            return None
+        logger.debug(f"書き込みバッファに追加: {len(products)}件")
+        return sequence
+
+    def _due(self) -> bool:
+        """バッファを書き込むべきか（呼び出し側で _cond を保持）"""
+        if not self._buffer:
+            return False
+        if self._closed:
+            return True
+        if time.monotonic() < self._backoff_until:
+            return False
+        return (
+            len(self._buffer) >= self.flush_size
+            or time.monotonic() - self._oldest_at >= self.max_age
+        )
+
+    def _wait_timeout(self) -> Optional[float]:
+        """次に書き込み条件を確認するまでの秒数（呼び出し側で _cond を保持）"""
+        if not self._buffer:
+            return None
+        deadline = max(self._oldest_at + self.max_age, self._backoff_until)
+        return max(0.0, deadline - time.monotonic())
+
+    def _run(self) -> None:
+        """バックグラウンドの書き込みループ"""
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    self._cond.wait(self._wait_timeout())
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        バッファの行を書き込む
+
+        書き込んだ（または書き込みに失敗した）行を待つ Future を完了させる。
+
+        Returns:
+            書き込んだ製品数（失敗した場合は0、行はバッファに残る）
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._buffer)
+            if not batch:
+                return 0
+
+            error = None
+            try:
+                for attempt in Retrying(
+                    stop=stop_after_attempt(self.max_retries),
+                    wait=wait_exponential_jitter(initial=1, max=60),
+                    before_sleep=lambda retry_state: logger.warning(
+                        f"書き込みバッファのリトライ: {retry_state.attempt_number}回目"
+                    ),
+                    reraise=True,
+                ):
+                    with attempt:
+                        self.flush_calls += 1
+                        self.repository.save_batch(batch)
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                waiters = self._pop_waiters(self.flushed_count + len(batch))
+                if error is None:
+                    # 書き込み中に追加された行は残す
+                    del self._buffer[: len(batch)]
+                    self._oldest_at = time.monotonic() if self._buffer else None
+                    self._backoff_until = 0.0
+                    self.flushed_count += len(batch)
+                else:
+                    self.failed_flushes += 1
+                    self._backoff_until = time.monotonic() + self.max_age
+                self._cond.notify_all()
+
+        # 通知先のコールバックは書き込みのロックを外してから呼ぶ
+        if error is not None:
+            logger.error(
+                f"書き込みバッファの保存エラー（{len(batch)}件を保持）: {error}"
+            )
+            failure = FlushError(f"書き込みバッファの保存に失敗しました: {error}")
+            for future in waiters:
+                future.set_exception(failure)
+            return 0
+
+        for future in waiters:
+            future.set_result(None)
+        logger.info(f"書き込みバッファを保存しました: {len(batch)}件")
+        return len(batch)
+
+    def _pop_waiters(self, sequence: int) -> list[Future]:
+        """通し番号 sequence までの行を待つ Future を取り出す（_cond を保持して呼ぶ）"""
+        ready = [future for last, future in self._waiters if last <= sequence]
+        self._waiters = [(last, f) for last, f in self._waiters if last > sequence]
+        return ready
+
+    def close(self) -> None:
+        """バックグラウンドの書き込みを止め、残りの行を書き込む"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=60)
+
+        self.flush()
+        with self._cond:
+            pending = len(self._buffer)
+        if pending:
+            logger.error(f"書き込みできなかった製品があります: {pending}件")
+
+        stats = self.get_statistics()
+        logger.info(
+            f"書き込みバッファ: {stats['flushed']}件を{stats['flush_calls']}回で保存"
+        )
+
+    def find_by_url(self, url: str) -> Optional[Product]:
+        """URLで製品を検索（書き込み待ちの行を書き込んでから）"""
+        self.flush()
+        return self.repository.find_by_url(url)
+
+    def get_all(self) -> list[Product]:
+        """全製品を取得（書き込み待ちの行を書き込んでから）"""
+        self.flush()
+        return self.repository.get_all()
+
+    def exists_by_name(self, name: str) -> bool:
+        """製品名で重複チェック（書き込み待ちの行を書き込んでから）"""
+        self.flush()
+        return self.repository.exists_by_name(name)
+
+    def get_statistics(self) -> dict:
+        """
+        書き込みバッファの統計を取得
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._cond:
+            pending = len(self._buffer)
+        rows_per_call = (
+            self.flushed_count / self.flush_calls if self.flush_calls else 0.0
+        )
+        return {
+            "enqueued": self.enqueued_count,
+            "flushed": self.flushed_count,
+            "pending": pending,
+            "flush_calls": self.flush_calls,
+            "failed_flushes": self.failed_flushes,
+            "rows_per_call": f"{rows_per_call:.1f}",
+        }
@@ -0,0 +1,191 @@
+"""
+テスト共通のフィクスチャ
+
+外部API（Gemini・Serper・Firecrawl・Google Sheets）を呼ばない代替クライアントを提供する。
+"""
+
+import re
+import threading
+
+import gspread
+import pytest
+
+from src.core.config import settings
+from src.domain.models import DesireAnalysis, Product, SearchResult, TranslatedQuery
+from src.infrastructure.api_clients.firecrawl_client import ScrapedPage
+from src.infrastructure.repositories.gsheets_repo import GSheetsProductRepository
+
+
+class FakeLLMClient:
+    """欲求分析・製品抽出を固定の結果で返す GeminiClient の代替"""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            self.calls.append(name)
+
+    def analyze_desire(self, desire: str) -> DesireAnalysis:
+        self._record("analyze_desire")
+        return DesireAnalysis(
+            original_desire=desire,
+            refined_desire=desire,
+            keywords=[desire],
+            translated_queries=[
+                TranslatedQuery(original=desire, language="en", query=desire)
+            ],
+        )
+
+    async def analyze_desire_async(self, desire: str) -> DesireAnalysis:
+        return self.analyze_desire(desire)
+
+    def extract_product(self, content: str, desire: str) -> Product:
+        self._record("extract_product")
+        url = content.split()[0]
+        return Product(
+            name=f"{desire} product {url.rsplit('/', 1)[-1]}",
+            brand="Acme",
+            official_url=url,
+            relevance_score=8,
+            desire=desire,
+            source_url=url,
+        )
+
+    async def extract_product_async(self, content: str, desire: str) -> Product:
+        return self.extract_product(content, desire)
+
+
+class FakeSearchClient:
+    """欲求ごとに固定のURLを返す SerperClient の代替"""
+
+    def __init__(self, results_per_query: int = 2):
+        self.results_per_query = results_per_query
+        self.calls = 0
+
+    def search_in_language(
+        self, query: str, language: str, num_results: int = 5
+    ) -> list[SearchResult]:
+        self.calls += 1
+        slug = query.replace(" ", "-")
+        return [
+            SearchResult(
+                title=f"{query} {i}",
+                url=f"https://acme.example/{slug}/item-{i}",
+                position=i + 1,
+            )
+            for i in range(self.results_per_query)
+        ]
+
+    async def search_in_language_async(
+        self, query: str, language: str, num_results: int = 5
+    ) -> list[SearchResult]:
+        return self.search_in_language(query, language, num_results)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeScraperClient:
+    """URLを先頭に含む本文を返す FirecrawlClient の代替"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def scrape_page_with_fallback(self, url: str) -> ScrapedPage:
+        self.calls += 1
+        return ScrapedPage(content=f"{url} " + "product details " * 20)
+
+    async def scrape_page_with_fallback_async(self, url: str) -> ScrapedPage:
+        return self.scrape_page_with_fallback(url)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeSpreadsheet:
+    """更新日時だけを持つ gspread.Spreadsheet の代替"""
+
+    def __init__(self):
+        self.updates = 0
+
+    def get_lastUpdateTime(self) -> str:
+        return f"2026-01-01T00:00:{self.updates:02d}Z"
+
+
+class FakeWorksheet:
+    """
+    メモリ上の gspread.Worksheet の代替
+
+    get_all_records は gspread の実装をそのまま使うため、
+    数値に見えるセルの変換（numericise）も本物と同じになる。
+    """
+
+    get_all_records = gspread.Worksheet.get_all_records
+
+    def __init__(self, rows: list[list[str]]):
+        self.rows = [list(row) for row in rows]
+        self.spreadsheet = FakeSpreadsheet()
+        self.calls: list[str] = []
+
+    def get(self, value_render_option=None, pad_values=False):
+        self.calls.append("get")
+        width = max((len(row) for row in self.rows), default=0)
+        return [row + [""] * (width - len(row)) for row in self.rows] or [[]]
+
+    def append_row(self, row: list[str]) -> None:
+        self.append_rows([row])
+
+    def append_rows(self, rows: list[list[str]]) -> None:
+        self.calls.append("append_rows")
+        self.rows.extend(list(row) for row in rows)
+        self.spreadsheet.updates += 1
+
+    def batch_update(self, data: list[dict]) -> None:
+        self.calls.append("batch_update")
+        for item in data:
+            row_number = int(re.match(r"[A-Z]+(\d+)", item["range"]).group(1))
+            self.rows[row_number - 1] = list(item["values"][0])
+        self.spreadsheet.updates += 1
+
+
+@pytest.fixture(autouse=True)
+def _isolated_settings(monkeypatch, tmp_path):
+    """キャッシュ・保存先を一時ディレクトリに向け、外部への依存を切る"""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "product_db_path", str(tmp_path / "products.db"))
+    monkeypatch.setattr(settings, "batch_journal_path", "")
+    monkeypatch.setattr(settings, "prefilter_enabled", False)
+    monkeypatch.setattr(settings, "content_distillation_enabled", False)
+    monkeypatch.setattr(settings, "structured_data_enabled", False)
+    monkeypatch.setattr(settings, "extraction_batch_size", 1)
+
+
+@pytest.fixture
+def worksheet() -> FakeWorksheet:
+    return FakeWorksheet([Product.get_header_row()])
+
+
+@pytest.fixture
+def sheets_repository(worksheet):
+    repository = GSheetsProductRepository(
+        spreadsheet_id="test", snapshot_ttl=300, change_detection=True
+    )
+    repository._worksheet = worksheet
+    return repository
+
+
+@pytest.fixture
+def llm_client() -> FakeLLMClient:
+    return FakeLLMClient()
+
+
+@pytest.fixture
+def search_client() -> FakeSearchClient:
+    return FakeSearchClient()
+
+
+@pytest.fixture
+def scraper_client() -> FakeScraperClient:
+    return FakeScraperClient()
@@ -0,0 +1,153 @@
+"""BatchJournal とバッチ処理の再開のテスト"""
+
+import asyncio
+
+import pytest
+
+from src.agents.analyst import AnalystAgent
+from src.agents.director import DirectorAgent
+from src.agents.researcher import ResearcherAgent
+from src.infrastructure.repositories.batch_journal import (
+    STAGE_ANALYSIS,
+    STAGE_PRODUCTS,
+    BatchJournal,
+    batch_id,
+)
+from src.infrastructure.repositories.sqlite_repo import SQLiteProductRepository
+
+
+class FailingRepository(SQLiteProductRepository):
+    """指定した欲求の製品の保存に失敗するリポジトリ"""
+
+    def __init__(self, path, fail_desire: str):
+        super().__init__(path)
+        self.fail_desire = fail_desire
+
+    def save_batch(self, products):
+        if any(p.desire == self.fail_desire for p in products):
+            raise RuntimeError("write failed")
+        super().save_batch(products)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = BatchJournal(tmp_path / "journal.sqlite3")
+    yield journal
+    journal.close()
+
+
+def make_director(llm_client, search_client, scraper_client, repository):
+    return DirectorAgent(
+        llm_client=llm_client,
+        researcher=ResearcherAgent(
+            search_client=search_client, scraper_client=scraper_client
+        ),
+        analyst=AnalystAgent(llm_client=llm_client, two_phase=False),
+        repository=repository,
+        pipeline=False,
+        incremental=False,
+    )
+
+
+def test_batch_id_depends_on_desires():
+    assert batch_id(["a", "b"]) == batch_id(["a", "b"])
+    assert batch_id(["a", "b"]) != batch_id(["b", "a"])
+
+
+def test_start_without_resume_clears_previous_run(journal):
+    run_id = journal.start(["a", "b"])
+    journal.checkpoint(run_id, 0).store(STAGE_ANALYSIS, {"x": 1})
+    journal.complete(run_id, 0, {"desire": "a"})
+
+    assert journal.start(["a", "b"], resume=True) == run_id
+    assert journal.completed(run_id) == {0: {"desire": "a"}}
+
+    journal.start(["a", "b"], resume=False)
+    assert journal.completed(run_id) == {}
+    assert journal.load_artifact(run_id, 0, STAGE_ANALYSIS) is None
+
+
+def test_checkpoint_artifacts_and_saved_marker(journal):
+    run_id = journal.start(["a"])
+    checkpoint = journal.checkpoint(run_id, 0)
+
+    assert checkpoint.load(STAGE_PRODUCTS) is None
+    checkpoint.store(STAGE_PRODUCTS, {"products": ["日本語"]})
+    assert checkpoint.load(STAGE_PRODUCTS) == {"products": ["日本語"]}
+
+    assert not checkpoint.saved
+    checkpoint.mark_saved(3)
+    assert checkpoint.saved
+
+
+def test_failed_desire_is_not_completed(journal):
+    run_id = journal.start(["a", "b"])
+    journal.complete(run_id, 0, {"desire": "a"})
+    journal.complete(run_id, 1, {"desire": "b"}, error="boom")
+
+    assert list(journal.completed(run_id)) == [0]
+    progress = journal.get_progress(run_id)
+    assert progress["done"] == 1
+    assert progress["failed"] == 1
+    assert progress["progress"] == "50.0%"
+
+
+def test_resume_reuses_completed_and_saved_artifacts(
+    tmp_path, journal, llm_client, search_client, scraper_client
+):
+    desires = ["quiet keyboard", "ergonomic chair"]
+    failing = FailingRepository(tmp_path / "products.sqlite3", "ergonomic chair")
+    director = make_director(llm_client, search_client, scraper_client, failing)
+
+    first = director.hunt_batch(desires, journal=journal)
+    assert not first[0].errors
+    assert first[1].errors  # 保存に失敗した欲求は failed として残る
+    failing.close()
+
+    calls = (len(llm_client.calls), search_client.calls, scraper_client.calls)
+    repository = SQLiteProductRepository(tmp_path / "products.sqlite3")
+    director = make_director(llm_client, search_client, scraper_client, repository)
+
+    second = director.hunt_batch(desires, journal=journal, resume=True)
+
+    # 検索・スクレイピング・抽出はやり直さず、保存だけを実行する
+    assert (len(llm_client.calls), search_client.calls, scraper_client.calls) == calls
+    assert [r.desire for r in second] == desires
+    assert second[0].products == first[0].products
+    assert not second[1].errors
+    assert second[1].total_saved == len(second[1].products) > 0
+    assert {p.desire for p in repository.get_all()} == set(desires)
+    repository.close()
+
+
+def test_hunt_batch_async_with_journal(
+    tmp_path, journal, llm_client, search_client, scraper_client
+):
+    desires = ["quiet keyboard", "ergonomic chair", "desk lamp"]
+    repository = SQLiteProductRepository(tmp_path / "products.sqlite3")
+    director = make_director(llm_client, search_client, scraper_client, repository)
+
+    results = asyncio.run(
+        director.hunt_batch_async(desires, concurrency=2, journal=journal)
+    )
+
+    assert [r.desire for r in results] == desires
+    assert all(r.products and not r.errors for r in results)
+    assert journal.get_progress(batch_id(desires))["done"] == len(desires)
+
+    calls = len(llm_client.calls)
+    resumed = asyncio.run(
+        director.hunt_batch_async(desires, journal=journal, resume=True)
+    )
+    assert len(llm_client.calls) == calls
+    assert [r.products for r in resumed] == [r.products for r in results]
+    repository.close()
+
+
+def test_hunt_batch_async_without_journal(llm_client, search_client, scraper_client):
+    director = make_director(llm_client, search_client, scraper_client, None)
+
+    results = asyncio.run(director.hunt_batch_async(["quiet keyboard"]))
+
+    assert len(results) == 1
+    assert results[0].products
@@ -0,0 +1,138 @@
+"""FirecrawlClient のフォールバックと予算のテスト"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.core.config import settings
+from src.domain.hunt_budget import (
+    FIRECRAWL_CREDITS,
+    BudgetExceeded,
+    HuntBudget,
+    use_budget,
+)
+from src.infrastructure.api_clients import firecrawl_client
+from src.infrastructure.api_clients.firecrawl_client import (
+    FALLBACK_TIMEOUT,
+    FirecrawlClient,
+)
+
+PAGE = b"<html><body>" + b"<p>product details</p>" * 20 + b"</body></html>"
+
+
+class FakeResponse:
+    """チャンクを delay 秒ずつ遅れて返す requests のレスポンスの代替"""
+
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def __init__(self, chunks: list[bytes], delay: float = 0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for chunk in self.chunks:
+            time.sleep(self.delay)
+            yield chunk
+
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+        self.timeouts: list[float] = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.timeouts.append(timeout)
+        return self.response
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "scrape_cache_enabled", False)
+    client = FirecrawlClient(api_key="test")
+
+    def scrape_page(url):
+        raise RuntimeError("firecrawl down")
+
+    client.scrape_page = scrape_page
+    return client
+
+
+def use_session(monkeypatch, response: FakeResponse) -> FakeSession:
+    session = FakeSession(response)
+    monkeypatch.setattr(firecrawl_client, "get_session", lambda: session)
+    return session
+
+
+def test_fallback_timeout_is_capped_at_deadline(monkeypatch, client):
+    session = use_session(monkeypatch, FakeResponse([PAGE]))
+
+    page = client.scrape_page_with_fallback("https://acme.example/lamp")
+    with use_budget(HuntBudget(max_seconds=2)):
+        client.scrape_page_with_fallback("https://acme.example/lamp")
+
+    assert "product details" in page.content
+    assert session.timeouts[0] == FALLBACK_TIMEOUT
+    assert 0 < session.timeouts[1] <= 2
+
+
+def test_slow_fallback_stops_at_deadline(monkeypatch, client):
+    use_session(monkeypatch, FakeResponse([b"<p>x</p>"] * 100, delay=0.01))
+    budget = HuntBudget(max_seconds=0.2)
+
+    started = time.monotonic()
+    with use_budget(budget), pytest.raises(BudgetExceeded):
+        client.scrape_page_with_fallback("https://acme.example/lamp")
+
+    assert time.monotonic() - started < 0.6
+    assert budget.exceeded
+
+
+def test_budget_exceeded_does_not_fall_back(monkeypatch, client):
+    session = use_session(monkeypatch, FakeResponse([PAGE]))
+    budget = HuntBudget(max_firecrawl_credits=1)
+    budget.charge(FIRECRAWL_CREDITS)
+
+    def scrape_page(url):
+        budget.check(FIRECRAWL_CREDITS)
+
+    client.scrape_page = scrape_page
+    with use_budget(budget), pytest.raises(BudgetExceeded):
+        client.scrape_page_with_fallback("https://acme.example/lamp")
+
+    assert session.timeouts == []
+
+
+def test_async_fallback_timeout_is_capped_at_deadline(client):
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, headers=FakeResponse.headers, content=PAGE)
+
+    async def scrape_page_async(url):
+        raise RuntimeError("firecrawl down")
+
+    async def run():
+        client.scrape_page_async = scrape_page_async
+        client._async_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with use_budget(HuntBudget(max_seconds=2)):
+            page = await client.scrape_page_with_fallback_async(
+                "https://acme.example/lamp"
+            )
+        await client.aclose()
+        return page
+
+    page = asyncio.run(run())
+    assert "product details" in page.content
+    assert 0 < timeouts[0] <= 2
@@ -0,0 +1,82 @@
+"""GSheetsProductRepository のテスト（メモリ上のワークシートを使用）"""
+
+from datetime import datetime
+
+from src.agents.director import seed_from_sheets
+from src.domain.models import PriceInfo, Product
+from src.infrastructure.repositories.sqlite_repo import SQLiteProductRepository
+
+
+def make_product(i: int, **update) -> Product:
+    product = Product(
+        name=f"Lamp {i}",
+        brand="Acme",
+        official_url=f"https://acme.example/lamp/{i}",
+        price=PriceInfo(amount=19.9, currency="USD", formatted="$19.90"),
+        relevance_score=7,
+        desire="light",
+        extracted_at=datetime(2026, 1, 1, 12, 0),
+    )
+    return product.model_copy(update=update)
+
+
+def test_seed_sqlite_from_sheets(tmp_path, sheets_repository, worksheet):
+    products = [make_product(i) for i in range(3)]
+    worksheet.append_rows([p.to_row() for p in products])
+    repository = SQLiteProductRepository(tmp_path / "products.sqlite3")
+
+    assert seed_from_sheets(repository, sheets_repository) == 3
+    assert repository.exists_by_name("lamp 1")
+    stored = repository.find_by_url("https://acme.example/lamp/2")
+    assert stored.extracted_at == datetime(2026, 1, 1, 12, 0)
+
+    # 空でなければ取り込まない
+    assert seed_from_sheets(repository, sheets_repository) == 0
+    assert repository.count() == 3
+    repository.close()
+
+
+def test_find_by_url_after_url_change(sheets_repository):
+    product = make_product(1, rakuten_url="https://item.rakuten.co.jp/shop/old/")
+    sheets_repository.save(product)
+    moved = product.model_copy(
+        update={"rakuten_url": "https://item.rakuten.co.jp/shop/new/"}
+    )
+    sheets_repository.save_batch([moved])
+
+    assert sheets_repository.find_by_url(product.rakuten_url) is None
+    assert sheets_repository.find_by_url(moved.rakuten_url).name == product.name
+
+
+def test_unchanged_rows_are_not_rewritten(sheets_repository, worksheet):
+    # 数値に見える価格・説明も、シートから読み直した後に同じ内容と判定する
+    product = make_product(
+        1,
+        description="0012",
+        price=PriceInfo(amount=19.9, currency="", formatted="19.90"),
+    )
+    sheets_repository.save_batch([product])
+    sheets_repository.refresh()
+    worksheet.calls.clear()
+
+    sheets_repository.save_batch(
+        [product.model_copy(update={"extracted_at": datetime(2026, 2, 1)})]
+    )
+
+    assert worksheet.calls == ["get"]
+    assert sheets_repository.find_by_url(product.official_url).description == "0012"
+
+
+def test_upsert_updates_changed_rows_and_appends_new(sheets_repository, worksheet):
+    sheets_repository.save_batch([make_product(1), make_product(2)])
+    sheets_repository.refresh()
+    worksheet.calls.clear()
+
+    sheets_repository.save_batch(
+        [make_product(1, relevance_score=9), make_product(2), make_product(3)]
+    )
+
+    assert worksheet.calls == ["get", "batch_update", "append_rows"]
+    assert len(worksheet.rows) == 4
+    updated = sheets_repository.find_by_url(make_product(1).official_url)
+    assert updated.relevance_score == 9
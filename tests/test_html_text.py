@@ -0,0 +1,177 @@
+"""StreamingTextExtractor とチャンク受信のテスト"""
+
+from src.domain.structured_data import StructuredDataParser
+from src.infrastructure.api_clients.html_text import (
+    StreamingTextExtractor,
+    extract_text_from_chunks,
+    html_to_text,
+)
+
+
+def chunked(data: bytes, size: int = 7):
+    """受信を模してバイト列を小さなチャンクに分ける"""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_skips_nested_script_nav_and_hidden_elements():
+    html = """
+    <html><head><title>ignored</title></head><body>
+    <nav><ul><li>Menu</li></ul></nav>
+    <h1>Product</h1>
+    <div hidden><p>secret</p></div>
+    <span aria-hidden="true">icon</span>
+    <p>Great <b>value</b></p>
+    <script>var x = "<p>not text</p>";</script>
+    <footer>Copyright</footer>
+    </body></html>
+    """
+    assert html_to_text(html) == "Product\nGreat value"
+
+
+def test_unclosed_children_are_closed_with_parent():
+    html = "<div><nav><ul><li>menu</div><p>after</p>"
+    assert html_to_text(html) == "after"
+
+
+def test_missing_head_end_tag():
+    html = "<html><head><title>t</title><body><p>body text</p></body></html>"
+    assert html_to_text(html) == "body text"
+
+
+def test_max_chars_marks_done():
+    extractor = StreamingTextExtractor(max_chars=10)
+    extractor.feed("<p>first line</p><p>second line</p>")
+
+    assert extractor.done
+    assert extractor.get_text() == "first line"
+
+
+def test_feed_in_small_chunks_matches_whole_document():
+    html = "<p>caf&eacute; &amp; <i>bar</i></p><ul><li>one</li><li>two</li></ul>"
+    extractor = StreamingTextExtractor()
+    for i in range(0, len(html), 3):
+        extractor.feed(html[i : i + 3])
+
+    assert extractor.get_text() == html_to_text(html) == "café & bar\none\ntwo"
+
+
+def test_chunks_decode_charset_from_meta():
+    html = '<meta charset="shift_jis"><p>日本語の説明</p>'.encode("shift_jis")
+    text = extract_text_from_chunks(
+        chunked(html), "text/html", max_chars=1000, max_bytes=10_000
+    )
+    assert text == "日本語の説明"
+
+
+def test_chunks_stop_when_text_is_complete():
+    html = b"<p>word word</p>" * 2000
+    chunks = chunked(html, 64)
+    consumed = []
+
+    def stream():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    text = extract_text_from_chunks(
+        stream(), "text/html; charset=utf-8", max_chars=50, max_bytes=1_000_000
+    )
+
+    assert len(text) <= 50
+    assert len(consumed) < len(chunks)
+
+
+def test_chunks_stop_at_max_bytes():
+    html = b"<p>" + b"word " * 2000 + b"</p>"
+    consumed = []
+
+    def stream():
+        for chunk in chunked(html, 100):
+            consumed.append(chunk)
+            yield chunk
+
+    extract_text_from_chunks(stream(), "text/html", max_chars=None, max_bytes=500)
+    assert sum(map(len, consumed)) == 500
+
+
+def test_structured_parser_sees_json_ld_after_text_limit():
+    html = (
+        b"<html><body>"
+        + b"<p>long description</p>" * 500
+        + b'<script type="application/ld+json">'
+        + b'{"@type": "Product", "name": "Desk Lamp", "brand": "Acme"}'
+        + b"</script></body></html>"
+    )
+    parser = StructuredDataParser()
+
+    text = extract_text_from_chunks(
+        chunked(html, 256),
+        "text/html; charset=utf-8",
+        max_chars=100,
+        max_bytes=1_000_000,
+        structured_parser=parser,
+    )
+
+    assert len(text) <= 100
+    assert parser.get_data()["name"] == "Desk Lamp"
+
+
+def consume(data: bytes, size: int = 256):
+    """チャンクを返しつつ、受信したチャンクを記録する"""
+    consumed = []
+
+    def stream():
+        for chunk in chunked(data, size):
+            consumed.append(chunk)
+            yield chunk
+
+    return stream(), consumed
+
+
+def test_chunks_stop_with_parser_once_product_is_found():
+    html = (
+        b"<html><head>"
+        + b'<script type="application/ld+json">'
+        + b'{"@type": "Product", "name": "Desk Lamp", "offers": {"price": "19.90"}}'
+        + b"</script></head><body>"
+        + b"<p>long description</p>" * 2000
+        + b"</body></html>"
+    )
+    parser = StructuredDataParser()
+    stream, consumed = consume(html)
+
+    text = extract_text_from_chunks(
+        stream,
+        "text/html",
+        max_chars=100,
+        max_bytes=1_000_000,
+        structured_parser=parser,
+    )
+
+    assert len(text) <= 100
+    assert parser.done
+    assert parser.get_data()["price"] == 19.9
+    assert sum(map(len, consumed)) < len(html) // 10
+
+
+def test_chunks_stop_with_parser_at_end_of_body():
+    html = (
+        b"<html><body>"
+        + b"<p>text</p>" * 100
+        + b"</body></html>"
+        + b"<!-- tracking -->" * 5000
+    )
+    parser = StructuredDataParser()
+    stream, consumed = consume(html)
+
+    extract_text_from_chunks(
+        stream,
+        "text/html",
+        max_chars=50,
+        max_bytes=1_000_000,
+        structured_parser=parser,
+    )
+
+    assert parser.done
+    assert parser.get_data() == {}
+    assert sum(map(len, consumed)) < len(html) // 10
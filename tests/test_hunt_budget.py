@@ -0,0 +1,102 @@
+"""ハント予算とレートリミッタの待機制限のテスト"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.domain.hunt_budget import (
+    SERPER_CALLS,
+    BudgetExceeded,
+    HuntBudget,
+    acquire_within_budget,
+    acquire_within_budget_async,
+    timeout_within_budget,
+    use_budget,
+)
+from src.infrastructure.rate_limit.sqlite_bucket import SQLiteTokenBucket
+from src.infrastructure.rate_limit.token_bucket import TokenBucket
+
+
+def test_acquire_max_wait_gives_token_back():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=1)
+    assert bucket.acquire()
+
+    # 次のトークンは1秒後なので、0.1秒しか待てなければ取得しない
+    assert not bucket.acquire(max_wait=0.1)
+    assert bucket.get_statistics()["acquired"] == 1
+
+    time.sleep(1.0)
+    assert bucket.acquire(max_wait=0.1)
+
+
+def test_sqlite_bucket_gives_token_back(tmp_path):
+    bucket = SQLiteTokenBucket(
+        "test", rate_per_minute=60, burst=1, path=tmp_path / "rate.sqlite3"
+    )
+    assert bucket.acquire()
+    assert not bucket.acquire(max_wait=0.1)
+
+    time.sleep(1.0)
+    assert bucket.acquire(max_wait=0.1)
+    bucket.close()
+
+
+def test_budget_is_checked_before_acquiring():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=1)
+    budget = HuntBudget(max_serper_calls=1)
+    budget.charge(SERPER_CALLS)
+
+    with use_budget(budget), pytest.raises(BudgetExceeded):
+        acquire_within_budget(bucket, SERPER_CALLS)
+
+    # 予算超過のハントはトークンを消費しない
+    assert bucket.get_statistics()["acquired"] == 0
+    assert budget.exceeded
+
+
+def test_limiter_wait_is_capped_at_deadline():
+    bucket = TokenBucket("test", rate_per_minute=1, burst=1)
+    bucket.acquire()
+    budget = HuntBudget(max_seconds=0.2)
+
+    started = time.monotonic()
+    with use_budget(budget), pytest.raises(BudgetExceeded):
+        acquire_within_budget(bucket, SERPER_CALLS)
+
+    assert time.monotonic() - started < 0.2
+    assert "レート制限待ち" in budget.exceeded_reason
+
+
+def test_acquire_within_budget_async():
+    bucket = TokenBucket("test", rate_per_minute=1, burst=1)
+
+    async def run():
+        with use_budget(HuntBudget(max_seconds=5)):
+            await acquire_within_budget_async(bucket, SERPER_CALLS)
+            with pytest.raises(BudgetExceeded):
+                await acquire_within_budget_async(bucket, SERPER_CALLS)
+
+    asyncio.run(run())
+    assert bucket.get_statistics()["acquired"] == 1
+
+
+def test_acquire_without_budget_waits():
+    bucket = TokenBucket("test", rate_per_minute=600, burst=1)
+    acquire_within_budget(bucket)
+
+    started = time.monotonic()
+    acquire_within_budget(bucket)
+    assert time.monotonic() - started >= 0.05
+
+
+def test_timeout_within_budget():
+    assert timeout_within_budget(15) == 15
+
+    with use_budget(HuntBudget(max_seconds=2)):
+        assert 0 < timeout_within_budget(15) <= 2
+        assert timeout_within_budget(1) == 1
+
+    with use_budget(HuntBudget(max_seconds=0.01)), pytest.raises(BudgetExceeded):
+        time.sleep(0.02)
+        timeout_within_budget(15)
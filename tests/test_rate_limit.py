@@ -0,0 +1,81 @@
+"""適応的レート制限（AIMD）とプロセス間共有のテスト"""
+
+import sqlite3
+
+from src.core.config import Settings
+from src.infrastructure.rate_limit.registry import _create_bucket
+from src.infrastructure.rate_limit.sqlite_bucket import SQLiteTokenBucket
+from src.infrastructure.rate_limit.token_bucket import TokenBucket
+
+
+def make_sqlite_bucket(path, rate: float = 60) -> SQLiteTokenBucket:
+    return SQLiteTokenBucket(
+        "test",
+        rate_per_minute=rate,
+        burst=1,
+        path=path,
+        adaptive=True,
+        increase_step=10,
+        max_rate_per_minute=rate * 2,
+    )
+
+
+def test_default_ceiling_probes_above_configured_rate():
+    assert Settings.model_fields["rate_limit_max_factor"].default > 1.0
+
+    bucket = _create_bucket("test", rate=10, burst=1)
+    assert bucket.max_rate_per_minute > 10
+
+
+def test_aimd_increases_above_configured_rate_and_backs_off():
+    bucket = TokenBucket(
+        "test", 60, adaptive=True, increase_step=30, max_rate_per_minute=120
+    )
+    for _ in range(5):
+        bucket.on_success()
+    assert bucket.rate_per_minute == 120
+
+    bucket.on_throttled(retry_after=0)
+    assert bucket.rate_per_minute == 60
+    assert bucket.get_statistics()["throttled"] == 1
+
+
+def test_sqlite_bucket_shares_adapted_rate(tmp_path):
+    path = tmp_path / "rate.sqlite3"
+    first = make_sqlite_bucket(path)
+    second = make_sqlite_bucket(path)
+
+    # 一方が429を受けると、もう一方の補充速度も下がる
+    first.on_throttled(retry_after=0)
+    assert first.rate_per_minute == 30
+    assert second.acquire()
+    assert second.rate_per_minute == 30
+
+    # 成功による引き上げも共有する
+    second.on_success()
+    first.acquire(max_wait=10)
+    assert first.rate_per_minute == 40
+
+    first.close()
+    second.close()
+
+
+def test_sqlite_bucket_migrates_old_table(tmp_path):
+    path = tmp_path / "rate.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE buckets"
+        " (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO buckets VALUES ('test', 1.0, 0)")
+    conn.commit()
+    conn.close()
+
+    bucket = make_sqlite_bucket(path)
+    assert bucket.acquire()
+    bucket.on_throttled(retry_after=0)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT rate FROM buckets").fetchone() == (30.0,)
+    conn.close()
+    bucket.close()
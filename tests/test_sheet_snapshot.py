@@ -0,0 +1,68 @@
+"""SheetSnapshot のインデックスのテスト"""
+
+from src.domain.models import Product
+from src.infrastructure.repositories.product_identity import product_key
+from src.infrastructure.repositories.sheet_snapshot import SheetSnapshot
+
+
+def make_row(name: str, url: str) -> list[str]:
+    return Product(name=name, brand="Acme", official_url=url).to_row()
+
+
+def test_first_record_wins_for_duplicates():
+    snapshot = SheetSnapshot([])
+    snapshot.add_rows(
+        [
+            make_row("Desk Lamp", "https://acme.example/lamp"),
+            make_row("Desk Lamp", "https://acme.example/lamp"),
+        ]
+    )
+    lamp = Product(name="ｄｅｓｋ lamp", official_url="https://acme.example/lamp")
+
+    assert len(snapshot) == 2
+    assert snapshot.find_index(product_key(lamp)) == 0
+    assert snapshot.find_by_url("https://acme.example/lamp") is snapshot.records[0]
+    assert snapshot.exists_by_name("  DESK   LAMP ")
+    assert not snapshot.exists_by_name("Floor Lamp")
+
+
+def test_update_row_drops_old_keys():
+    snapshot = SheetSnapshot([])
+    snapshot.add_rows([make_row("Desk Lamp", "https://acme.example/old")])
+
+    snapshot.update_row(0, make_row("Floor Lamp", "https://acme.example/new"))
+
+    assert snapshot.find_by_url("https://acme.example/old") is None
+    assert snapshot.find_by_url("https://acme.example/new") is snapshot.records[0]
+    assert not snapshot.exists_by_name("Desk Lamp")
+    assert snapshot.exists_by_name("Floor Lamp")
+    old = Product(name="Desk Lamp", official_url="https://acme.example/old")
+    assert snapshot.find_index(product_key(old)) is None
+
+
+def test_update_row_moves_key_to_later_duplicate():
+    snapshot = SheetSnapshot([])
+    snapshot.add_rows(
+        [
+            make_row("Desk Lamp", "https://acme.example/lamp"),
+            make_row("Other", "https://acme.example/other"),
+            make_row("Desk Lamp", "https://acme.example/lamp"),
+        ]
+    )
+
+    snapshot.update_row(0, make_row("Floor Lamp", "https://acme.example/floor"))
+
+    assert snapshot.find_by_url("https://acme.example/lamp") is snapshot.records[2]
+    assert snapshot.exists_by_name("Desk Lamp")
+    lamp = Product(name="Desk Lamp", official_url="https://acme.example/lamp")
+    assert snapshot.find_index(product_key(lamp)) == 2
+
+
+def test_update_row_with_same_keys_keeps_index():
+    snapshot = SheetSnapshot([])
+    snapshot.add_rows([make_row("Desk Lamp", "https://acme.example/lamp")])
+
+    snapshot.update_row(0, make_row("Desk Lamp", "https://acme.example/lamp"))
+
+    assert snapshot.find_by_url("https://acme.example/lamp") is snapshot.records[0]
+    assert snapshot.exists_by_name("Desk Lamp")
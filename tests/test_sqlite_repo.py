@@ -0,0 +1,123 @@
+"""SQLiteProductRepository と製品の同一性キーのテスト"""
+
+import sqlite3
+
+import pytest
+
+from src.domain.models import PriceInfo, Product
+from src.infrastructure.repositories.product_identity import (
+    normalize_name,
+    product_key,
+)
+from src.infrastructure.repositories.sqlite_repo import SQLiteProductRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteProductRepository(tmp_path / "products.sqlite3")
+    yield repository
+    repository.close()
+
+
+def test_normalize_name():
+    assert normalize_name("  Ｆｏｏ   BAR ") == "foo bar"
+
+
+def test_product_key_combines_url_and_name():
+    a = Product(name="Foo", official_url="https://www.x.com/p/1/?utm_source=ad")
+    b = Product(name="ｆｏｏ", official_url="https://x.com/p/1")
+    c = Product(name="Other", official_url="https://x.com/p/1")
+
+    assert product_key(a) == product_key(b) == "url:https://x.com/p/1|foo"
+    assert product_key(c) != product_key(a)
+
+
+def test_product_key_ignores_homepage_urls():
+    product = Product(
+        name="Foo Bar",
+        brand="X",
+        official_url="https://x.com/",
+        amazon_url="https://www.amazon.co.jp/dp/B000",
+    )
+    homepage_only = Product(name="Foo Bar", brand="X", official_url="https://x.com")
+
+    assert product_key(product) == "url:https://amazon.co.jp/dp/B000|foo bar"
+    assert product_key(homepage_only) == "name:x|foo bar"
+
+
+def test_distinct_products_on_same_homepage_are_kept(repository):
+    repository.save_batch(
+        [
+            Product(name="Foo Bar", brand="X", official_url="https://x.com/"),
+            Product(name="Other", brand="X", official_url="https://x.com"),
+        ]
+    )
+
+    assert repository.count() == 2
+    assert repository.exists_by_name("ｆｏｏ bar")
+    assert repository.exists_by_name("other")
+
+
+def test_upsert_updates_same_product(repository):
+    first = Product(
+        name="Desk Lamp",
+        official_url="https://acme.example/lamp",
+        relevance_score=5,
+        price=PriceInfo(amount=19.9, currency="USD", formatted="$19.90"),
+    )
+    repository.save(first)
+    repository.save(first.model_copy(update={"relevance_score": 9, "price": None}))
+
+    assert repository.count() == 1
+    stored = repository.find_by_url("https://acme.example/lamp")
+    assert stored.relevance_score == 9
+    assert stored.price is None
+
+
+def test_round_trip_and_queries(repository):
+    products = [
+        Product(
+            name=f"Lamp {i}",
+            brand="Acme",
+            official_url=f"https://acme.example/lamp/{i}",
+            amazon_url=f"https://amazon.example/dp/{i}",
+            relevance_score=i,
+            desire="light" if i % 2 else "sleep",
+            price=PriceInfo(amount=float(i), currency="JPY", formatted=f"¥{i}"),
+        )
+        for i in range(6)
+    ]
+    repository.save_batch(products)
+
+    assert sorted(repository.get_all(), key=lambda p: p.name) == products
+    assert repository.find_by_url("https://amazon.example/dp/3") == products[3]
+    assert repository.find_by_url("https://nowhere.example") is None
+    assert [p.relevance_score for p in repository.find_by_desire("light")] == [5, 3, 1]
+
+    columns = repository.fetch_columns(["name", "relevance_score"])
+    assert sorted(columns["relevance_score"]) == list(range(6))
+    with pytest.raises(ValueError):
+        repository.fetch_columns(["product_key"])
+
+
+def test_fetch_columns_on_empty_table(repository):
+    assert repository.fetch_columns(["name"]) == {"name": []}
+
+
+def test_old_keys_are_migrated(tmp_path):
+    path = tmp_path / "products.sqlite3"
+    repository = SQLiteProductRepository(path)
+    repository.save(Product(name="Foo", official_url="https://x.com/p/1"))
+    repository.close()
+
+    # 以前の形式（URLのみ）のキーに戻す
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE products SET product_key = 'url:https://x.com/p/1'")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    repository = SQLiteProductRepository(path)
+    repository.save(Product(name="Foo", official_url="https://x.com/p/1"))
+    assert repository.count() == 1
+    repository.close()
@@ -0,0 +1,133 @@
+"""構造化データ（JSON-LD・microdata・OpenGraph）解析のテスト"""
+
+import pytest
+
+from src.domain.structured_data import (
+    StructuredDataParser,
+    _parse_price,
+    is_complete,
+    parse_structured_data,
+    product_from_structured,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (1980, 1980.0),
+        ("1,980", 1980.0),
+        ("¥1980", 1980.0),
+        ("19.90", 19.9),
+        ("1,299.00", 1299.0),
+        ("1.299,00", 1299.0),
+        ("1 299,00 €", 1299.0),
+        ("12,345,678", 12345678.0),
+        ("EUR 1.234.567", 1234567.0),
+        ("1,5", 1.5),
+        ("価格未定", None),
+        (None, None),
+    ],
+)
+def test_parse_price(value, expected):
+    assert _parse_price(value) == expected
+
+
+def test_json_ld_product_with_graph_and_offers():
+    html = """
+    <script type="application/ld+json">
+    {"@graph": [
+        {"@type": "WebPage", "name": "page"},
+        {"@type": "Product", "name": "Desk Lamp", "brand": {"name": "Acme"},
+         "url": "/products/lamp",
+         "offers": {"@type": "Offer", "price": "1.299,00", "priceCurrency": "eur"}}
+    ]}
+    </script>
+    """
+    data = parse_structured_data(html)
+
+    assert data == {
+        "name": "Desk Lamp",
+        "brand": "Acme",
+        "price": 1299.0,
+        "currency": "EUR",
+        "url": "/products/lamp",
+    }
+    assert is_complete(data)
+
+
+def test_microdata_and_opengraph_fill_missing_fields():
+    html = """
+    <meta property="og:type" content="product">
+    <meta property="og:title" content="OG title">
+    <meta property="product:price:amount" content="19.90">
+    <meta property="product:price:currency" content="usd">
+    <div itemscope itemtype="https://schema.org/Product">
+      <span itemprop="name">Microdata Lamp</span>
+      <div itemprop="brand" itemscope itemtype="https://schema.org/Brand">
+        <span itemprop="name">Acme</span>
+      </div>
+    </div>
+    """
+    data = parse_structured_data(html)
+
+    assert data["name"] == "Microdata Lamp"
+    assert data["brand"] == "Acme"
+    assert data["price"] == 19.9
+    assert data["currency"] == "USD"
+
+
+def test_product_from_structured_resolves_relative_url():
+    product = product_from_structured(
+        {"name": "Desk Lamp", "url": "/products/lamp", "price": 1299.0},
+        "https://acme.example/lamps/index.html",
+    )
+
+    assert product.official_url == "https://acme.example/products/lamp"
+    assert product.price.formatted == "$1,299"
+
+
+@pytest.mark.parametrize(
+    "source_url",
+    [
+        "https://www.walmart.com/ip/123",
+        "https://www.ebay.com/itm/123",
+        "https://www.yodobashi.com/product/123/",
+    ],
+)
+def test_shop_pages_are_not_official_urls(source_url):
+    product = product_from_structured({"name": "Desk Lamp"}, source_url)
+
+    assert product.official_url is None
+    assert product.source_url == source_url
+
+
+def test_marketplace_urls():
+    amazon = product_from_structured(
+        {"name": "Lamp", "url": "https://www.amazon.co.jp/dp/B000"},
+        "https://blog.example/review",
+    )
+    rakuten = product_from_structured(
+        {"name": "Lamp"}, "https://item.rakuten.co.jp/shop/lamp/"
+    )
+
+    assert amazon.amazon_url == "https://www.amazon.co.jp/dp/B000"
+    assert amazon.official_url is None
+    assert rakuten.rakuten_url == "https://item.rakuten.co.jp/shop/lamp/"
+    assert rakuten.official_url is None
+
+
+def test_parser_is_done_after_microdata_product():
+    parser = StructuredDataParser()
+    parser.feed('<div itemscope itemtype="https://schema.org/Product">')
+    parser.feed('<span itemprop="name">Lamp</span>')
+    assert not parser.done
+
+    parser.feed("</div><p>reviews</p>")
+    assert parser.done
+    assert parser.get_data()["name"] == "Lamp"
+
+
+def test_parser_is_not_done_for_other_json_ld():
+    parser = StructuredDataParser()
+    parser.feed('<script type="application/ld+json">{"@type": "WebPage"}</script>')
+    assert not parser.done
@@ -0,0 +1,305 @@
+"""WriteBehindRepository とエクスポート付きリポジトリのテスト"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.interfaces import ProductRepository
+from src.domain.models import Product
+from src.infrastructure.repositories.batch_journal import BatchJournal, batch_id
+from src.infrastructure.repositories.exporting_repo import (
+    ExportError,
+    ExportingProductRepository,
+)
+from src.infrastructure.repositories.write_behind import (
+    FlushError,
+    WriteBehindRepository,
+)
+from tests.test_batch_journal import make_director
+
+
+class MemoryRepository(ProductRepository):
+    """書き込みを記録し、fail が真の間は失敗するリポジトリ"""
+
+    def __init__(self):
+        self.products: list[Product] = []
+        self.calls = 0
+        self.fail = False
+
+    def save(self, product: Product) -> None:
+        self.save_batch([product])
+
+    def save_batch(self, products: list[Product]) -> None:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("write failed")
+        self.products.extend(products)
+
+    def find_by_url(self, url: str):
+        return next((p for p in self.products if p.official_url == url), None)
+
+    def get_all(self) -> list[Product]:
+        return list(self.products)
+
+    def exists_by_name(self, name: str) -> bool:
+        return any(p.name == name for p in self.products)
+
+
+def make_products(count: int, start: int = 0) -> list[Product]:
+    return [
+        Product(name=f"Lamp {i}", official_url=f"https://acme.example/lamp/{i}")
+        for i in range(start, start + count)
+    ]
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def inner() -> MemoryRepository:
+    return MemoryRepository()
+
+
+def make_buffer(inner, **kwargs) -> WriteBehindRepository:
+    options = {"flush_size": 500, "max_age": 60, "max_buffer": 5000, "max_retries": 1}
+    options.update(kwargs)
+    return WriteBehindRepository(inner, **options)
+
+
+def test_flush_by_size(inner):
+    buffer = make_buffer(inner, flush_size=3)
+    buffer.save_batch(make_products(2))
+    time.sleep(0.1)
+    assert inner.products == []
+
+    buffer.save_batch(make_products(1, start=2))
+    assert wait_until(lambda: len(inner.products) == 3)
+    assert inner.calls == 1
+    buffer.close()
+
+
+def test_flush_by_age(inner):
+    buffer = make_buffer(inner, max_age=0.1)
+    buffer.save_batch(make_products(2))
+
+    assert wait_until(lambda: len(inner.products) == 2)
+    assert buffer.get_statistics()["pending"] == 0
+    buffer.close()
+
+
+def test_close_flushes_remaining_rows(inner):
+    buffer = make_buffer(inner)
+    buffer.save_batch(make_products(2))
+    buffer.save(make_products(1, start=2)[0])
+    buffer.close()
+
+    assert len(inner.products) == 3
+    assert inner.calls == 1
+
+    # 終了処理後の書き込みはその場で行う
+    buffer.save_batch(make_products(1, start=3))
+    assert len(inner.products) == 4
+
+
+def test_failed_flush_keeps_rows(inner):
+    buffer = make_buffer(inner)
+    buffer.save_batch(make_products(2))
+
+    inner.fail = True
+    assert buffer.flush() == 0
+    stats = buffer.get_statistics()
+    assert stats["pending"] == 2
+    assert stats["failed_flushes"] == 1
+
+    inner.fail = False
+    assert buffer.flush() == 2
+    assert buffer.get_statistics()["pending"] == 0
+    buffer.close()
+
+
+def test_reads_see_pending_rows(inner):
+    buffer = make_buffer(inner)
+    buffer.save_batch(make_products(1))
+
+    assert buffer.exists_by_name("Lamp 0")
+    assert buffer.find_by_url("https://acme.example/lamp/0").name == "Lamp 0"
+    buffer.close()
+
+
+def test_backpressure_blocks_until_flushed(inner):
+    inner.fail = True
+    buffer = make_buffer(inner, flush_size=2, max_buffer=2)
+    buffer.save_batch(make_products(2))
+    assert wait_until(lambda: buffer.get_statistics()["failed_flushes"] == 1)
+
+    saved = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (buffer.save_batch(make_products(1, start=2)), saved.set())
+    )
+    thread.start()
+    assert not saved.wait(0.2)
+
+    inner.fail = False
+    assert buffer.flush() == 2
+    assert saved.wait(5)
+    thread.join()
+    buffer.close()
+    assert len(inner.products) == 3
+
+
+def test_save_batch_deferred_resolves_on_flush(inner):
+    buffer = make_buffer(inner)
+    first = buffer.save_batch_deferred(make_products(1))
+    second = buffer.save_batch_deferred(make_products(2, start=1))
+
+    # 書き込みの条件を満たすまでは完了しない
+    time.sleep(0.1)
+    assert not first.done() and not second.done()
+
+    assert buffer.flush() == 3
+    assert first.result() is None and second.result() is None
+    assert inner.calls == 1
+    buffer.close()
+
+
+def test_save_batch_deferred_fails_with_batch(inner):
+    inner.fail = True
+    buffer = make_buffer(inner)
+    future = buffer.save_batch_deferred(make_products(2))
+
+    buffer.flush()
+    assert isinstance(future.exception(), FlushError)
+    assert buffer.get_statistics()["pending"] == 2
+
+    inner.fail = False
+    buffer.close()
+    assert len(inner.products) == 2
+
+
+def test_exporting_deferred_waits_for_sinks(inner):
+    sink = MemoryRepository()
+    buffer = make_buffer(sink)
+    repository = ExportingProductRepository(inner, sinks=[buffer])
+
+    future = repository.save_batch_deferred(make_products(1))
+    assert len(inner.products) == 1
+    assert not future.done()
+
+    repository.flush()
+    assert future.result() is None
+    assert len(sink.products) == 1
+    buffer.close()
+
+
+def test_exporting_deferred_reports_sink_failure(inner):
+    sink = MemoryRepository()
+    sink.fail = True
+    repository = ExportingProductRepository(inner, sinks=[sink])
+
+    # 通常の保存ではエクスポート先の失敗はログだけ
+    repository.save_batch(make_products(1))
+    future = repository.save_batch_deferred(make_products(1, start=1))
+
+    assert isinstance(future.exception(), ExportError)
+    assert len(inner.products) == 2
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = BatchJournal(tmp_path / "journal.sqlite3")
+    yield journal
+    journal.close()
+
+
+def test_journaled_batch_merges_writes(
+    inner, journal, llm_client, search_client, scraper_client
+):
+    buffer = make_buffer(inner)
+    director = make_director(llm_client, search_client, scraper_client, buffer)
+    desires = ["quiet keyboard", "ergonomic chair", "desk lamp", "standing desk"]
+
+    results = director.hunt_batch(desires, journal=journal)
+
+    # 欲求ごとに書き込まず、バッチの終わりにまとめて書き込む
+    assert inner.calls == 1 < len(desires)
+    assert all(r.products and not r.errors for r in results)
+    run_id = batch_id(desires)
+    assert journal.get_progress(run_id)["done"] == len(desires)
+    assert all(journal.is_saved(run_id, i) for i in range(len(desires)))
+    buffer.close()
+
+
+def test_journaled_batch_async_merges_writes(
+    inner, journal, llm_client, search_client, scraper_client
+):
+    buffer = make_buffer(inner)
+    director = make_director(llm_client, search_client, scraper_client, buffer)
+    desires = ["quiet keyboard", "ergonomic chair", "desk lamp"]
+
+    results = asyncio.run(director.hunt_batch_async(desires, journal=journal))
+
+    assert inner.calls == 1
+    assert all(not r.errors for r in results)
+    assert journal.get_progress(batch_id(desires))["done"] == len(desires)
+    buffer.close()
+
+
+def test_flush_failure_is_recorded_in_journal(
+    inner, journal, llm_client, search_client, scraper_client
+):
+    # 失敗後は max_age 秒待ってから書き込み直す
+    buffer = make_buffer(inner, max_age=0.2)
+    director = make_director(llm_client, search_client, scraper_client, buffer)
+    desires = ["quiet keyboard"]
+
+    inner.fail = True
+    first = director.hunt_batch(desires, journal=journal)
+
+    # 書き込めなかった欲求は保存済みにせず、エラーとして残す
+    assert any("write failed" in error for error in first[0].errors)
+    assert first[0].total_saved == 0
+    assert journal.get_progress(batch_id(desires))["failed"] == 1
+
+    inner.fail = False
+    second = director.hunt_batch(desires, journal=journal, resume=True)
+
+    assert not second[0].errors
+    assert {p.desire for p in inner.products} == set(desires)
+    assert journal.get_progress(batch_id(desires))["done"] == 1
+    buffer.close()
+
+
+def test_unflushed_desire_is_saved_again_on_resume(
+    inner, journal, llm_client, search_client, scraper_client
+):
+    desires = ["quiet keyboard"]
+    run_id = journal.start(desires)
+    buffer = make_buffer(inner)
+    director = make_director(llm_client, search_client, scraper_client, buffer)
+
+    # 行がバッファにある間に強制終了した状態
+    checkpoint = journal.checkpoint(run_id, 0)
+    director.hunt(desires[0], checkpoint=checkpoint)
+    assert not checkpoint.saving.done()
+    assert not checkpoint.saved
+    assert journal.completed(run_id) == {}
+
+    calls = len(llm_client.calls)
+    restarted = MemoryRepository()
+    director = make_director(llm_client, search_client, scraper_client, restarted)
+    results = director.hunt_batch(desires, journal=journal, resume=True)
+
+    # 抽出はやり直さず、保存だけを実行する
+    assert len(llm_client.calls) == calls
+    assert len(restarted.products) == len(results[0].products) > 0
+    assert journal.is_saved(run_id, 0)
+    inner.fail = True
+    buffer.close()